@@ -0,0 +1,5 @@
+"""Benchmarks for the data, query and figure paths and for full page runs.
+
+``python -m benchmarks.run`` times them on the real dataset scaled up by
+``benchmarks.synthetic`` and writes the results as JSON; see the README.
+"""
@@ -0,0 +1,403 @@
+"""Drive concurrent simulated users against a local ``streamlit run app.py``.
+
+Usage::
+
+    python -m benchmarks.load [--users 1 5 10 25] [--duration 30] [--think 1]
+                              [--url http://host:port] [--seed 0]
+                              [--out results.json]
+
+The harness starts the app on a free localhost port (unless ``--url`` points
+at one already running) and, for each concurrency level, opens that many
+websocket sessions speaking Streamlit's own protocol: ``BackMsg`` rerun
+requests carrying widget states out, ``ForwardMsg`` deltas back. Each
+simulated user keeps switching to the Map, Country Profiles or Comparison
+page with the sidebar buttons and changing one to three of its selectboxes
+and multiselects, pausing ``--think`` seconds on average between actions.
+Widgets inside a fragment rerun only their fragment, as in the browser.
+
+A rerun's latency is the time from sending the request to the server's
+``script_finished``. Each level reports p50/p95/p99 latency per action and
+overall, reruns per second, errors shown by the app, and the server's CPU use
+and RSS (read from ``/proc``: Linux only, and not with ``--url``).
+
+Country reports are rendered first if missing, so Country Profiles visits do
+not start the background batch mid-run. Results go to
+``benchmarks/results/load-<UTC timestamp>.json`` unless ``--out`` is given.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.RootContainer_pb2 import RootContainer
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+from diwa import reports
+from diwa.memory import format_bytes
+from diwa.stlite import ENTRYPOINT
+
+from benchmarks.run import RESULTS_DIR, _git_commit
+
+USERS = (1, 5, 10, 25)
+DURATION = 30.0
+THINK = 1.0
+TIMEOUT = 120.0
+STARTUP_TIMEOUT = 60.0
+
+# Sidebar buttons the simulated users navigate with (see app.PAGES)
+PAGES = ("🗺️ ASEAN Map", "📊 Country Profiles", "📈 Comparison")
+MAX_CHOICES = 6
+
+# A switch_page ends its first run early; the run it starts finishes the request
+FINISHED = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+}
+
+
+class Session:
+    """One simulated browser tab: a websocket plus the widgets it has seen."""
+
+    def __init__(self, url):
+        self.url = url
+        self.page_hash = ""
+        # widget id -> (element type, element proto, fragment id, in sidebar)
+        self.widgets = {}
+        # Widget states sent with every rerun, as the browser does
+        self.values = {}
+        self.errors = 0
+        self.received = 0
+        self.ws = None
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, trigger=None, fragment_id=""):
+        """Request a rerun; returns its latency in milliseconds."""
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_script_hash = self.page_hash
+        state.fragment_id = fragment_id
+        for widget in self.values.values():
+            state.widget_states.widgets.add().CopyFrom(widget)
+        if trigger is not None:
+            state.widget_states.widgets.add().CopyFrom(trigger)
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        await asyncio.wait_for(self._until_finished(), TIMEOUT)
+        if not fragment_id:
+            # Forget widgets the page no longer shows
+            self.values = {i: v for i, v in self.values.items() if i in self.widgets}
+        return (time.perf_counter() - start) * 1000
+
+    async def _until_finished(self):
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("server closed the websocket")
+            self.received += len(payload)
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = msg.new_session.page_script_hash
+                if not msg.new_session.fragment_ids_this_run:
+                    self.widgets = {}
+            elif kind == "delta":
+                self._delta(msg)
+            elif kind == "script_finished" and msg.script_finished in FINISHED:
+                return
+
+    def _delta(self, msg):
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+        elif kind in ("selectbox", "multiselect", "button"):
+            widget = getattr(element, kind)
+            in_sidebar = msg.metadata.delta_path[0] == RootContainer.SIDEBAR
+            self.widgets[widget.id] = (kind, widget, msg.delta.fragment_id, in_sidebar)
+
+    async def navigate(self, label):
+        """Click the sidebar button ``label``."""
+        for widget_id, (kind, widget, _, in_sidebar) in self.widgets.items():
+            if kind == "button" and in_sidebar and widget.label == label:
+                return await self.rerun(trigger=WidgetState(id=widget_id, trigger_value=True))
+        raise LookupError(f"No sidebar button {label!r} on this page")
+
+    async def change_widget(self, rng):
+        """Pick a new value for a random selectbox or multiselect on the page.
+
+        Returns ``(element type, latency)``, or None if the page has none.
+        """
+        choices = [
+            (widget_id, kind, widget, fragment_id)
+            for widget_id, (kind, widget, fragment_id, in_sidebar) in self.widgets.items()
+            if kind in ("selectbox", "multiselect") and not in_sidebar and len(widget.options) > 1
+        ]
+        if not choices:
+            return None
+        widget_id, kind, widget, fragment_id = rng.choice(choices)
+        options = list(widget.options)
+        state = WidgetState(id=widget_id)
+        if kind == "selectbox":
+            state.string_value = rng.choice(options)
+        else:
+            limit = min(len(options), widget.max_selections or MAX_CHOICES)
+            state.string_array_value.data.extend(rng.sample(options, rng.randint(1, limit)))
+        self.values[widget_id] = state
+        return kind, await self.rerun(fragment_id=fragment_id)
+
+
+class Stats:
+    """Latencies per action and failures of one concurrency level."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.failures = []
+        self.errors = 0
+        self.received = 0
+
+    def record(self, action, ms):
+        self.latencies.setdefault(action, []).append(ms)
+
+    def all_latencies(self):
+        return [ms for values in self.latencies.values() for ms in values]
+
+
+def percentiles(values):
+    """p50/p95/p99 and count of ``values`` (milliseconds)."""
+    if not values:
+        return {"count": 0}
+    if len(values) == 1:
+        cuts = values * 99
+    else:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "count": len(values),
+        "p50_ms": round(cuts[49], 1),
+        "p95_ms": round(cuts[94], 1),
+        "p99_ms": round(cuts[98], 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+async def _pause(rng, think):
+    await asyncio.sleep(rng.uniform(0, 2 * think))
+
+
+async def simulate_user(url, deadline, think, rng, stats):
+    session = Session(url)
+    try:
+        await session.connect()
+        stats.record("connect", await session.rerun())
+        while time.monotonic() < deadline:
+            await _pause(rng, think)
+            stats.record("navigate", await session.navigate(rng.choice(PAGES)))
+            for _ in range(rng.randint(1, 3)):
+                if time.monotonic() >= deadline:
+                    break
+                await _pause(rng, think)
+                change = await session.change_widget(rng)
+                if change is not None:
+                    stats.record(*change)
+    except Exception as e:  # One user failing must not end the level
+        stats.failures.append(f"{type(e).__name__}: {e}")
+    finally:
+        stats.errors += session.errors
+        stats.received += session.received
+        session.close()
+
+
+def _proc_stats(pid):
+    """``(CPU seconds, RSS bytes)`` of ``pid`` from /proc, or ``(None, None)``."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None, None
+    # utime and stime are the 14th and 15th fields, after pid and (comm)
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return cpu, pages * os.sysconf("SC_PAGE_SIZE")
+
+
+async def _sample_rss(pid, peak, interval=0.5):
+    while True:
+        _, rss = _proc_stats(pid)
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+        await asyncio.sleep(interval)
+
+
+async def run_level(url, users, duration, think, seed, pid=None):
+    """``users`` concurrent sessions for ``duration`` seconds; returns the result."""
+    stats = Stats()
+    cpu_before, rss_before = _proc_stats(pid) if pid else (None, None)
+    peak = [rss_before or 0]
+    sampler = asyncio.ensure_future(_sample_rss(pid, peak)) if pid else None
+
+    start = time.monotonic()
+    deadline = start + duration
+    await asyncio.gather(*(
+        simulate_user(url, deadline, think, random.Random(seed * 10_000 + i), stats)
+        for i in range(users)
+    ))
+    wall = time.monotonic() - start
+    if sampler is not None:
+        sampler.cancel()
+    cpu_after, rss_after = _proc_stats(pid) if pid else (None, None)
+
+    latencies = stats.all_latencies()
+    return {
+        "users": users,
+        "wall_s": round(wall, 2),
+        "reruns": len(latencies),
+        "reruns_per_s": round(len(latencies) / wall, 2),
+        "latency": {
+            "all": percentiles(latencies),
+            **{action: percentiles(v) for action, v in sorted(stats.latencies.items())},
+        },
+        "bytes_received": stats.received,
+        "app_errors": stats.errors,
+        "failures": stats.failures,
+        "server": {
+            "cpu_percent": (round(100 * (cpu_after - cpu_before) / wall, 1)
+                            if cpu_before is not None and cpu_after is not None else None),
+            "rss_bytes": rss_after,
+            "rss_peak_bytes": peak[0] or None,
+        },
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(log):
+    """``(process, base URL)`` of the app started on a free localhost port."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", ENTRYPOINT,
+         "--server.headless", "true",
+         "--server.address", "127.0.0.1",
+         "--server.port", str(port),
+         "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        stdout=log, stderr=subprocess.STDOUT,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            with urllib.request.urlopen(base + "/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process, base
+        except OSError:
+            time.sleep(0.25)
+    process.kill()
+    raise RuntimeError(f"Streamlit did not start; see {log.name}")
+
+
+def _print_level(result):
+    server = result["server"]
+    cpu = f"{server['cpu_percent']:5.1f}%" if server["cpu_percent"] is not None else "    -"
+    rss = format_bytes(server["rss_peak_bytes"]) if server["rss_peak_bytes"] else "-"
+    print(f"{result['users']:>5} users: {result['reruns']:>5} reruns "
+          f"({result['reruns_per_s']:.1f}/s), CPU {cpu}, peak RSS {rss}, "
+          f"{result['app_errors']} app errors, {len(result['failures'])} failed users")
+    for action, p in result["latency"].items():
+        if p["count"]:
+            print(f"    {action:12s} n={p['count']:<5} p50 {p['p50_ms']:8.1f}  "
+                  f"p95 {p['p95_ms']:8.1f}  p99 {p['p99_ms']:8.1f} ms")
+    for failure in sorted(set(result["failures"])):
+        print(f"    failed: {failure}")
+
+
+def run(levels=USERS, duration=DURATION, think=THINK, seed=0, url=None):
+    """Run every concurrency level; returns the results document."""
+    process = log = None
+    if url is None:
+        if reports.available():
+            reports.build_reports()
+        log = tempfile.NamedTemporaryFile("w", prefix="diwa-load-", suffix=".log", delete=False)
+        process, url = start_server(log)
+        print(f"Started {ENTRYPOINT} at {url} (log: {log.name})")
+    stream = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+
+    results = []
+    try:
+        for users in levels:
+            result = asyncio.run(run_level(
+                stream, users, duration, think, seed, pid=process.pid if process else None
+            ))
+            _print_level(result)
+            results.append(result)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+            log.close()
+
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "cpus": os.cpu_count(),
+        "url": url,
+        "duration_s": duration,
+        "think_s": think,
+        "seed": seed,
+        "levels": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with simulated users.")
+    parser.add_argument("--users", type=int, nargs="+", default=list(USERS),
+                        help="concurrency levels, run one after another")
+    parser.add_argument("--duration", type=float, default=DURATION, help="seconds per level")
+    parser.add_argument("--think", type=float, default=THINK,
+                        help="mean pause between a user's actions, in seconds")
+    parser.add_argument("--url", help="an app already running, e.g. http://127.0.0.1:8501")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="results file (default: benchmarks/results/load-<time>.json)")
+    args = parser.parse_args(argv)
+
+    document = run(args.users, args.duration, args.think, args.seed, args.url)
+    out = args.out
+    if out is None:
+        stamp = document["created"].replace(":", "").replace("-", "").replace("+0000", "Z")
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"load-{stamp}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"Wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,431 @@
+"""Time the data, query and figure hot paths and full page runs at several scales.
+
+Usage::
+
+    python -m benchmarks.run [--scales 1 10 100 1000] [--subnational 1]
+                             [--repeat 5] [--sessions 20] [--no-pages]
+                             [--out results.json] [--compare previous.json]
+                             [--world-topojson world_110m.json]
+
+For each scale a synthetic dataset (see ``benchmarks.synthetic``) is written
+to a temporary workspace that links the app's code, and the benchmarks run
+against it:
+
+- ``load.*``: CSV ingest, bundle load and the derived gender indicators, i.e.
+  what ``load_diwa_data()`` does on a cold process
+- ``query.*``: building the national cube (including the latest-value
+  snapshot), the regional index with its rollups, the trend table, the
+  similarity matrices, the composite index and the search index, and the
+  lookups each page (and the sidebar search) makes on a rerun;
+  ``query.composite_score`` weights every indicator at once
+- ``figure.*``: building each page's Plotly figure from those lookups
+- ``payload.*``: bytes of each of those figures as sent to the browser once
+  slimmed (see ``diwa.payload``), with the unslimmed size alongside;
+  ``payload.map_page`` is everything the map page downloads for its map (the
+  figure carries its own geometry), against ``payload.map_page_world``, the
+  Plotly world-map choropleth it replaced plus the world topojson plotly.js
+  fetched for it (only with ``--world-topojson``, a saved copy of that file)
+- ``refresh.*``: a partner batch revising one country's latest year (see
+  ``diwa.partitions``): parsing it, merging it into the dataset, rebuilding
+  the cube and updating the trend table, against ``refresh.full_rebuild``,
+  which derives, sorts and indexes the merged dataset from scratch
+- ``page.*``: whole-script runs in Streamlit's headless ``AppTest``: the
+  cold start that loads the dataset, then every page's first visit and
+  rerun, with every cache in the app in play
+- ``memory.*``: bytes held once per process by the shared dataset and its
+  indexes, and bytes each further open ``AppTest`` session adds on top
+  (traced with ``tracemalloc``; includes ``AppTest``'s own element tree)
+
+Results go to ``benchmarks/results/<UTC timestamp>.json`` unless ``--out`` is
+given; ``--compare`` prints each median against an earlier results file.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from diwa import geo, memory
+from diwa.composite import CompositeIndex
+from diwa.cube import DiwaCube
+from diwa.data import load_dataset, write_bundle
+from diwa.gender import with_gender_indicators
+from diwa.ingest import DEDUP_KEYS
+from diwa.partitions import Snapshot, read_batch
+from diwa.payload import figure_bytes, slim
+from diwa.regions import RegionIndex, national_rows, subnational_rows
+from diwa.search import SearchIndex
+from diwa.similarity import SimilarityTable
+from diwa.stlite import ENTRYPOINT, page_scripts
+from diwa.trends import TrendTable
+
+from benchmarks.synthetic import split_factor, synthesize, write_csv
+
+RESULTS_DIR = "benchmarks/results"
+SCALES = (1, 10, 100, 1000)
+REPEAT = 5
+SESSIONS = 20
+
+# Linked into each workspace, so pages run the checked-out code on synthetic data
+APP_PATHS = (ENTRYPOINT, "views", "diwa", "assets", "data/aliases.csv")
+
+
+def timed(fn, repeat=REPEAT):
+    """``(result, [milliseconds per run])`` of calling ``fn`` ``repeat`` times."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, times
+
+
+def _record(results, scale, name, times, **extra):
+    results.append({
+        "scale": scale,
+        "benchmark": name,
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "runs": len(times),
+        **extra,
+    })
+    print(f"  {name:32s} {statistics.median(times):10.2f} ms  (min {min(times):.2f}, n={len(times)})")
+
+
+def _record_bytes(results, scale, name, size, **extra):
+    results.append({"scale": scale, "benchmark": name, "bytes": size, **extra})
+    print(f"  {name:32s} {memory.format_bytes(size):>13s}")
+
+
+def _workspace(root, df):
+    """A directory laid out like the repo, holding ``df`` as its dataset."""
+    os.makedirs(os.path.join(root, "data"))
+    for path in APP_PATHS:
+        os.symlink(os.path.abspath(path), os.path.join(root, path))
+    csv_path = os.path.join(root, "data", "diwa.csv")
+    write_csv(df, csv_path)
+    return csv_path
+
+
+def _world_map_figure(map_data):
+    # The map as drawn before the bundled geometry, on Plotly's world basemap
+    import plotly.express as px
+    fig = px.choropleth(map_data, locations="Country", locationmode="country names",
+                        color="Value", hover_name="Country", hover_data={"Year": True},
+                        color_continuous_scale="Viridis", projection="natural earth")
+    fig.update_layout(geo=dict(showcountries=True, showcoastlines=True, showland=True,
+                               fitbounds="locations"), height=600)
+    return fig
+
+
+def bench_map_page(results, scale, map_fig, map_data, world_topojson=None):
+    """Bytes the map page downloads for its map, against the world-map version."""
+    figure = figure_bytes(slim(map_fig))
+    _record_bytes(results, scale, "payload.map_page", figure,
+                  parts={"figure": figure, "geometry_fetch": 0})
+    world = figure_bytes(slim(_world_map_figure(map_data)))
+    _record_bytes(results, scale, "payload.map_figure_world", world)
+    if world_topojson is None:
+        print("  (payload.map_page_world needs --world-topojson)")
+        return
+    fetch = os.path.getsize(world_topojson)
+    _record_bytes(results, scale, "payload.map_page_world", world + fetch,
+                  parts={"figure": world, "geometry_fetch": fetch})
+
+
+def bench_data(results, scale, csv_path, repeat, world_topojson=None):
+    """Load, query and figure benchmarks; returns the cube for reuse."""
+    from views.figures import build_comparison_bar, build_comparison_line, \
+        build_map_figure, build_trend_figure
+
+    bundle_path = csv_path[:-len(".csv")] + ".npz"
+    loads = max(1, min(repeat, 3))
+    df, times = timed(lambda: load_dataset(csv_path, bundle_path), loads)
+    _record(results, scale, "load.csv_ingest", times, rows=len(df))
+    write_bundle(df, bundle_path, source=csv_path)
+    _, times = timed(lambda: load_dataset(csv_path, bundle_path), loads)
+    _record(results, scale, "load.bundle", times)
+    data, times = timed(lambda: with_gender_indicators(df), loads)
+    _record(results, scale, "load.gender_indicators", times, rows=len(data))
+
+    cube, times = timed(lambda: DiwaCube(national_rows(data)), loads)
+    _record(results, scale, "query.cube_build", times,
+            countries=len(cube.countries), indicators=len(cube.indicators), rows=len(cube))
+    regions, times = timed(lambda: RegionIndex(subnational_rows(data)), loads)
+    _record(results, scale, "query.region_index_build", times, rows=len(regions))
+    trends, times = timed(lambda: TrendTable(cube), loads)
+    _record(results, scale, "query.trend_table_build", times, rows=len(trends.filled))
+    similarity, times = timed(lambda: SimilarityTable(cube), loads)
+    _record(results, scale, "query.similarity_build", times,
+            countries=len(similarity.countries), indicators=len(similarity.indicators))
+    composite, times = timed(lambda: CompositeIndex(cube), loads)
+    _record(results, scale, "query.composite_build", times,
+            countries=len(composite.countries), indicators=len(composite.indicators))
+    search, times = timed(lambda: SearchIndex(cube.frame), loads)
+    _record(results, scale, "query.search_index_build", times,
+            documents=len(search), terms=len(search.vocabulary))
+    shared = memory.shared_bytes({"dataset": data, "cube": cube, "regions": regions,
+                                  "trends": trends, "similarity": similarity,
+                                  "composite": composite, "search": search})
+    _record_bytes(results, scale, "memory.shared", sum(shared.values()), parts=shared)
+
+    # The default selections each page opens with
+    indicator = cube.indicators_by_coverage[0]
+    country = cube.countries[0]
+    compared = cube.countries[:5]
+    queries = {
+        "query.dashboard_averages": lambda: cube.select(countries=cube.countries[:6])
+        .groupby("Indicator", sort=False)["Value"].mean().head(8),
+        "query.map_latest": lambda: cube.latest_for_indicator(indicator),
+        "query.profile_latest": lambda: cube.latest_for_country(country),
+        "query.profile_series": lambda: cube.series(country, cube.indicators_for(country)[0]),
+        "query.comparison_select": lambda: cube.select(indicator=indicator, countries=compared),
+        "query.comparison_latest": lambda: cube.latest_for_indicator(indicator, countries=compared),
+        "query.aligned_year": lambda: trends.at_year(indicator, trends.years_for(indicator)[0]),
+        "query.trend_stats": lambda: trends.trend(country, indicator),
+        "query.neighbours": lambda: similarity.neighbours(country, limit=5),
+        "query.correlated": lambda: similarity.correlated(indicator, limit=10),
+        "query.composite_score": lambda: composite.score(
+            {ind: 1 + i % 5 for i, ind in enumerate(composite.indicators)}),
+        # A prefix while typing, and a query with a typo
+        "query.search_prefix": lambda: search.search(indicator[:3]),
+        "query.search_fuzzy": lambda: search.search(f"{country} {indicator}"[:-1] + "x"),
+    }
+    if regions.countries:
+        regional = regions.countries[0]
+        region = regions.regions(regional)[0]
+        regional_indicator = regions.indicators_for(regional, region)[0]
+        queries.update({
+            "query.region_latest": lambda: regions.latest_for_region(regional, region),
+            "query.region_series": lambda: regions.series(regional, region, regional_indicator),
+            "query.region_rollup": lambda: regions.rollup(regional, regional_indicator),
+        })
+    for name, query in queries.items():
+        _, times = timed(query, repeat)
+        _record(results, scale, name, times)
+
+    # Synthetic country copies have no outline; the map draws the real ones
+    map_data = cube.latest_for_indicator(indicator)
+    map_data = map_data[map_data["Country"].isin(geo.ISO3)]
+    coords = geo.COORDINATES
+    trend = cube.series(country, cube.indicators_for(country)[0])
+    comp_data = cube.select(indicator=indicator, countries=compared)
+    comp_latest = cube.latest_for_indicator(indicator, countries=compared)
+    figures = {
+        # At the level the page draws the whole region with
+        "figure.map": lambda: build_map_figure(map_data, coords,
+                                               geo.level_for_bounds(geo.bounds(coords))),
+        "figure.trend": lambda: build_trend_figure(trend, country, indicator),
+        "figure.comparison_bar": lambda: build_comparison_bar(comp_latest, indicator),
+        "figure.comparison_line": lambda: build_comparison_line(comp_data, indicator),
+    }
+    built = {}
+    for name, build in figures.items():
+        built[name], times = timed(build, repeat)
+        _record(results, scale, name, times)
+        unslimmed = figure_bytes(built[name])
+        _record_bytes(results, scale, name.replace("figure.", "payload."),
+                      figure_bytes(slim(built[name])), unslimmed_bytes=unslimmed)
+    bench_map_page(results, scale, built["figure.map"], map_data, world_topojson)
+    return cube
+
+
+def bench_refresh(results, scale, root, df, repeat):
+    """Incremental batch refresh against a full rebuild of the merged data."""
+    base = Snapshot.load(with_gender_indicators(df), "base")
+    cube = DiwaCube(national_rows(base.frame), presorted=True)
+    trends = TrendTable(cube)
+
+    # One country's latest year, revised
+    rows = df[df["Country"] == cube.countries[0]]
+    rows = rows[rows["Year"] == rows["Year"].max()].assign(Value=lambda d: d["Value"] + 1)
+    path = os.path.join(root, "data", "batch.csv")
+    write_csv(rows, path)
+    source = (path, "batch")
+
+    batch, times = timed(lambda: read_batch(path), repeat)
+    _record(results, scale, "refresh.read_batch", times, rows=len(batch))
+    snapshot, times = timed(lambda: base.apply(batch, source), repeat)
+    changed = snapshot.changed_since(base.base, base.stamps)
+    _record(results, scale, "refresh.apply_batch", times, partitions=len(changed))
+    updated, times = timed(lambda: DiwaCube(national_rows(snapshot.frame), presorted=True), repeat)
+    _record(results, scale, "refresh.cube", times)
+    _, times = timed(lambda: trends.updated(updated, changed), repeat)
+    _record(results, scale, "refresh.trends_update", times)
+
+    merged = pd.concat([df, batch], ignore_index=True).drop_duplicates(DEDUP_KEYS, keep="last")
+    _, times = timed(lambda: TrendTable(DiwaCube(national_rows(
+        with_gender_indicators(merged)))), max(1, min(repeat, 3)))
+    _record(results, scale, "refresh.full_rebuild", times)
+
+
+def bench_pages(results, scale, root, cube, repeat):
+    """Full-script runs of every page against the workspace at ``root``."""
+    from streamlit.testing.v1 import AppTest
+
+    from diwa import reports
+    from diwa.version import dataset_version
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        # Placeholder reports, so Country Profiles does not start a render batch
+        version = dataset_version()
+        os.makedirs(reports.report_dir(version), exist_ok=True)
+        for country in cube.countries:
+            for ext in ("pdf", "png"):
+                open(reports.report_path(version, country, ext), "wb").close()
+
+        app = os.path.join(root, ENTRYPOINT)
+        # First run of the default page also loads this scale's dataset
+        _, cold = timed(AppTest.from_file(app, default_timeout=600).run, 1)
+        _record(results, scale, "page.cold_start", cold)
+        for page in page_scripts(ENTRYPOINT):
+            name = os.path.splitext(os.path.basename(page))[0]
+            at = AppTest.from_file(app, default_timeout=600).run()
+            at.switch_page(page)
+            _, first = timed(at.run, 1)
+            _, reruns = timed(at.run, repeat)
+            if at.exception:
+                raise RuntimeError(f"{page} raised: {at.exception[0].value}")
+            _record(results, scale, f"page.{name}.first", first)
+            _record(results, scale, f"page.{name}.rerun", reruns)
+    finally:
+        os.chdir(cwd)
+
+
+def bench_sessions(results, scale, root, sessions=SESSIONS):
+    """Memory each further open session holds once the shared data is loaded."""
+    from streamlit.testing.v1 import AppTest
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        app = os.path.join(root, ENTRYPOINT)
+        AppTest.from_file(app, default_timeout=600).run()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            open_sessions = [
+                AppTest.from_file(app, default_timeout=600).run() for _ in range(sessions)
+            ]
+            gc.collect()
+            held = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        _record_bytes(results, scale, "memory.per_session", held // len(open_sessions),
+                      sessions=sessions)
+    finally:
+        os.chdir(cwd)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _versions():
+    import numpy
+    import pandas
+    import plotly
+    import streamlit
+    return {m.__name__: m.__version__ for m in (numpy, pandas, plotly, streamlit)}
+
+
+def run(scales=SCALES, subnational=1, repeat=REPEAT, pages=True, sessions=SESSIONS,
+        world_topojson=None):
+    """Run every benchmark at every scale; returns the results document."""
+    base = load_dataset()
+    results = []
+    for scale in scales:
+        df = synthesize(base, scale, subnational)
+        shape = ", ".join(f"{m} {d}" for d, m in split_factor(scale).items())
+        print(f"Scale {scale}x ({shape}, {subnational} subnational): {len(df):,} rows")
+        with tempfile.TemporaryDirectory(prefix="diwa-bench-") as root:
+            csv_path = _workspace(root, df)
+            cube = bench_data(results, scale, csv_path, repeat, world_topojson)
+            bench_refresh(results, scale, root, df, repeat)
+            if pages:
+                bench_pages(results, scale, root, cube, repeat)
+                bench_sessions(results, scale, root, sessions)
+        for result in results:
+            if result["scale"] == scale:
+                result.setdefault("rows_generated", len(df))
+
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "packages": _versions(),
+        "subnational": subnational,
+        "repeat": repeat,
+        "sessions": sessions,
+        "results": results,
+    }
+
+
+def compare(current, previous):
+    """Print each median (or byte count) next to the same benchmark and scale
+    in ``previous``."""
+    before = {(r["scale"], r["benchmark"]): r for r in previous["results"]}
+    print(f"Compared with {previous.get('commit') or 'unknown commit'} ({previous['created']}):")
+    for r in current["results"]:
+        metric, unit = ("median_ms", "ms") if "median_ms" in r else ("bytes", "B")
+        old = before.get((r["scale"], r["benchmark"]), {}).get(metric)
+        if old:
+            print(f"  {r['scale']:>5}x {r['benchmark']:32s} {old:10.2f} -> "
+                  f"{r[metric]:10.2f} {unit:2s} ({r[metric] / old:5.2f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DIWA hot paths at scale.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--subnational", type=int, default=1,
+                        help="regional copies per national row, plus one")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per benchmark")
+    parser.add_argument("--sessions", type=int, default=SESSIONS,
+                        help="AppTest sessions opened for memory.per_session")
+    parser.add_argument("--no-pages", action="store_true",
+                        help="skip the AppTest page and session runs")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--world-topojson",
+                        help="saved copy of the world_110m.json plotly.js fetches for "
+                             "world-map choropleths, for payload.map_page_world")
+    args = parser.parse_args(argv)
+
+    document = run(args.scales, args.subnational, args.repeat, pages=not args.no_pages,
+                   sessions=args.sessions, world_topojson=args.world_topojson)
+    out = args.out
+    if out is None:
+        stamp = document["created"].replace(":", "").replace("-", "").replace("+0000", "Z")
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"{stamp}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"Wrote {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(document, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Synthetic datasets scaled up from ``data/diwa.csv``.
+
+Usage::
+
+    python -m benchmarks.synthetic --scale 100 [--subnational 20] --out big.csv
+
+A scale factor is split into whole multipliers for countries, years and
+indicators whose product is the factor (1000 -> 10 x 10 x 10). Every copy
+keeps the real dataset's shape, so coverage stays as sparse and uneven as in
+production:
+
+- country copies are named ``"<country> <n>"``
+- year copies repeat each series ``n`` spans earlier, so the latest values
+  stay the real ones
+- indicator copies are named ``"Synthetic <n> <indicator>"``, which keeps
+  ``_Female`` / ``_Male`` pairs intact
+
+``subnational`` adds that many minus one regional copies of every row,
+flagged ``Subnational = Yes`` and named in a ``region`` column. Copies get
+values jittered by a seeded 5% noise, so results are reproducible.
+"""
+
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from diwa.data import load_dataset
+from diwa.ingest import COLUMNS
+
+DIMENSIONS = ("countries", "years", "indicators")
+REGION = "Region"
+NOISE = 0.05
+
+
+def _primes(n):
+    factors, p = [], 2
+    while n > 1:
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+        p += 1
+    return factors
+
+
+def split_factor(factor):
+    """``{dimension: multiplier}`` whose product is ``factor``, as even as possible."""
+    if factor < 1 or int(factor) != factor:
+        raise ValueError(f"Scale factor must be a positive integer, got {factor!r}")
+    multipliers = dict.fromkeys(DIMENSIONS, 1)
+    for prime in sorted(_primes(int(factor)), reverse=True):
+        smallest = min(DIMENSIONS, key=lambda d: multipliers[d])
+        multipliers[smallest] *= prime
+    return multipliers
+
+
+def synthesize(df, factor=1, subnational=1, seed=0):
+    """``df`` scaled by ``factor`` and ``subnational`` (see the module docstring)."""
+    multipliers = split_factor(factor)
+    span = int(df["Year"].max() - df["Year"].min() + 1)
+
+    parts = []
+    for c, y, i in itertools.product(*(range(multipliers[d]) for d in DIMENSIONS)):
+        part = df.copy()
+        if c:
+            part["Country"] = part["Country"] + f" {c + 1}"
+        if y:
+            part["Year"] = part["Year"] - y * span
+        if i:
+            part["Indicator"] = f"Synthetic {i + 1} " + part["Indicator"]
+        parts.append(part)
+    national = pd.concat(parts, ignore_index=True)
+    national[REGION] = np.nan
+
+    regions = [
+        national.assign(Subnational="Yes", **{REGION: f"Region {r}"})
+        for r in range(1, subnational)
+    ]
+    out = pd.concat([national, *regions], ignore_index=True)
+
+    # The original rows keep their values; every copy is jittered
+    rng = np.random.default_rng(seed)
+    noise = 1 + NOISE * rng.standard_normal(len(out))
+    noise[:len(df)] = 1
+    out["Value"] = (out["Value"] * noise).round(2)
+    return out
+
+
+def write_csv(df, path):
+    """Write ``df`` with the source CSV's column names."""
+    raw = {canonical: name for name, canonical in COLUMNS.items()}
+    df.rename(columns=raw).to_csv(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a scaled-up synthetic DIWA CSV.")
+    parser.add_argument("--scale", type=int, default=10, help="row multiplier (1-1000)")
+    parser.add_argument("--subnational", type=int, default=1,
+                        help="regional copies per national row, plus one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="CSV file to write")
+    args = parser.parse_args(argv)
+
+    df = synthesize(load_dataset(), args.scale, args.subnational, args.seed)
+    write_csv(df, args.out)
+    shape = " x ".join(f"{m} {d}" for d, m in split_factor(args.scale).items())
+    print(f"Wrote {args.out}: {len(df):,} rows ({shape}, {args.subnational} subnational)")
+
+
+if __name__ == "__main__":
+    main()
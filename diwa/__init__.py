@@ -0,0 +1,5 @@
+"""Data layer for the ASEAN-DIWA dashboard.
+
+The Streamlit pages only render; loading, indexing and derived results live
+in this package so they can be built once per process and shared.
+"""
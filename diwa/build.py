@@ -0,0 +1,52 @@
+"""Build the compact binary dataset bundle from the source CSV.
+
+Usage::
+
+    python -m diwa.build [--csv data/diwa.csv] [--out data/diwa.npz]
+                         [--report data/validation_report.json] [--chunksize N]
+
+The CSV is streamed through ``diwa.ingest`` and its validation report is
+written alongside the bundle.
+"""
+
+import argparse
+import os
+import time
+
+from diwa.data import BUNDLE_PATH, CSV_PATH, read_bundle, write_bundle
+from diwa.ingest import CHUNKSIZE, REPORT_PATH, ingest, write_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=CSV_PATH, help="source CSV file")
+    parser.add_argument("--out", default=BUNDLE_PATH, help="bundle to write")
+    parser.add_argument("--report", default=REPORT_PATH, help="validation report to write")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="rows per CSV chunk")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df, report = ingest(args.csv, chunksize=args.chunksize)
+    parse_s = time.perf_counter() - start
+
+    write_bundle(df, args.out, source=args.csv)
+    write_report(report, args.report)
+
+    start = time.perf_counter()
+    read_bundle(args.out, source=args.csv)
+    load_s = time.perf_counter() - start
+
+    print(
+        f"Wrote {args.out}: {len(df)} rows, "
+        f"{os.path.getsize(args.csv):,} -> {os.path.getsize(args.out):,} bytes, "
+        f"CSV parse {parse_s * 1000:.1f} ms, bundle load {load_s * 1000:.1f} ms"
+    )
+    dropped = ", ".join(f"{k}={v}" for k, v in report["dropped"].items() if v)
+    print(f"Wrote {args.report}: {report['rows_read']} rows read, dropped {dropped or 'none'}")
+    if report["conflicts"]:
+        print(f"{len(report['conflicts'])} duplicate keys have conflicting values; "
+              f"the first was kept. Resolve them in the CSV (see 'conflicts' in {args.report})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Weighted composite index of countries over many indicators.
+
+``CompositeIndex`` pivots a ``DiwaCube``'s latest values into a Country x
+Indicator matrix once per dataset version and normalizes every column in
+advance, so scoring a set of weights is one matrix product and a weight
+slider re-scores at once, however many indicators take part.
+
+Each indicator is first oriented so that higher is better:
+
+- ``HIGHER``: most indicators (shares of women, enrolment, skills)
+- ``LOWER``: other indicators named as a gap, such as the gender pay gap
+- ``PARITY``: the derived gender indicators, best at parity: the distance
+  from 0 for ``_Gender Gap`` (female minus male), from 1 for ``_Gender
+  Ratio`` and ``_Gender Parity Index``, with larger distances scoring lower
+
+then normalized across countries, by min-max (0 for the worst country, 1
+for the best) or by z-score. A country's score is the weighted mean of its
+normalized values over the selected indicators it reports: missing values
+drop out of both the sum and the weights. Countries reporting less than
+``MIN_COVERAGE`` of the total weight are not ranked.
+"""
+
+import numpy as np
+import pandas as pd
+
+from diwa.frozen import readonly
+from diwa.gender import SEPARATOR
+from diwa.spans import traced
+
+HIGHER = "higher"
+LOWER = "lower"
+PARITY = "parity"
+
+MIN_MAX = "Min-max"
+Z_SCORE = "Z-score"
+NORMALIZATIONS = (MIN_MAX, Z_SCORE)
+
+MIN_COVERAGE = 0.5
+
+# Derived gender indicators and the value that means parity
+PARITY_TARGETS = {
+    SEPARATOR + "Gender Gap": 0.0,
+    SEPARATOR + "Gender Ratio": 1.0,
+    SEPARATOR + "Gender Parity Index": 1.0,
+}
+
+
+def direction(indicator):
+    """``(HIGHER | LOWER | PARITY, parity value or None)`` for ``indicator``."""
+    for suffix, target in PARITY_TARGETS.items():
+        if indicator.endswith(suffix):
+            return PARITY, target
+    if "gap" in indicator.lower():
+        return LOWER, None
+    return HIGHER, None
+
+
+def orient(values, indicators):
+    """Columns of ``values`` turned so that higher is better."""
+    oriented = np.array(values, dtype=np.float64)
+    for j, indicator in enumerate(indicators):
+        kind, target = direction(indicator)
+        if kind == LOWER:
+            oriented[:, j] = -oriented[:, j]
+        elif kind == PARITY:
+            oriented[:, j] = -np.abs(oriented[:, j] - target)
+    return oriented
+
+
+def min_max(matrix):
+    """Columns scaled to 0 (lowest) .. 1 (highest), ignoring NaN; columns
+    without spread are 0.5 wherever observed."""
+    observed = ~np.isnan(matrix)
+    low = np.where(observed, matrix, np.inf).min(axis=0, initial=np.inf)
+    high = np.where(observed, matrix, -np.inf).max(axis=0, initial=-np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = high - low
+        scaled = (matrix - low) / spread
+    flat = ~(spread > 0)
+    scaled[:, flat] = np.where(np.isnan(matrix[:, flat]), np.nan, 0.5)
+    return scaled
+
+
+def z_score(matrix):
+    """Column z-scores ignoring NaN; columns without spread are 0 wherever
+    observed."""
+    observed = ~np.isnan(matrix)
+    count = observed.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(observed, matrix, 0).sum(axis=0) / count
+        std = np.sqrt(np.where(observed, (matrix - mean) ** 2, 0).sum(axis=0) / count)
+        z = (matrix - mean) / std
+    flat = ~(std > 0)
+    z[:, flat] = np.where(observed[:, flat], 0.0, np.nan)
+    return z
+
+
+class CompositeIndex:
+    """Normalized latest values of every country and indicator of a cube,
+    scored against any set of indicator weights."""
+
+    @traced("data.composite")
+    def __init__(self, cube):
+        self.countries = list(cube.countries)
+        self.indicators = list(cube.indicators)
+        self._column = {ind: j for j, ind in enumerate(self.indicators)}
+        self.directions = {ind: direction(ind)[0] for ind in self.indicators}
+
+        latest = cube.latest
+        raw = np.full((len(self.countries), len(self.indicators)), np.nan)
+        raw[
+            latest["Country"].map({c: i for i, c in enumerate(self.countries)}).to_numpy(),
+            latest["Indicator"].map(self._column).to_numpy(),
+        ] = latest["Value"].to_numpy(dtype=np.float64)
+        oriented = orient(raw, self.indicators)
+
+        observed = ~np.isnan(raw)
+        self._observed = readonly(observed.astype(np.float64))
+        # Per normalization: [values with NaN as 0, 0/1 observed], stacked so
+        # that one product yields both the weighted sums and the weights
+        self._stacked = {
+            name: readonly(np.stack([np.where(observed, normalize(oriented), 0.0),
+                                     self._observed]))
+            for name, normalize in ((MIN_MAX, min_max), (Z_SCORE, z_score))
+        }
+
+    def weight_vector(self, weights):
+        """``{indicator: weight}`` as a vector over ``indicators``; unknown
+        indicators and non-positive weights are left out."""
+        vector = np.zeros(len(self.indicators))
+        for indicator, weight in weights.items():
+            j = self._column.get(indicator)
+            if j is not None and weight > 0:
+                vector[j] = weight
+        return vector
+
+    @traced("filter.composite_score")
+    def score(self, weights, normalization=MIN_MAX, min_coverage=MIN_COVERAGE):
+        """Countries ranked by their weighted mean normalized value.
+
+        Returns Rank, Country, Score, Coverage (share of the total weight the
+        country reports) and Indicators (how many it reports), best first;
+        countries under ``min_coverage`` come last, unranked.
+        """
+        vector = self.weight_vector(weights)
+        columns = np.flatnonzero(vector)
+        total = vector[columns].sum()
+        if not len(columns):
+            return pd.DataFrame(columns=["Rank", "Country", "Score", "Coverage", "Indicators"])
+
+        sums, covered = self._stacked[normalization][:, :, columns] @ vector[columns]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = sums / covered
+        coverage = covered / total
+        ranked = coverage >= min_coverage - 1e-12
+        score[~ranked] = np.nan
+
+        result = pd.DataFrame({
+            "Country": self.countries,
+            "Score": score,
+            "Coverage": coverage,
+            "Indicators": self._observed[:, columns].sum(axis=1).astype(np.int64),
+        })
+        result = result.sort_values(["Score", "Country"], ascending=[False, True],
+                                    na_position="last", kind="stable").reset_index(drop=True)
+        ranks = np.arange(1, len(result) + 1, dtype=np.float64)
+        ranks[result["Score"].isna().to_numpy()] = np.nan
+        result.insert(0, "Rank", pd.array(ranks, dtype="Int64"))
+        return result
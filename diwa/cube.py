@@ -0,0 +1,161 @@
+"""Indexed Country x Indicator x Year view over the long-form DIWA frame."""
+
+import numpy as np
+import pandas as pd
+
+from diwa.frozen import freeze
+from diwa.spans import traced
+
+KEYS = ["Country", "Indicator", "Year"]
+
+
+def _runs(*columns):
+    """Return (starts, stops) of the runs of equal keys in pre-sorted columns."""
+    n = len(columns[0])
+    if n == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    change = np.zeros(n, dtype=bool)
+    change[0] = True
+    for col in columns:
+        change[1:] |= col[1:] != col[:-1]
+    starts = np.flatnonzero(change)
+    stops = np.append(starts[1:], n)
+    return starts, stops
+
+
+class DiwaCube:
+    """Sorted long-form frame plus positional indexes for fast lookups.
+
+    Rows are sorted by Country, Indicator and Year, so every country and every
+    (country, indicator) series is a contiguous block that can be sliced
+    without scanning. Indicator lookups use precomputed row positions. Every
+    lookup therefore costs roughly the size of its result, not the dataset.
+
+    ``latest`` is the materialized snapshot of the most recent value of every
+    (country, indicator) series together with its year, indexed the same way.
+
+    Both frames are read-only (see ``diwa.frozen``): one cube serves every
+    session, so lookups hand out its rows without copying them.
+
+    ``presorted`` skips the sort for frames already ordered by ``KEYS``, such
+    as the rows of a ``diwa.partitions.Snapshot``.
+    """
+
+    @traced("data.cube_build")
+    def __init__(self, df, presorted=False):
+        if not presorted:
+            df = df.sort_values(KEYS, kind="mergesort")
+        frame = freeze(df.set_axis(pd.RangeIndex(len(df)), copy=False))
+        self.frame = frame
+
+        country = frame["Country"].to_numpy()
+        indicator = frame["Indicator"].to_numpy()
+
+        starts, stops = _runs(country)
+        self._country_rows = {country[s]: slice(s, e) for s, e in zip(starts, stops)}
+
+        starts, series_stops = _runs(country, indicator)
+        self._series_rows = {
+            (country[s], indicator[s]): slice(s, e) for s, e in zip(starts, series_stops)
+        }
+
+        self._country_indicators = {}
+        for c, ind in self._series_rows:
+            self._country_indicators.setdefault(c, []).append(ind)
+
+        self._indicator_rows = frame.groupby("Indicator", sort=True).indices
+
+        self.countries = list(self._country_rows)
+        self.indicators = list(self._indicator_rows)
+
+        # Last row of each series is its latest year, since Year is the last sort key
+        self.latest = freeze(frame.iloc[series_stops - 1].reset_index(drop=True))
+        latest_country = self.latest["Country"].to_numpy()
+        starts, stops = _runs(latest_country)
+        self._latest_country_rows = {
+            latest_country[s]: slice(s, e) for s, e in zip(starts, stops)
+        }
+        self._latest_series_row = {key: i for i, key in enumerate(self._series_rows)}
+        self._latest_indicator_rows = self.latest.groupby("Indicator", sort=True).indices
+
+        # Widest-coverage indicators first, so selectbox defaults show most countries
+        self.indicators_by_coverage = sorted(
+            self.indicators, key=lambda ind: -len(self._latest_indicator_rows[ind])
+        )
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _empty(self):
+        return self.frame.iloc[0:0]
+
+    def _take(self, slices):
+        slices = [s for s in slices if s is not None]
+        if not slices:
+            return self._empty()
+        if len(slices) == 1:
+            return self.frame.iloc[slices[0]]
+        return self.frame.iloc[np.concatenate([np.arange(s.start, s.stop) for s in slices])]
+
+    @traced("filter.by_country")
+    def by_country(self, country):
+        """All rows for one country."""
+        return self._take([self._country_rows.get(country)])
+
+    @traced("filter.by_indicator")
+    def by_indicator(self, indicator):
+        """All rows for one indicator, across countries."""
+        rows = self._indicator_rows.get(indicator)
+        if rows is None:
+            return self._empty()
+        return self.frame.iloc[rows]
+
+    @traced("filter.series")
+    def series(self, country, indicator):
+        """The time series of one indicator in one country."""
+        return self._take([self._series_rows.get((country, indicator))])
+
+    @traced("filter.select")
+    def select(self, indicator=None, countries=None):
+        """Rows matching an optional indicator and an optional list of countries."""
+        if countries is None:
+            if indicator is None:
+                return self.frame
+            return self.by_indicator(indicator)
+        if indicator is None:
+            return self._take([self._country_rows.get(c) for c in countries])
+        return self._take([self._series_rows.get((c, indicator)) for c in countries])
+
+    def series_keys(self):
+        """``(country, indicator)`` of every series, in row order."""
+        return list(self._series_rows)
+
+    def select_series(self, keys):
+        """Rows of the ``(country, indicator)`` series in ``keys``, in row order."""
+        keys = sorted(key for key in keys if key in self._series_rows)
+        return self._take([self._series_rows[key] for key in keys])
+
+    @traced("filter.latest_for_indicator")
+    def latest_for_indicator(self, indicator, countries=None):
+        """Latest value and year of ``indicator`` per country."""
+        if countries is None:
+            rows = self._latest_indicator_rows.get(indicator)
+        else:
+            rows = [self._latest_series_row.get((c, indicator)) for c in countries]
+            rows = [r for r in rows if r is not None]
+        if rows is None or len(rows) == 0:
+            return self.latest.iloc[0:0]
+        return self.latest.iloc[rows]
+
+    @traced("filter.latest_for_country")
+    def latest_for_country(self, country):
+        """Latest value and year of every indicator reported by ``country``."""
+        rows = self._latest_country_rows.get(country)
+        if rows is None:
+            return self.latest.iloc[0:0]
+        return self.latest.iloc[rows]
+
+    def indicators_for(self, country):
+        """Indicators that have at least one value for ``country``."""
+        return list(self._country_indicators.get(country, []))
@@ -0,0 +1,130 @@
+"""Loading the DIWA dataset from the source CSV or the compact binary bundle.
+
+``python -m diwa.build`` converts ``data/diwa.csv`` into ``data/diwa.npz``: an
+uncompressed NumPy bundle with typed numeric columns, string columns stored as
+dictionary codes plus a table of unique values, and rows already sorted by
+Country, Indicator and Year. ``load_dataset`` bulk-loads the bundle when it
+was built from the current CSV and falls back to streaming the CSV through
+``diwa.ingest`` otherwise.
+
+``dataset_version`` (from ``diwa.version``) fingerprints the data files by
+content. The app passes it into every cached loader so a data drop invalidates
+exactly the results that depend on it, without a restart.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from diwa.cube import KEYS
+from diwa.ingest import ALIASES_PATH, CHUNKSIZE, ingest
+from diwa.version import file_fingerprint
+
+CSV_PATH = "data/diwa.csv"
+BUNDLE_PATH = "data/diwa.npz"
+
+# Bump when the bundle layout changes so old artifacts are rebuilt
+BUNDLE_FORMAT = 3
+
+
+def read_diwa_csv(path=CSV_PATH, chunksize=CHUNKSIZE):
+    """Stream, clean and canonicalize the source CSV (see ``diwa.ingest``)."""
+    df, _ = ingest(path, chunksize=chunksize)
+    return df
+
+
+def _aliases_sha256():
+    # The alias table changes the ingest output, so it is part of freshness
+    if not os.path.exists(ALIASES_PATH):
+        return ""
+    return file_fingerprint(ALIASES_PATH)["sha256"]
+
+
+def _smallest_code_dtype(n):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def write_bundle(df, path=BUNDLE_PATH, source=CSV_PATH, compress=False, portable=False):
+    """Write ``df`` as a dictionary-encoded ``.npz`` bundle built from ``source``.
+
+    ``compress`` deflates the arrays: smaller to download (the stlite build),
+    slightly slower to load. ``portable`` leaves out the source's mtime, which
+    only spares local freshness checks a hash, so the same data always writes
+    the same bytes wherever it was checked out.
+    """
+    df = df.sort_values(KEYS, kind="mergesort").reset_index(drop=True)
+    fingerprint = file_fingerprint(source)
+    arrays = {
+        "__format": np.array(BUNDLE_FORMAT),
+        "__columns": np.array(list(df.columns), dtype=str),
+        "__source_size": np.array(fingerprint["size"]),
+        "__source_sha256": np.array(fingerprint["sha256"]),
+        "__aliases_sha256": np.array(_aliases_sha256()),
+    }
+    if not portable:
+        arrays["__source_mtime_ns"] = np.array(fingerprint["mtime_ns"])
+    for name in df.columns:
+        col = df[name]
+        if name == "Year":
+            arrays[name] = col.to_numpy(dtype=np.int16)
+        elif pd.api.types.is_numeric_dtype(col):
+            arrays[name] = col.to_numpy(dtype=np.float64)
+        else:
+            codes, uniques = pd.factorize(col, sort=True)
+            arrays[name + "__codes"] = codes.astype(_smallest_code_dtype(len(uniques)))
+            arrays[name + "__values"] = np.asarray(uniques, dtype=str)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+def _bundle_is_fresh(bundle, source):
+    if int(bundle["__format"]) != BUNDLE_FORMAT:
+        return False
+    if str(bundle["__aliases_sha256"]) != _aliases_sha256():
+        return False
+    st = os.stat(source)
+    if st.st_size != int(bundle["__source_size"]):
+        return False
+    if "__source_mtime_ns" in bundle.files and st.st_mtime_ns == int(bundle["__source_mtime_ns"]):
+        return True
+    # Same size but touched (e.g. a fresh checkout): compare contents
+    return file_fingerprint(source)["sha256"] == str(bundle["__source_sha256"])
+
+
+def read_bundle(path=BUNDLE_PATH, source=CSV_PATH):
+    """Load a bundle, or return None when it is missing or stale for ``source``."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as bundle:
+        if os.path.exists(source) and not _bundle_is_fresh(bundle, source):
+            return None
+        data = {}
+        for name in bundle["__columns"]:
+            name = str(name)
+            if name in bundle.files:
+                data[name] = bundle[name]
+                continue
+            codes = bundle[name + "__codes"]
+            # Decode through an object table so rows share one str per value;
+            # code -1 (missing) lands on the trailing NaN
+            values = np.append(bundle[name + "__values"].astype(object), np.nan)
+            data[name] = values[codes]
+    df = pd.DataFrame(data)
+    df["Year"] = df["Year"].astype(np.int64)
+    return df
+
+
+def load_dataset(csv_path=CSV_PATH, bundle_path=BUNDLE_PATH):
+    """Load the dataset, preferring an up-to-date bundle over parsing the CSV."""
+    df = read_bundle(bundle_path, source=csv_path)
+    if df is None:
+        df = read_diwa_csv(csv_path)
+    return df
@@ -0,0 +1,117 @@
+"""Serializing dataset selections for download.
+
+Exports are produced only when a user asks for one; the app caches the bytes
+by dataset version, selection and format. The all-countries archive is
+written to disk one country at a time, so memory holds a single country's
+export rather than the whole archive, and is reused until the data changes.
+It is written under ``static/`` by default, which the server streams from
+disk (``server.enableStaticServing``), so it never has to be read into memory
+to be downloaded either (see ``static_url``).
+
+Excel output needs the optional ``openpyxl`` package and Parquet needs
+``pyarrow`` or ``fastparquet``; without them the format is simply not offered.
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+# Format name -> (file extension, MIME type)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+ZIP_MIME = "application/zip"
+
+# Served at STATIC_URL by Streamlit's static file handler
+STATIC_DIR = "static"
+STATIC_URL = "app/static"
+
+EXPORT_DIR = os.environ.get("DIWA_EXPORT_DIR", os.path.join(STATIC_DIR, "exports"))
+
+# Format name -> any one of the packages pandas can write it with
+WRITERS = {
+    "Parquet": ("pyarrow", "fastparquet"),
+    "Excel": ("openpyxl",),
+}
+
+# Excel caps sheet names at 31 characters
+_SHEET_NAME_MAX = 31
+
+
+def available_formats():
+    """Format names whose writer is installed, in display order."""
+    return [
+        name for name in FORMATS
+        if name not in WRITERS
+        or any(importlib.util.find_spec(package) is not None for package in WRITERS[name])
+    ]
+
+
+def file_name(stem, fmt):
+    return f"{stem}.{FORMATS[fmt][0]}"
+
+
+def to_bytes(df, fmt, sheet_name="data"):
+    """Serialize ``df`` (without its index) in format ``fmt``."""
+    if fmt == "CSV":
+        return df.to_csv(index=False).encode("utf-8")
+    buffer = io.BytesIO()
+    if fmt == "Parquet":
+        df.to_parquet(buffer, index=False)
+    elif fmt == "Excel":
+        df.to_excel(buffer, index=False, sheet_name=sheet_name[:_SHEET_NAME_MAX],
+                    engine="openpyxl")
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    return buffer.getvalue()
+
+
+def write_zip(parts, path, fmt):
+    """Write ``(stem, frame)`` pairs from the iterable ``parts`` to a zip at ``path``.
+
+    Each part is serialized and written before the next one is produced.
+    CSV and Excel entries are deflated; Parquet is already compressed.
+    """
+    compression = zipfile.ZIP_STORED if fmt == "Parquet" else zipfile.ZIP_DEFLATED
+    # Unique temp name: concurrent sessions may build the same archive
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", compression=compression) as archive:
+            for stem, frame in parts:
+                archive.writestr(file_name(stem, fmt), to_bytes(frame, fmt, sheet_name=stem))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def archive_path(version, fmt, export_dir=EXPORT_DIR):
+    """Where the all-countries archive for a dataset version and format lives."""
+    return os.path.join(export_dir, f"diwa_{version}_{FORMATS[fmt][0]}.zip")
+
+
+def static_url(path, static_dir=STATIC_DIR):
+    """URL the server streams ``path`` from, or None when it is outside
+    ``static_dir`` or there is no server (the stlite build)."""
+    if sys.platform == "emscripten":
+        return None
+    full, root = os.path.abspath(path), os.path.abspath(static_dir)
+    if os.path.commonpath([full, root]) != root:
+        return None
+    return STATIC_URL + "/" + os.path.relpath(full, root).replace(os.sep, "/")
+
+
+def country_archive(cube, version, fmt, export_dir=EXPORT_DIR):
+    """Path of the all-countries archive, writing it first if needed."""
+    path = archive_path(version, fmt, export_dir)
+    if not os.path.exists(path):
+        os.makedirs(export_dir, exist_ok=True)
+        parts = ((country, cube.by_country(country)) for country in cube.countries)
+        write_zip(parts, path, fmt)
+    return path
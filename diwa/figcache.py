@@ -0,0 +1,85 @@
+"""Process-wide LRU cache of built Plotly figures.
+
+Plotly Express figure construction is the dominant per-rerun cost of the
+chart pages, and many sessions look at the same few views. Figures are cached
+by the canonical view parameters (page, dataset version, selection), bounded
+by entry count and age, and shared across sessions. Cached figures are treated
+as read-only: all ``update_layout`` calls belong inside the builder.
+
+``postprocess`` runs once on each built figure before it is cached; the app
+passes ``diwa.payload.slim`` to shrink what every later rerun sends.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from diwa.spans import span
+
+DEFAULT_MAXSIZE = int(os.environ.get("DIWA_FIGURE_CACHE_SIZE", "256"))
+DEFAULT_TTL = float(os.environ.get("DIWA_FIGURE_CACHE_TTL", "3600"))
+
+
+class FigureCache:
+    """Thread-safe LRU mapping of view keys to figures with a TTL."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, postprocess=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.postprocess = postprocess
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_build(self, key, build):
+        """Return the cached figure for ``key``, calling ``build()`` on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, figure = entry
+                if now - created <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return figure
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Build outside the lock so other sessions are not blocked meanwhile
+        with span("figure.build", view=key[0]):
+            figure = build()
+        if self.postprocess is not None:
+            with span("figure.postprocess", view=key[0]):
+                figure = self.postprocess(figure)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), figure)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters and occupancy, e.g. for a debug panel."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,108 @@
+"""Read-only frames for the data every session shares.
+
+The dataset and the indexes built on it are held once per process
+(``st.cache_resource``) and handed to every session and rerun without a copy.
+Their frames are ``FrozenFrame``s on read-only NumPy arrays, so changing
+one raises ``ValueError`` instead of silently changing the data under every
+other session:
+
+- assignment through ``[]``, ``.loc``, ``.iloc``, ``.at`` and ``.iat``,
+  including whole columns, which pandas would otherwise satisfy by swapping
+  in a new writable block
+- ``insert``, ``del`` / ``pop`` and every ``inplace=True`` method
+- writes into the arrays themselves, such as through ``to_numpy()``
+  (``assignment destination is read-only``)
+
+Anything derived (filters by row positions, sorts, ``assign``, ``copy``) is
+an ordinary writable ``DataFrame``. Columns and slices taken out of a shared
+frame are views on its read-only arrays: writing values into them raises, and
+replacing a whole column of a slice only changes the slice.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.core.indexing import _AtIndexer, _iAtIndexer, _iLocIndexer, _LocIndexer
+
+READ_ONLY = "shared frames are read-only; build a new frame (assign, copy) instead"
+
+
+def _refuse(*args, **kwargs):
+    raise ValueError(READ_ONLY)
+
+
+class _FrozenLoc(_LocIndexer):
+    __setitem__ = _refuse
+
+
+class _FrozenILoc(_iLocIndexer):
+    __setitem__ = _refuse
+
+
+class _FrozenAt(_AtIndexer):
+    __setitem__ = _refuse
+
+
+class _FrozenIAt(_iAtIndexer):
+    __setitem__ = _refuse
+
+
+class FrozenFrame(pd.DataFrame):
+    """A DataFrame that refuses every write (see the module docstring).
+
+    Results of its methods are plain ``DataFrame``s, so only the shared frame
+    itself is frozen.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    @property
+    def loc(self):
+        return _FrozenLoc("loc", self)
+
+    @property
+    def iloc(self):
+        return _FrozenILoc("iloc", self)
+
+    @property
+    def at(self):
+        return _FrozenAt("at", self)
+
+    @property
+    def iat(self):
+        return _FrozenIAt("iat", self)
+
+    __setitem__ = _refuse
+    __delitem__ = _refuse
+    insert = _refuse
+    pop = _refuse
+    # Every inplace=True method ends here
+    _update_inplace = _refuse
+
+
+def readonly(array):
+    """``array`` as a NumPy array that refuses writes (a view, no copy)."""
+    array = np.asarray(array).view()
+    array.flags.writeable = False
+    return array
+
+
+def _frozen_column(column):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        values = pd.Categorical.from_codes(readonly(column.cat.codes), dtype=column.dtype)
+    else:
+        values = readonly(column.to_numpy())
+    # With the dtype given, pandas skips scanning object columns for dates
+    return pd.Series(values, index=column.index, dtype=values.dtype, copy=False)
+
+
+def freeze(df):
+    """``df`` on read-only column arrays, sharing its memory."""
+    # copy=False keeps one block per column, each backed by its frozen array
+    return FrozenFrame(
+        {name: _frozen_column(column) for name, column in df.items()},
+        index=df.index,
+        copy=False,
+    )
+
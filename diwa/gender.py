@@ -0,0 +1,107 @@
+"""Derived gender indicators from ``_Female`` / ``_Male`` indicator pairs.
+
+Indicators named ``<base>_Female`` and ``<base>_Male`` are paired
+automatically. For every country, year and subnational flag (and region)
+reported on both sides, three indicators are derived:
+
+- ``<base>_Gender Gap``: female minus male, in the indicator's own units
+- ``<base>_Gender Ratio``: female divided by male
+- ``<base>_Gender Parity Index``: the adjusted parity index, female/male when
+  women trail and 2 - male/female otherwise, so 1 is parity and the scale is
+  symmetric around it
+
+All pairs are joined and computed in one vectorized pass when the dataset is
+loaded, so the pages treat the results like any other indicator.
+"""
+
+import numpy as np
+import pandas as pd
+
+FEMALE = "_Female"
+MALE = "_Male"
+SEPARATOR = "_"
+
+# Rows of the two sides must agree on these to be paired
+JOIN_KEYS = ["Country", "Year", "Subnational", "Region"]
+
+REMARKS = {
+    "Gender Gap": "Derived: female minus male",
+    "Gender Ratio": "Derived: female / male",
+    "Gender Parity Index": "Derived: adjusted gender parity index (1 = parity)",
+}
+
+
+def gender_base(indicator):
+    """The base of a ``_Female`` / ``_Male`` or derived indicator, else None."""
+    for suffix in (FEMALE, MALE, *(SEPARATOR + measure for measure in REMARKS)):
+        if indicator.endswith(suffix):
+            return indicator[:-len(suffix)]
+    return None
+
+
+def find_pairs(indicators):
+    """``{base: (female, male)}`` for every base reported under both suffixes."""
+    indicators = set(indicators)
+    pairs = {}
+    for name in indicators:
+        if name.endswith(FEMALE):
+            base = name[:-len(FEMALE)]
+            if base + MALE in indicators:
+                pairs[base] = (name, base + MALE)
+    return dict(sorted(pairs.items()))
+
+
+def gender_indicators(df, pairs=None):
+    """Long-form rows of the derived indicators, with ``df``'s columns.
+
+    Source columns are carried over from the female side. Ratios and parity
+    indices that are undefined (a zero denominator) are left out.
+    """
+    if pairs is None:
+        pairs = find_pairs(df["Indicator"].unique())
+    if not pairs:
+        return df.iloc[:0]
+
+    female_base = {female: base for base, (female, _) in pairs.items()}
+    male_base = {male: base for base, (_, male) in pairs.items()}
+    female = df[df["Indicator"].isin(female_base)]
+    female = female.assign(Base=female["Indicator"].map(female_base))
+    male = df[df["Indicator"].isin(male_base)]
+    male = male.assign(Base=male["Indicator"].map(male_base))
+
+    # One hash join across all pairs at once
+    joined = female.merge(
+        male[["Base", *JOIN_KEYS, "Value"]].rename(columns={"Value": "Male"}),
+        on=["Base", *JOIN_KEYS],
+    )
+    f = joined["Value"].to_numpy(dtype=np.float64)
+    m = joined["Male"].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = f / m
+        parity = np.where(f <= m, ratio, 2 - m / f)
+    measures = {
+        "Gender Gap": f - m,
+        "Gender Ratio": ratio,
+        "Gender Parity Index": parity,
+    }
+
+    columns = list(df.columns)
+    parts = []
+    for measure, values in measures.items():
+        defined = np.isfinite(values)
+        part = joined.loc[defined, columns].assign(
+            Indicator=joined.loc[defined, "Base"] + SEPARATOR + measure,
+            Value=values[defined],
+        )
+        if "Remarks" in part:
+            part["Remarks"] = REMARKS[measure]
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def with_gender_indicators(df):
+    """``df`` plus its derived gender indicators."""
+    derived = gender_indicators(df)
+    if derived.empty:
+        return df
+    return pd.concat([df, derived], ignore_index=True)
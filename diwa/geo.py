@@ -0,0 +1,234 @@
+"""Bundled ASEAN-plus-partners country geometry for the choropleth.
+
+``assets/geo/asean.geojson`` holds one MultiPolygon per country keyed by ISO
+3166 alpha-3 code (feature ``id``). ``python -m diwa.geo`` precomputes
+simplified levels from it into ``assets/geo/asean_levels.json``, which the map
+loads once per process. Nothing is fetched at runtime, so the map also works
+offline and in the stlite build. ``level_for_bounds`` picks the level from the
+map's scale: the coarsest one whose simplification stays under
+``MAX_SHIFT_PIXELS`` when the given bounds fill the figure.
+
+Source outlines were dissolved from the admin-1 maps in echarts-countries-js
+(MIT licensed).
+"""
+
+import argparse
+import functools
+import json
+import os
+
+import numpy as np
+
+SOURCE_PATH = "assets/geo/asean.geojson"
+LEVELS_PATH = "assets/geo/asean_levels.json"
+
+# Canonical country names (see diwa.ingest.COUNTRIES) to ISO 3166 alpha-3
+ISO3 = {
+    "Brunei": "BRN",
+    "Cambodia": "KHM",
+    "Indonesia": "IDN",
+    "Laos": "LAO",
+    "Malaysia": "MYS",
+    "Myanmar": "MMR",
+    "Philippines": "PHL",
+    "Singapore": "SGP",
+    "Thailand": "THA",
+    "Vietnam": "VNM",
+    "Papua New Guinea": "PNG",
+    "Timor-Leste": "TLS",
+}
+
+# Where the map labels each country (see views.loaders.get_country_coordinates)
+COORDINATES = {
+    'Brunei': {'lat': 4.5353, 'lon': 114.7277},
+    'Cambodia': {'lat': 12.5657, 'lon': 104.9910},
+    'Indonesia': {'lat': -0.7893, 'lon': 113.9213},
+    'Laos': {'lat': 19.8563, 'lon': 102.4955},
+    'Malaysia': {'lat': 4.2105, 'lon': 101.9758},
+    'Myanmar': {'lat': 21.9162, 'lon': 95.9560},
+    'Philippines': {'lat': 12.8797, 'lon': 121.7740},
+    'Singapore': {'lat': 1.3521, 'lon': 103.8198},
+    'Thailand': {'lat': 15.8700, 'lon': 100.9925},
+    'Vietnam': {'lat': 14.0583, 'lon': 108.2772},
+    'Papua New Guinea': {'lat': -6.3150, 'lon': 143.9555},
+    'Timor-Leste': {'lat': -8.8742, 'lon': 125.7275}
+}
+
+# level -> (Douglas-Peucker tolerance in degrees, min polygon area in deg^2,
+# coordinate decimals). Each country always keeps its largest polygon.
+LEVELS = {
+    "high": (0.02, 0.002, 3),
+    "medium": (0.08, 0.05, 2),
+    "low": (0.15, 0.15, 1),
+}
+# What the whole region draws at (see level_for_bounds)
+DEFAULT_LEVEL = "low"
+
+# Figure size in pixels (width at a typical container width) and how far, in
+# pixels, simplified borders may move before a level counts as too coarse.
+# Country outlines under a choropleth fill stay readable at 2-3 pixels.
+MAP_SIZE = (1000, 600)
+MAX_SHIFT_PIXELS = 2.5
+
+
+def _simplify(points, tolerance):
+    """Douglas-Peucker on an (n, 2) array; returns the kept points."""
+    n = len(points)
+    if n < 3:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            dist = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            dist = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def _area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def _simplify_polygon(polygon, tolerance, decimals):
+    rings = []
+    for ring in polygon:
+        simplified = np.round(_simplify(np.asarray(ring, dtype=float), tolerance), decimals)
+        if len(simplified) < 4:
+            if rings:
+                continue  # collapsed hole
+            simplified = np.round(np.asarray(ring, dtype=float), decimals)
+        rings.append(simplified.tolist())
+    return rings
+
+
+def simplify_feature(feature, tolerance, min_area, decimals):
+    polygons = feature["geometry"]["coordinates"]
+    areas = [_area(np.asarray(p[0], dtype=float)) for p in polygons]
+    largest = int(np.argmax(areas))
+    kept = [
+        _simplify_polygon(p, tolerance, decimals)
+        for i, (p, area) in enumerate(zip(polygons, areas))
+        if i == largest or area >= min_area
+    ]
+    return {
+        "type": "Feature",
+        "id": feature["id"],
+        "properties": feature["properties"],
+        "geometry": {"type": "MultiPolygon", "coordinates": kept},
+    }
+
+
+def build_levels(source=SOURCE_PATH, out=LEVELS_PATH):
+    """Precompute every simplification level and write them to ``out``."""
+    with open(source, encoding="utf-8") as f:
+        collection = json.load(f)
+    levels = {}
+    for name, (tolerance, min_area, decimals) in LEVELS.items():
+        levels[name] = {
+            "type": "FeatureCollection",
+            "features": [
+                simplify_feature(feature, tolerance, min_area, decimals)
+                for feature in collection["features"]
+            ],
+        }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"levels": levels}, f, separators=(",", ":"))
+    return levels
+
+
+@functools.lru_cache(maxsize=None)
+def _load_levels(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["levels"]
+
+
+def available_levels(path=LEVELS_PATH):
+    """Levels present in the levels file, most detailed first.
+
+    The stlite build ships a subset to keep the page small.
+    """
+    present = _load_levels(path)
+    return [level for level in LEVELS if level in present]
+
+
+@functools.lru_cache(maxsize=64)
+def _bounds(countries, path):
+    # The coarsest level is close enough for framing and quickest to scan
+    points = np.concatenate([
+        np.asarray(ring, dtype=float)
+        for feature in load_geometry(available_levels(path)[-1], countries, path)["features"]
+        for polygon in feature["geometry"]["coordinates"]
+        for ring in polygon
+    ])
+    (lon_min, lat_min), (lon_max, lat_max) = points.min(axis=0), points.max(axis=0)
+    return float(lon_min), float(lon_max), float(lat_min), float(lat_max)
+
+
+def bounds(countries, path=LEVELS_PATH):
+    """``(lon_min, lon_max, lat_min, lat_max)`` around the outlines of ``countries``."""
+    return _bounds(tuple(sorted(countries)), path)
+
+
+def level_for_bounds(box, size=MAP_SIZE, path=LEVELS_PATH):
+    """The coarsest available level that looks exact on a ``size`` map of ``box``."""
+    lon_min, lon_max, lat_min, lat_max = box
+    degrees_per_pixel = max((lon_max - lon_min) / size[0], (lat_max - lat_min) / size[1])
+    levels = available_levels(path)
+    for level in reversed(levels):
+        if LEVELS[level][0] <= degrees_per_pixel * MAX_SHIFT_PIXELS:
+            return level
+    return levels[0]
+
+
+def load_geometry(level=DEFAULT_LEVEL, countries=None, path=LEVELS_PATH):
+    """GeoJSON FeatureCollection at ``level``, optionally limited to ``countries``.
+
+    ``countries`` are canonical names; limiting the collection keeps figure
+    payloads to the geometry actually drawn.
+    """
+    collection = _load_levels(path)[level]
+    if countries is None:
+        return collection
+    wanted = {ISO3[c] for c in countries if c in ISO3}
+    return {
+        "type": "FeatureCollection",
+        "features": [f for f in collection["features"] if f["id"] in wanted],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build simplified ASEAN map geometry.")
+    parser.add_argument("--source", default=SOURCE_PATH, help="source GeoJSON")
+    parser.add_argument("--out", default=LEVELS_PATH, help="levels file to write")
+    args = parser.parse_args(argv)
+
+    levels = build_levels(args.source, args.out)
+    for name, collection in levels.items():
+        points = sum(
+            len(ring)
+            for feature in collection["features"]
+            for polygon in feature["geometry"]["coordinates"]
+            for ring in polygon
+        )
+        size = len(json.dumps(collection, separators=(",", ":")))
+        print(f"{name:>6}: {points:6d} points, {size:9,d} bytes")
+    print(f"Wrote {args.out} ({os.path.getsize(args.out):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
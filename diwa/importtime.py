@@ -0,0 +1,141 @@
+"""Import-time report for the app shell and each page, checked against budgets.
+
+Usage::
+
+    python -m diwa.importtime [--runs 3] [--json]
+
+Every target is measured in fresh ``python -X importtime`` processes. Pages
+are imported after the shell's own imports, so a page's figure is what opening
+it first adds to a cold server process. The check fails when the median time
+of a target exceeds its budget or when it imports a module it must not (for
+example plotly on the Dashboard).
+"""
+
+import argparse
+import ast
+import json
+import statistics
+import subprocess
+import sys
+
+SHELL = "app.py"
+
+# target -> (budget in ms, modules it must not import). Page budgets exclude
+# the shell; they leave room for slower machines, the module lists do not.
+BUDGETS = {
+    "app.py": (1000, ("numpy", "pandas", "plotly.express")),
+    "views/dashboard.py": (1200, ("plotly.express",)),
+    "views/asean_map.py": (2000, ()),
+    "views/country_profiles.py": (2000, ()),
+    "views/comparison.py": (2000, ()),
+    "views/similarity.py": (2000, ()),
+    "views/data_stories.py": (50, ("numpy", "pandas", "plotly.express")),
+    "views/about.py": (50, ("numpy", "pandas", "plotly.express")),
+}
+
+MARK = "--diwa-importtime--"
+TOP = 5
+
+
+def top_level_imports(path):
+    """Source of the module-level import statements of a script."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    return [
+        ast.get_source_segment(source, node)
+        for node in ast.parse(source).body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+
+
+def _snippet(target):
+    # Shell imports, then a marker, then the page's; only the part after the
+    # marker is attributed to the target
+    mark = f"sys.stderr.write({MARK!r} + '\\n'); sys.stderr.flush()"
+    lines = ["import sys"]
+    if target != SHELL:
+        lines += top_level_imports(SHELL)
+    lines.append(mark)
+    lines += top_level_imports(target)
+    return "\n".join(lines)
+
+
+def _parse(stderr):
+    """``(name, depth, self_us, cumulative_us)`` for imports after the marker."""
+    records = []
+    for line in stderr.split(MARK, 1)[-1].splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append((module, depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def measure(target, runs=3):
+    """Median import time of ``target`` in ms, its heaviest imports and all modules."""
+    code = _snippet(target)
+    totals, heaviest, modules = [], {}, set()
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, check=True,
+        )
+        records = _parse(proc.stderr)
+        totals.append(sum(r[2] for r in records) / 1000)
+        for module, depth, _, cumulative_us in records:
+            modules.add(module)
+            if depth == 0:
+                heaviest.setdefault(module, []).append(cumulative_us / 1000)
+    top = sorted(
+        ((module, statistics.median(times)) for module, times in heaviest.items()),
+        key=lambda item: -item[1],
+    )[:TOP]
+    return statistics.median(totals), top, modules
+
+
+def _imports(modules, name):
+    return any(m == name or m.startswith(name + ".") for m in modules)
+
+
+def check(budgets=BUDGETS, runs=3):
+    """Measure every target; returns a report dict with an overall ``ok`` flag."""
+    results = []
+    for target, (budget_ms, forbidden) in budgets.items():
+        ms, top, modules = measure(target, runs)
+        banned = [name for name in forbidden if _imports(modules, name)]
+        results.append({
+            "target": target,
+            "ms": round(ms, 1),
+            "budget_ms": budget_ms,
+            "forbidden_imported": banned,
+            "heaviest": [[module, round(t, 1)] for module, t in top],
+            "ok": ms <= budget_ms and not banned,
+        })
+    return {"python": sys.version.split()[0], "runs": runs,
+            "ok": all(r["ok"] for r in results), "targets": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="processes per target (median)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = check(runs=args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for r in report["targets"]:
+            status = "ok" if r["ok"] else "OVER BUDGET"
+            if r["forbidden_imported"]:
+                status = "imports " + ", ".join(r["forbidden_imported"])
+            print(f"{r['target']:28s} {r['ms']:8.1f} ms / {r['budget_ms']:5d} ms  {status}")
+            heaviest = ", ".join(f"{m} {t:.1f}" for m, t in r["heaviest"]) or "-"
+            print(f"{'':28s} {heaviest}")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
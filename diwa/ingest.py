@@ -0,0 +1,248 @@
+"""Streaming ingest of DIWA source CSVs.
+
+Source files are read in fixed-size chunks. Each chunk is renamed, cleaned and
+immediately dictionary-encoded against process-wide string tables, so only
+integer codes and numeric columns are kept between chunks and memory stays
+bounded by the size of the cleaned dataset, not the raw text.
+
+Country and indicator names are canonicalized through ``data/aliases.csv``
+(after whitespace cleanup). Rows repeating an existing (Country, Indicator,
+Year, Subnational, Region) key are dropped, keeping the first occurrence. Exact
+repeats are only counted; repeats whose values differ are all listed in the
+validation report under ``conflicts``, with every value and the one kept, so a
+maintainer can resolve them in the source.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+ALIASES_PATH = "data/aliases.csv"
+REPORT_PATH = "data/validation_report.json"
+CHUNKSIZE = 100_000
+
+COLUMNS = {
+    "country": "Country",
+    "year": "Year",
+    "indicator_name": "Indicator",
+    "indicator_value": "Value",
+    "subnational": "Subnational",
+    "remarks": "Remarks",
+    "source": "Source",
+    "source_url": "SourceURL",
+    "region": "Region",  # optional; names the region of subnational rows
+}
+
+# Canonical country names, matching diwa.geo.COORDINATES
+COUNTRIES = (
+    "Brunei", "Cambodia", "Indonesia", "Laos", "Malaysia", "Myanmar",
+    "Philippines", "Singapore", "Thailand", "Vietnam", "Papua New Guinea",
+    "Timor-Leste",
+)
+
+DEDUP_KEYS = ["Country", "Indicator", "Year", "Subnational", "Region"]
+
+# Cap on exact duplicate groups listed in the report; conflicts are all listed
+MAX_REPORTED_DUPLICATES = 1000
+
+
+def load_aliases(path=ALIASES_PATH):
+    """Read the alias table into ``{"country": {...}, "indicator": {...}}``."""
+    aliases = {"country": {}, "indicator": {}}
+    if not os.path.exists(path):
+        return aliases
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            aliases[row["kind"]][clean_text(row["alias"])] = clean_text(row["canonical"])
+    return aliases
+
+
+def clean_text(value):
+    """Trim and collapse whitespace, including after the ``_`` sub-indicator separator."""
+    value = re.sub(r"\s+", " ", value).strip()
+    return value.replace("_ ", "_")
+
+
+class _StringTable:
+    """Process-wide string dictionary shared by all chunks of one column."""
+
+    def __init__(self, canonicalize=None):
+        self.codes = {}
+        self.values = []
+        self.canonicalize = canonicalize
+        self.renamed = Counter()
+
+    def encode(self, column):
+        local_codes, uniques = pd.factorize(column)
+        lookup = np.empty(len(uniques), dtype=np.int32)
+        counts = None
+        for i, raw in enumerate(uniques):
+            value = raw
+            if self.canonicalize is not None:
+                value = self.canonicalize(raw)
+                if value != raw:
+                    if counts is None:
+                        counts = np.bincount(local_codes[local_codes >= 0], minlength=len(uniques))
+                    self.renamed[raw] += int(counts[i])
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            lookup[i] = code
+        codes = lookup[np.maximum(local_codes, 0)] if len(lookup) else local_codes.astype(np.int32)
+        return np.where(local_codes < 0, -1, codes).astype(np.int32)
+
+    def decode(self, codes):
+        # One shared str object per distinct value; code -1 maps to NaN
+        table = np.empty(len(self.values) + 1, dtype=object)
+        table[:-1] = self.values
+        table[-1] = np.nan
+        return table[codes]
+
+
+def _canonicalizer(mapping):
+    def canonicalize(raw):
+        value = clean_text(raw)
+        return mapping.get(value, value)
+    return canonicalize
+
+
+def _read_chunks(paths, chunksize):
+    for path in paths:
+        with pd.read_csv(path, dtype=str, chunksize=chunksize) as reader:
+            for chunk in reader:
+                chunk.columns = chunk.columns.str.strip()
+                yield chunk.rename(columns=COLUMNS)
+
+
+def ingest(paths, chunksize=CHUNKSIZE, aliases=None):
+    """Stream ``paths`` into one cleaned frame; returns ``(frame, report)``."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if aliases is None:
+        aliases = load_aliases()
+
+    start = time.perf_counter()
+    tables = {}
+    for name in COLUMNS.values():
+        if name in ("Year", "Value"):
+            continue
+        canonicalize = None
+        if name == "Country":
+            canonicalize = _canonicalizer(aliases["country"])
+        elif name == "Indicator":
+            canonicalize = _canonicalizer(aliases["indicator"])
+        tables[name] = _StringTable(canonicalize)
+
+    parts = {name: [] for name in COLUMNS.values()}
+    report = {
+        "sources": [str(p) for p in paths],
+        "chunksize": chunksize,
+        "chunks": 0,
+        "rows_read": 0,
+        "dropped": {"missing_country": 0, "missing_indicator": 0,
+                    "missing_year": 0, "missing_value": 0},
+    }
+
+    for chunk in _read_chunks(paths, chunksize):
+        report["chunks"] += 1
+        report["rows_read"] += len(chunk)
+
+        year = pd.to_numeric(chunk["Year"], errors="coerce").to_numpy(dtype=np.float64)
+        value = pd.to_numeric(chunk["Value"], errors="coerce").to_numpy(dtype=np.float64)
+        missing = {
+            "missing_country": chunk["Country"].isna().to_numpy(),
+            "missing_indicator": chunk["Indicator"].isna().to_numpy(),
+            "missing_year": np.isnan(year),
+            "missing_value": np.isnan(value),
+        }
+        drop = np.zeros(len(chunk), dtype=bool)
+        for reason, mask in missing.items():
+            # Attribute each dropped row to its first failing check only
+            report["dropped"][reason] += int(np.count_nonzero(mask & ~drop))
+            drop |= mask
+        keep = ~drop
+
+        parts["Year"].append(year[keep].astype(np.int64))
+        parts["Value"].append(value[keep])
+        for name, table in tables.items():
+            if name in chunk:
+                column = chunk[name].to_numpy(dtype=object)[keep]
+                parts[name].append(table.encode(column))
+            else:
+                parts[name].append(np.full(int(keep.sum()), -1, dtype=np.int32))
+        del chunk
+
+    codes = {name: (np.concatenate(p) if p else np.empty(0, dtype=np.int32))
+             for name, p in parts.items()}
+    codes["Year"] = codes["Year"].astype(np.int64)
+    codes["Value"] = codes["Value"].astype(np.float64)
+
+    # Duplicate detection on the compact integer codes
+    keys = pd.DataFrame({name: codes[name] for name in DEDUP_KEYS})
+    duplicated = keys.duplicated(keep="first").to_numpy()
+    report["dropped"]["duplicate"] = int(duplicated.sum())
+    report["duplicates"], report["conflicts"] = _describe_duplicates(
+        keys, codes["Value"], tables
+    )
+
+    keep = ~duplicated
+    frame = pd.DataFrame({
+        name: codes[name][keep] if name in ("Year", "Value")
+        else tables[name].decode(codes[name][keep])
+        for name in COLUMNS.values()
+    })
+    frame = frame.sort_values(["Country", "Indicator", "Year"], kind="mergesort")
+    frame = frame.reset_index(drop=True)
+
+    report["rows_kept"] = len(frame)
+    report["renamed_countries"] = dict(tables["Country"].renamed)
+    report["renamed_indicators"] = dict(tables["Indicator"].renamed)
+    report["unknown_countries"] = sorted(
+        c for c in tables["Country"].values if isinstance(c, str) and c not in COUNTRIES
+    )
+    report["elapsed_s"] = round(time.perf_counter() - start, 4)
+    return frame, report
+
+
+def _describe_duplicates(keys, values, tables):
+    """``(exact, conflicts)``: repeated keys whose values agree (at most
+    ``MAX_REPORTED_DUPLICATES``) and every repeated key whose values differ."""
+    mask = keys.duplicated(keep=False).to_numpy()
+    if not mask.any():
+        return [], []
+    dup = keys[mask].assign(Value=values[mask])
+    exact, conflicts = [], []
+    for key, group in dup.groupby(DEDUP_KEYS, sort=True):
+        country, indicator, year, subnational, region = key
+        group_values = group["Value"].tolist()
+        conflict = len(set(group_values)) > 1
+        if not conflict and len(exact) >= MAX_REPORTED_DUPLICATES:
+            continue
+        entry = {
+            "country": tables["Country"].values[country],
+            "indicator": tables["Indicator"].values[indicator],
+            "year": int(year),
+            "subnational": tables["Subnational"].values[subnational] if subnational >= 0 else None,
+            "region": tables["Region"].values[region] if region >= 0 else None,
+            "values": group_values,
+        }
+        if conflict:
+            entry["kept"] = group_values[0]
+            conflicts.append(entry)
+        else:
+            exact.append(entry)
+    return exact, conflicts
+
+
+def write_report(report, path=REPORT_PATH):
+    """Write the validation report as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,87 @@
+"""Approximate memory accounting for the debug panel and the benchmarks.
+
+``deep_bytes`` walks an object graph (containers, instance attributes, frames
+and arrays) counting every object once, so data shared between the objects
+it is given is not counted twice. Frames count their index and string
+columns, each distinct string once; arrays count their buffer. Figures are
+rough: interpreter overhead and allocator slack are not included, which is
+what ``process_rss`` is for.
+
+Standard library only (frames and arrays are recognized by duck typing), so
+the debug panel can import it without pandas.
+"""
+
+import os
+import sys
+
+
+def deep_bytes(obj, _seen=None):
+    """Approximate bytes held by ``obj`` and everything it references."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if hasattr(obj, "memory_usage") and hasattr(obj, "index"):
+        return _frame_bytes(obj, seen)
+    if hasattr(obj, "nbytes") and hasattr(obj, "dtype"):
+        # A view counts the buffer of the array it was taken from, once
+        root = obj
+        while hasattr(getattr(root, "base", None), "nbytes"):
+            root = root.base
+        if root is not obj:
+            if id(root) in seen:
+                return 0
+            seen.add(id(root))
+        return int(root.nbytes)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_bytes(k, seen) + deep_bytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_bytes(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_bytes(vars(obj), seen)
+    return size
+
+
+def _frame_bytes(frame, seen):
+    # memory_usage(deep=True) refuses read-only object arrays, and would
+    # count a string shared by many rows once per row
+    size = int(frame.index.memory_usage())
+    columns = [column for _, column in frame.items()] if hasattr(frame, "columns") else [frame]
+    for column in columns:
+        size += int(column.memory_usage(index=False))
+        if column.dtype == object:
+            size += sum(deep_bytes(value, seen) for value in column.to_numpy())
+    return size
+
+
+def shared_bytes(objects):
+    """``{name: bytes}`` of each object, each shared object counted once overall."""
+    seen = set()
+    return {name: deep_bytes(obj, seen) for name, obj in objects.items()}
+
+
+def process_rss():
+    """Resident set size of this process in bytes, or None where unknown."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows, Pyodide
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Peak rather than current; kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
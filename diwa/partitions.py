@@ -0,0 +1,231 @@
+"""Partition-level refresh of the dataset from update batches.
+
+National partners send small per-country updates. Rather than being edited
+into ``data/diwa.csv`` (which means parsing and sorting everything again),
+they are dropped into ``data/batches/`` as CSV files in the source format and
+applied on top of the main dataset in file name order:
+
+- a batch row replaces the row with the same Country, Indicator, Year,
+  Subnational and Region, or adds a new one; rows are never deleted
+- within one batch the first row of a key wins, as in the main CSV
+
+The dataset is partitioned by (Country, Indicator). A ``Snapshot`` keeps the
+rows sorted by ``diwa.cube.KEYS``, so every partition is one contiguous
+block, and gives each partition a stamp that changes whenever a batch
+touches it. Applying a batch parses only that file, merges it into the
+partitions it touches, derives the gender indicators again for the
+``_Female`` / ``_Male`` pairs among them, and splices the new blocks in
+between the untouched ones without sorting those. A batch that adds a year
+beyond the dataset's last one changes how far every series is carried
+forward (see ``diwa.trends``), so it counts as touching every partition.
+
+``DatasetStore`` holds the latest snapshot of a process. When new batches
+appear it applies just those; when the main files change or a batch already
+applied is edited, removed or preceded by a new one, it starts over from the
+main files. Derived indexes update from their predecessor for the partitions
+that changed (``DatasetStore.derive``), and the stamps let cached figures
+outlive batches that do not touch their data. A snapshot restored from disk
+(``DatasetStore.restore``) is built on like one the store made itself.
+"""
+
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from diwa.cube import KEYS, _runs
+from diwa.frozen import freeze
+from diwa.gender import FEMALE, MALE, REMARKS, SEPARATOR, gender_base, gender_indicators
+from diwa.ingest import DEDUP_KEYS, ingest
+from diwa.spans import traced
+from diwa.version import BATCH_DIR, DATA_FILES, batch_files, dataset_version
+
+
+def _stamp(*parts):
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()[:12]
+
+
+def partition_blocks(frame):
+    """``{(country, indicator): (start, stop)}`` of a frame sorted by ``KEYS``."""
+    country = frame["Country"].to_numpy()
+    indicator = frame["Indicator"].to_numpy()
+    starts, stops = _runs(country, indicator)
+    return {(country[s], indicator[s]): (s, e) for s, e in zip(starts, stops)}
+
+
+def splice(old, old_blocks, new, new_blocks, order):
+    """Rows of ``old`` and ``new`` as one frame, one block per key of ``order``.
+
+    Blocks are ``(start, stop)`` row ranges. Each key's block comes from
+    ``new`` when ``new_blocks`` has it, else from ``old``. Rows are copied
+    once and never compared, so the cost is linear in the result.
+    """
+    starts = np.empty(len(order), dtype=np.int64)
+    stops = np.empty(len(order), dtype=np.int64)
+    for i, key in enumerate(order):
+        block = new_blocks.get(key)
+        if block is None:
+            starts[i], stops[i] = old_blocks[key]
+        else:
+            starts[i], stops[i] = block[0] + len(old), block[1] + len(old)
+    lengths = stops - starts
+    offsets = np.cumsum(lengths) - lengths
+    rows = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+    columns = {}
+    for name in old.columns:
+        before, after = old[name], new[name]
+        if isinstance(before.dtype, pd.CategoricalDtype):
+            values = pd.api.types.union_categoricals([before, after]).take(rows)
+        else:
+            values = np.concatenate([before.to_numpy(), after.to_numpy()])[rows]
+        columns[name] = pd.Series(values, dtype=values.dtype, copy=False)
+    return pd.DataFrame(columns, copy=False)
+
+
+@traced("data.read_batch")
+def read_batch(path):
+    """One batch file, cleaned and canonicalized like the main CSV."""
+    frame, _ = ingest(path)
+    return frame
+
+
+class Snapshot:
+    """The dataset after some batches: rows sorted by ``KEYS``, plus the row
+    block and the stamp of every (Country, Indicator) partition."""
+
+    def __init__(self, frame, base, applied=(), stamps=None):
+        self.frame = freeze(frame.set_axis(pd.RangeIndex(len(frame)), copy=False))
+        self.base = base
+        self.applied = tuple(applied)
+        self.blocks = partition_blocks(self.frame)
+        self.last_year = int(self.frame["Year"].max()) if len(self.frame) else 0
+        # Only partitions a batch touched have an entry; the rest carry the base
+        self.stamps = dict(stamps or {})
+        by_indicator = {}
+        for (_, indicator), stamp in sorted(self.stamps.items()):
+            by_indicator.setdefault(indicator, []).append(stamp)
+        self._indicator_stamps = {
+            indicator: _stamp(base, *stamps) for indicator, stamps in by_indicator.items()
+        }
+
+    @classmethod
+    @traced("data.snapshot")
+    def load(cls, frame, base):
+        """Snapshot of a full load; the only time every row is sorted."""
+        return cls(frame.sort_values(KEYS, kind="mergesort"), base)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def series_stamp(self, country, indicator):
+        """Changes whenever a batch touches the (country, indicator) partition."""
+        return self.stamps.get((country, indicator), self.base)
+
+    def indicator_stamp(self, indicator):
+        """Changes whenever a batch touches any partition of ``indicator``."""
+        return self._indicator_stamps.get(indicator, self.base)
+
+    def changed_since(self, base, stamps):
+        """Partitions that may differ from a snapshot with ``base`` and
+        ``stamps``, or None when the two do not share a base."""
+        if base != self.base:
+            return None
+        keys = self.stamps.keys() | stamps.keys()
+        return {key for key in keys if self.stamps.get(key) != stamps.get(key)}
+
+    def _rows(self, partitions):
+        blocks = [self.blocks[key] for key in partitions if key in self.blocks]
+        if not blocks:
+            return self.frame.iloc[:0]
+        return self.frame.iloc[np.concatenate([np.arange(s, e) for s, e in blocks])]
+
+    @traced("data.apply_batch")
+    def apply(self, batch, source):
+        """This snapshot with ``batch`` merged in; ``source`` is its ``(path, sha256)``."""
+        columns = list(self.frame.columns)
+        touched = set(zip(batch["Country"], batch["Indicator"]))
+        # The batch row wins over an existing row with the same key
+        merged = pd.concat([self._rows(touched), batch[columns]], ignore_index=True)
+        merged = merged.drop_duplicates(DEDUP_KEYS, keep="last")
+
+        # Derived gender partitions of every pair the batch touched, rebuilt
+        # whole from both sides (the untouched side as it was)
+        bases = {(c, gender_base(ind)) for c, ind in touched if ind.endswith((FEMALE, MALE))}
+        sides = {(c, base + suffix) for c, base in bases for suffix in (FEMALE, MALE)}
+        derived = gender_indicators(pd.concat([merged, self._rows(sides - touched)]))
+        replaced = touched | {
+            (c, base + SEPARATOR + measure) for c, base in bases for measure in REMARKS
+        }
+
+        rows = pd.concat([merged, derived[columns]], ignore_index=True)
+        rows = rows.drop_duplicates(DEDUP_KEYS, keep="last")
+        rows = rows.sort_values(KEYS, kind="mergesort").reset_index(drop=True)
+        blocks = partition_blocks(rows)
+        order = sorted((self.blocks.keys() - replaced) | blocks.keys())
+        frame = splice(self.frame, self.blocks, rows, blocks, order)
+
+        if len(rows) and rows["Year"].max() > self.last_year:
+            # Every series may now be carried forward further
+            replaced |= self.blocks.keys()
+        stamps = dict(self.stamps)
+        for key in replaced:
+            stamps[key] = _stamp(self.series_stamp(*key), source[1])
+        return Snapshot(frame, self.base, self.applied + (tuple(source),), stamps)
+
+
+class DatasetStore:
+    """The latest ``Snapshot`` of the data files, refreshed batch by batch.
+
+    ``load_base`` returns the main dataset as a frame (any row order); it is
+    only called when there is no snapshot to build on.
+    """
+
+    def __init__(self, load_base, base_files=DATA_FILES, batch_dir=BATCH_DIR):
+        self._load_base = load_base
+        self._base_files = base_files
+        self._batch_dir = batch_dir
+        self._lock = threading.Lock()
+        self._snapshot = None
+        # name -> (base, stamps, value) of the last derive() per name
+        self._derived = {}
+
+    def snapshot(self):
+        """The data files as they are now, applying only batches not seen yet."""
+        # One session refreshes while the others wait for its snapshot
+        with self._lock:
+            base = dataset_version(self._base_files, batches=None)
+            batches = batch_files(self._batch_dir)
+            current = self._snapshot
+            if (current is None or current.base != base
+                    or tuple(batches[:len(current.applied)]) != current.applied):
+                current = Snapshot.load(self._load_base(), base)
+            for source in batches[len(current.applied):]:
+                current = current.apply(read_batch(source[0]), source)
+            self._snapshot = current
+            return current
+
+    def restore(self, snapshot):
+        """Build on ``snapshot`` (one persisted by an earlier process, see
+        ``diwa.persist``) from now on, as if this store had made it."""
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def derive(self, name, snapshot, build, update):
+        """``build()``, or ``update(previous, changed)`` when ``name`` was last
+        derived from a snapshot with the same base: ``previous`` is that
+        value and ``changed`` the partitions that differ since."""
+        with self._lock:
+            last = self._derived.get(name)
+        changed = None if last is None else snapshot.changed_since(last[0], last[1])
+        if changed is None:
+            value = build()
+        elif not changed:
+            value = last[2]
+        else:
+            value = update(last[2], changed)
+        with self._lock:
+            self._derived[name] = (snapshot.base, snapshot.stamps, value)
+        return value
@@ -0,0 +1,190 @@
+"""Smaller Plotly figures on the wire.
+
+Every figure reaches the browser as JSON inside a websocket message, on
+every rerun that draws it, and on slow links its size is what users wait
+for. ``slim`` rewrites a built figure, once before it is cached (see
+``diwa.figcache``), without changing what is drawn:
+
+- values are rounded to what hovers and axes can show (``DECIMALS`` places,
+  but at least ``SIGNIFICANT`` significant digits), and float arrays that
+  survive the round trip go out as float32 or integers: Plotly sends NumPy
+  arrays as typed binary, so this halves their bytes or better
+- the template keeps only the trace defaults of trace types the figure uses,
+  and its colour scales only when something is coloured by value
+- line series longer than ``MAX_POINTS`` keep the first, last, lowest and
+  highest point of each bucket, so peaks and the line's envelope survive
+- figures with more than ``WEBGL_POINTS`` scatter points draw them with
+  ``scattergl``, which renders them on the GPU instead of as SVG nodes
+
+``figure_bytes`` is the size of a figure's JSON; the bytes each page run
+actually sends per figure are counted by the debug hooks (``views.debug``).
+Plotly is imported inside the functions, so importing this module is cheap.
+"""
+
+import numpy as np
+
+DECIMALS = 2
+SIGNIFICANT = 4
+MAX_POINTS = 1000
+WEBGL_POINTS = 2000
+
+# Per-point trace attributes, rewritten together when a trace is downsampled
+POINT_ATTRS = ("x", "y", "customdata", "text", "hovertext", "ids")
+NUMERIC_ATTRS = ("x", "y", "z", "lat", "lon", "customdata")
+# Template layout only figures with a colour scale use
+CONTINUOUS_LAYOUT = ("coloraxis", "colorscale")
+
+
+def _decimals(values):
+    """Places to keep per value: ``DECIMALS``, more for small magnitudes."""
+    with np.errstate(divide="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    magnitude = np.where(np.isfinite(magnitude), magnitude, 0)
+    # float64 holds about 15 significant digits
+    return np.clip(SIGNIFICANT - 1 - magnitude, DECIMALS, 15).astype(np.int64)
+
+
+def _round(values):
+    scale = 10.0 ** _decimals(values)
+    return np.round(values * scale) / scale, scale
+
+
+def quantize(values):
+    """``values`` rounded to display precision, in the narrowest dtype that
+    holds the rounded values exactly enough; non-float input is returned as is."""
+    original, values = values, np.asarray(values)
+    if values.dtype == object:
+        return _quantize_objects(values)
+    if values.dtype.kind != "f" or values.size == 0:
+        return original
+    rounded, scale = _round(values)
+    finite = np.isfinite(rounded)
+    if finite.all() and (rounded == np.round(rounded)).all():
+        return rounded.astype(np.int64)  # Plotly narrows integers further
+    narrow = rounded.astype(np.float32)
+    # float32 keeps ~7 digits: enough unless the values are huge
+    if np.array_equal(np.round(narrow.astype(np.float64) * scale) / scale, rounded,
+                      equal_nan=True):
+        return narrow
+    return rounded
+
+
+def _quantize_objects(values):
+    # Mixed hover data (names next to numbers) goes out as plain JSON lists
+    flat = values.ravel().copy()
+    for i, value in enumerate(flat):
+        if isinstance(value, (float, np.floating)) and np.isfinite(value):
+            flat[i] = float(_round(np.float64(value))[0])
+    return flat.reshape(values.shape)
+
+
+def downsample(x, y, max_points=MAX_POINTS):
+    """Row positions of a min/max decimation of ``y`` to about ``max_points``,
+    or None when ``y`` is short enough or has gaps a line must keep."""
+    y = np.asarray(y)
+    n = len(y)
+    if n <= max_points or y.dtype.kind not in "iuf" or np.isnan(y.astype(float)).any():
+        return None
+    x = np.asarray(x)
+    if x.dtype.kind in "iuf" and (np.diff(x) < 0).any():
+        return None  # Not a line along x
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    keep = [0, n - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            segment = y[start:stop]
+            keep += [start + int(np.argmin(segment)), start + int(np.argmax(segment))]
+    return np.unique(keep)
+
+
+def _downsample_trace(trace, max_points):
+    if trace.type not in ("scatter", "scattergl") or trace.x is None or trace.y is None:
+        return
+    rows = downsample(trace.x, trace.y, max_points)
+    if rows is None:
+        return
+    n = len(trace.y)
+    updates = {}
+    for attr in POINT_ATTRS:
+        value = trace[attr]
+        if value is not None and not isinstance(value, str) and len(value) == n:
+            updates[attr] = np.asarray(value)[rows]
+    trace.update(updates)
+
+
+def _points(trace):
+    return len(trace.x) if trace.type == "scatter" and trace.x is not None else 0
+
+
+def _webgl(fig):
+    import plotly.graph_objects as go
+
+    allowed = set(go.Scattergl()._valid_props)
+    traces = []
+    for trace in fig.data:
+        if trace.type == "scatter":
+            props = trace.to_plotly_json()
+            props.pop("type", None)
+            try:
+                trace = go.Scattergl({k: v for k, v in props.items() if k in allowed})
+            except ValueError:
+                pass  # A property scattergl lacks: keep the SVG trace
+        traces.append(trace)
+    fig.data = ()
+    fig.add_traces(traces)
+
+
+def _prune_template(fig):
+    template = fig.layout.template
+    if template is None or template.data is None:
+        return
+    used = {trace.type for trace in fig.data}
+    data = template.data.to_plotly_json()
+    layout = template.layout.to_plotly_json()
+    if not _continuous(fig):
+        # Colour scales only colour z values and colour axes
+        for key in CONTINUOUS_LAYOUT:
+            layout.pop(key, None)
+    fig.layout.template = {
+        "layout": layout,
+        "data": {kind: traces for kind, traces in data.items() if kind in used},
+    }
+
+
+def _continuous(fig):
+    if fig.layout.coloraxis.colorscale is not None:
+        return True
+    for trace in fig.data:
+        if "z" in trace and trace.z is not None:
+            return True
+        if "marker" in trace and isinstance(trace.marker.color, (np.ndarray, list, tuple)) \
+                and len(trace.marker.color) and not isinstance(trace.marker.color[0], str):
+            return True
+    return False
+
+
+def slim(fig, max_points=MAX_POINTS, webgl_points=WEBGL_POINTS):
+    """``fig`` rewritten in place for a smaller payload (see module docs)."""
+    for trace in fig.data:
+        _downsample_trace(trace, max_points)
+        updates = {}
+        for attr in NUMERIC_ATTRS:
+            value = trace[attr] if attr in trace else None
+            if isinstance(value, (np.ndarray, list, tuple)) and len(value):
+                quantized = quantize(value)
+                if quantized is not value:
+                    updates[attr] = quantized
+        if updates:
+            trace.update(updates)
+    if sum(_points(trace) for trace in fig.data) > webgl_points:
+        _webgl(fig)
+    _prune_template(fig)
+    return fig
+
+
+def figure_bytes(fig):
+    """Bytes of ``fig`` as Streamlit serializes it."""
+    import plotly.io as pio
+
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
@@ -0,0 +1,97 @@
+"""Derived data kept on disk between processes, keyed by dataset version.
+
+Building the snapshot, cube and indexes takes seconds in the browser, where
+Python runs in WebAssembly. The stlite build mounts ``BROWSER_DIR`` on
+IndexedDB (``idbfsMountpoints``), so ``cached`` pickles each of them there
+on the first visit and a repeat visit loads them instead of rebuilding.
+
+Entries live under ``<dir>/<dataset version>-<code version>/``: new data or
+new code (any change under ``diwa/``) starts an empty directory and the old
+ones are deleted. Unpickled frames and arrays are made read-only again (see
+``diwa.frozen``), since they are shared like freshly built ones.
+
+Off on servers unless ``DIWA_PERSIST_DIR`` names a directory; a long-running
+server builds once per version anyway. Standard library only until a value
+is unpickled.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+
+ENV_DIR = "DIWA_PERSIST_DIR"
+BROWSER_DIR = "/mnt/diwa"
+SUFFIX = ".pickle"
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def persist_dir():
+    """Directory for persisted entries, or None when persistence is off."""
+    directory = os.environ.get(ENV_DIR)
+    if directory:
+        return directory
+    return BROWSER_DIR if sys.platform == "emscripten" else None
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(directory=CODE_DIR):
+    """Short hash of the ``diwa`` sources, so pickles never outlive their classes."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            with open(os.path.join(directory, name), "rb") as f:
+                digest.update(name.encode())
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def _refreeze(value):
+    from diwa.frozen import freeze, readonly
+    import numpy as np
+    import pandas as pd
+
+    for name, attr in vars(value).items():
+        if isinstance(attr, pd.DataFrame):
+            setattr(value, name, freeze(attr))
+        elif isinstance(attr, np.ndarray):
+            setattr(value, name, readonly(attr))
+    return value
+
+
+def _prune(directory, keep):
+    for entry in os.listdir(directory):
+        if entry != keep:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def cached(name, version, build, directory=None):
+    """``build()``, persisted as ``name`` for ``version`` and loaded from
+    there on later calls, in this process or the next one."""
+    directory = directory or persist_dir()
+    if directory is None:
+        return build()
+    key = f"{version}-{code_version()}"
+    path = os.path.join(directory, key, name + SUFFIX)
+    try:
+        with open(path, "rb") as f:
+            return _refreeze(pickle.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception:  # Truncated or unreadable: rebuild and overwrite
+        pass
+
+    value = build()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _prune(directory, keep=key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Storage full or unavailable: the value is still good
+    return value
@@ -0,0 +1,119 @@
+"""Country -> region hierarchy of the subnational rows.
+
+Rows flagged ``Subnational = Yes`` are regional figures; everything else is
+national. The loaders separate the two once per dataset version, so the
+national ``DiwaCube`` every page queries never holds a regional row and
+regional datasets (often tens of times the national row count) cost national
+views nothing.
+
+``RegionIndex`` gives each country a ``DiwaCube`` over its regional rows,
+with the region in the cube's Country column: every national lookup works
+unchanged one level down (a region's series, latest values, indicators). The
+rollups across regions (count, mean, min and max per country, indicator and
+year) are computed once, for all countries, when the index is built.
+
+The source names regions in the optional ``region`` column. Subnational rows
+without one belong to no region: they are kept (``unnamed_rows``) but stay out
+of the region cubes and the rollups, where they would pose as one region.
+``data/diwa.csv`` has no ``region`` column yet, so until region names are
+added there every subnational row is unnamed.
+"""
+
+from diwa.cube import DiwaCube
+from diwa.frozen import freeze
+from diwa.spans import traced
+
+SUBNATIONAL = "Yes"
+UNSPECIFIED = "Unspecified region"
+
+ROLLUP_KEYS = ["Indicator", "Year"]
+
+
+def subnational_mask(df):
+    return df["Subnational"].eq(SUBNATIONAL).to_numpy()
+
+
+def national_rows(df):
+    return df[~subnational_mask(df)]
+
+
+def subnational_rows(df):
+    return df[subnational_mask(df)]
+
+
+class RegionIndex:
+    """Per-country region cubes plus precomputed rollups across regions."""
+
+    @traced("data.region_index")
+    def __init__(self, df):
+        self.frame = freeze(df.assign(Region=df["Region"].fillna(UNSPECIFIED)))
+        named = self.frame["Region"].ne(UNSPECIFIED).to_numpy()
+        self._unnamed = self.frame[~named]
+        self._unnamed_rows = self._unnamed.groupby("Country", sort=True).indices
+        self._named = self.frame[named]
+        self._country_rows = self._named.groupby("Country", sort=True).indices
+        # Countries with named regions, and those with at least two to compare
+        self.countries = list(self._country_rows)
+        self.comparable = [
+            country for country, rows in self._country_rows.items()
+            if self._named["Region"].iloc[rows].nunique() > 1
+        ]
+        # Region cubes are built on a country's first drill-down
+        self._cubes = {}
+
+        # One aggregation for every country at once
+        self.rollups = freeze(
+            self._named.groupby(["Country", *ROLLUP_KEYS], sort=True)["Value"]
+            .agg(Regions="count", Mean="mean", Min="min", Max="max")
+            .reset_index()
+        )
+        self._rollup_rows = self.rollups.groupby(["Country", "Indicator"], sort=False).indices
+
+    def __len__(self):
+        return len(self.frame)
+
+    def cube(self, country):
+        """The region cube of ``country`` (regions in the Country column), or None."""
+        cube = self._cubes.get(country)
+        if cube is None and country in self._country_rows:
+            rows = self._named.iloc[self._country_rows[country]]
+            # Concurrent first builds are identical, so the last one simply wins
+            cube = self._cubes[country] = DiwaCube(rows.assign(Country=rows["Region"]))
+        return cube
+
+    def unnamed_rows(self, country):
+        """Subnational rows of ``country`` that name no region."""
+        rows = self._unnamed_rows.get(country)
+        if rows is None:
+            return self._unnamed.iloc[0:0]
+        return self._unnamed.iloc[rows]
+
+    def regions(self, country):
+        """Named regions of ``country`` with at least one value, sorted by name."""
+        cube = self.cube(country)
+        return cube.countries if cube is not None else []
+
+    def indicators_for(self, country, region=None):
+        """Indicators reported for any region of ``country``, or for one ``region``."""
+        cube = self.cube(country)
+        if cube is None:
+            return []
+        return cube.indicators_for(region) if region is not None else list(cube.indicators)
+
+    def series(self, country, region, indicator):
+        return self.cube(country).series(region, indicator)
+
+    def latest_for_region(self, country, region):
+        """Latest value and year of every indicator reported by ``region``."""
+        return self.cube(country).latest_for_country(region)
+
+    def latest_by_region(self, country, indicator):
+        """Latest value and year of ``indicator`` per region of ``country``."""
+        return self.cube(country).latest_for_indicator(indicator)
+
+    def rollup(self, country, indicator):
+        """Per-year count, mean, min and max of ``indicator`` across regions."""
+        rows = self._rollup_rows.get((country, indicator))
+        if rows is None:
+            return self.rollups.iloc[0:0]
+        return self.rollups.iloc[rows]
@@ -0,0 +1,331 @@
+"""Static PDF/PNG country reports and chart images, rendered with matplotlib.
+
+Usage::
+
+    python -m diwa.reports [--out data/reports] [--workers N] [--force]
+
+Reports are rendered offline (no browser or network needed) and cached on
+disk under ``<out>/<dataset version>/``: ``<Country>.pdf`` holds the latest
+key indicators, the summary and a trend chart per indicator, and
+``<Country>.png`` the latest value of every indicator. The batch renders every country in
+parallel across a process pool; run it after each data drop so downloads are
+served straight from disk. The app starts the same batch in the background
+when it finds the cache for the current version missing, from a child
+``python -m diwa.reports`` process (``build_reports_detached``): spawned
+workers import their parent's ``__main__``, which in the server is the
+Streamlit script.
+
+matplotlib is optional: without it ``available()`` is False and the app
+offers no report downloads.
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+REPORT_DIR = os.environ.get("DIWA_REPORT_DIR", "data/reports")
+
+# Format name -> (file extension, MIME type)
+CHART_FORMATS = {
+    "PNG": ("png", "image/png"),
+    "PDF": ("pdf", "application/pdf"),
+}
+
+PNG_DPI = 150
+TRENDS_PER_PAGE = 6
+LABEL_WIDTH = 48
+ACCENT = "#e91e63"
+PAGE_SIZE = (8.27, 11.69)  # A4 portrait, inches
+
+
+def available():
+    return importlib.util.find_spec("matplotlib") is not None
+
+
+def report_dir(version, out_dir=REPORT_DIR):
+    return os.path.join(out_dir, version)
+
+
+def report_path(version, country, ext, out_dir=REPORT_DIR):
+    return os.path.join(report_dir(version, out_dir), f"{country}.{ext}")
+
+
+def _label(text, width=LABEL_WIDTH):
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def _figure(size, layout="constrained"):
+    # Figure objects, not pyplot: no global state, safe in server threads
+    from matplotlib.figure import Figure
+    return Figure(figsize=size, layout=layout)
+
+
+def key_indicators(cube, country):
+    """Latest-year rows of ``country``, as on the Country Profiles page."""
+    latest = cube.latest_for_country(country)
+    latest_year = latest["Year"].max()
+    return latest[latest["Year"] == latest_year], latest_year
+
+
+def latest_values_figure(cube, country):
+    """Horizontal bars of each indicator's latest value, labelled with its year."""
+    data = cube.latest_for_country(country).sort_values("Value")
+    fig = _figure((8, 1.5 + 0.22 * len(data)))
+    ax = fig.add_subplot()
+    labels = [f"{_label(i)} ({int(y)})" for i, y in zip(data["Indicator"], data["Year"])]
+    ax.barh(labels, data["Value"], color=ACCENT)
+    ax.set_title(f"{country}: latest value per indicator", loc="left", fontweight="bold")
+    ax.tick_params(axis="y", labelsize=7)
+    ax.margins(y=0.01)
+    ax.grid(axis="x", alpha=0.3)
+    return fig
+
+
+def summary_text(cube, country):
+    """The Country Profiles summary as plain text."""
+    data, year = key_indicators(cube, country)
+    strongest = data.nlargest(1, "Value")["Indicator"].iloc[0]
+    weakest = data.nsmallest(1, "Value")["Indicator"].iloc[0]
+    return (
+        f"{country} shows an average digital inclusion score of "
+        f"{data['Value'].mean():.1f} across all indicators in {int(year)}.\n\n"
+        f"Strongest indicator: {strongest}\n"
+        f"Area for improvement: {weakest}"
+    )
+
+
+def _title_page(cube, country):
+    fig = _figure(PAGE_SIZE, layout=None)
+    fig.text(0.06, 0.95, f"{country} — ASEAN-DIWA Country Report",
+             fontsize=18, fontweight="bold", color=ACCENT, va="top")
+    wrapped = "\n".join(
+        textwrap.fill(paragraph, 90) for paragraph in summary_text(cube, country).split("\n")
+    )
+    fig.text(0.06, 0.90, wrapped, fontsize=10, va="top")
+    data, _ = key_indicators(cube, country)
+    table = fig.add_axes([0.06, 0.05, 0.88, 0.68])
+    table.axis("off")
+    rows = [[_label(i, 70), f"{v:.1f}"] for i, v in zip(data["Indicator"], data["Value"])]
+    if rows:
+        t = table.table(cellText=rows, colLabels=["Indicator", "Value"], loc="upper left",
+                        colWidths=[0.85, 0.15], cellLoc="left")
+        t.auto_set_font_size(False)
+        t.set_fontsize(8)
+    return fig
+
+
+def _trend_pages(cube, country):
+    indicators = cube.indicators_for(country)
+    for start in range(0, len(indicators), TRENDS_PER_PAGE):
+        # Fixed margins: constrained layout costs more than the plots on
+        # multi-axes pages
+        fig = _figure(PAGE_SIZE, layout=None)
+        fig.subplots_adjust(left=0.08, right=0.97, bottom=0.05, top=0.94, hspace=0.45, wspace=0.25)
+        axes = fig.subplots(TRENDS_PER_PAGE // 2, 2, squeeze=False).ravel()
+        for ax, indicator in zip(axes, indicators[start:start + TRENDS_PER_PAGE]):
+            series = cube.series(country, indicator)
+            ax.plot(series["Year"], series["Value"], marker="o", color=ACCENT)
+            ax.set_title(textwrap.fill(_label(indicator, 80), 40), fontsize=8)
+            ax.tick_params(labelsize=7)
+            ax.xaxis.get_major_locator().set_params(integer=True)
+            ax.grid(alpha=0.3)
+        for ax in axes[len(indicators[start:start + TRENDS_PER_PAGE]):]:
+            ax.axis("off")
+        yield fig
+
+
+def country_pdf(cube, country):
+    from matplotlib.backends.backend_pdf import PdfPages
+    buffer = io.BytesIO()
+    with PdfPages(buffer, metadata={"Title": f"{country} — ASEAN-DIWA Country Report"}) as pdf:
+        pdf.savefig(_title_page(cube, country))
+        pdf.savefig(latest_values_figure(cube, country))
+        for page in _trend_pages(cube, country):
+            pdf.savefig(page)
+    return buffer.getvalue()
+
+
+def figure_bytes(fig, fmt):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=CHART_FORMATS[fmt][0], dpi=PNG_DPI)
+    return buffer.getvalue()
+
+
+def comparison_chart(data, indicator, chart_type, fmt, year=None):
+    """The Comparison page chart as a static image.
+
+    ``data`` is one value per country for "Bar Chart" (the latest, or the
+    value in ``year`` with filled ones hatched) and the full series for
+    "Line Chart".
+    """
+    fig = _figure((9, 5))
+    ax = fig.add_subplot()
+    if chart_type == "Bar Chart":
+        bars = ax.bar(data["Country"], data["Value"], color=ACCENT)
+        if "Imputed" in data:
+            for bar, imputed in zip(bars, data["Imputed"]):
+                if imputed:
+                    bar.set_hatch("//")
+        ax.set_title(f"{_label(indicator, 80)} ({year or 'Most Recent Year'})", loc="left")
+        ax.tick_params(axis="x", labelrotation=30)
+    else:
+        for country, series in data.groupby("Country", sort=True):
+            ax.plot(series["Year"], series["Value"], marker="o", label=country)
+        ax.set_title(f"{_label(indicator, 80)} Trends Over Time", loc="left")
+        ax.xaxis.get_major_locator().set_params(integer=True)
+        ax.legend(fontsize=8)
+    ax.grid(alpha=0.3)
+    return figure_bytes(fig, fmt)
+
+
+def _write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(tmp, 0o644)  # mkstemp creates owner-only files
+    os.replace(tmp, path)
+
+
+def render_country(cube, country, directory):
+    """Write ``<country>.pdf`` and ``<country>.png`` into ``directory``."""
+    _write(os.path.join(directory, f"{country}.pdf"), country_pdf(cube, country))
+    _write(os.path.join(directory, f"{country}.png"),
+           figure_bytes(latest_values_figure(cube, country), "PNG"))
+
+
+# Each worker process receives the cube once, then renders many countries
+_worker_cube = None
+
+
+def _load_cube():
+    """``(version, cube)``: the national cube the app shows, derived
+    indicators and batches included, and the dataset version it was built from."""
+    from diwa.cube import DiwaCube
+    from diwa.data import load_dataset
+    from diwa.gender import with_gender_indicators
+    from diwa.partitions import DatasetStore
+    from diwa.regions import national_rows
+    from diwa.version import dataset_version
+    store = DatasetStore(lambda: with_gender_indicators(load_dataset()))
+    while True:
+        version = dataset_version()
+        data = store.snapshot()
+        # A batch landing mid-load would otherwise pass for the older version
+        if dataset_version() == version:
+            return version, DiwaCube(national_rows(data.frame), presorted=True)
+
+
+def _init_worker(cube):
+    global _worker_cube
+    _worker_cube = cube
+
+
+def _render_in_worker(country, directory):
+    start = time.perf_counter()
+    render_country(_worker_cube, country, directory)
+    return country, time.perf_counter() - start
+
+
+def build_reports(version=None, cube=None, out_dir=REPORT_DIR, workers=None, force=False):
+    """Render every country's report for ``version`` in a process pool.
+
+    ``cube`` is the dataset of ``version`` (the app passes its cached one);
+    without it the current data files are loaded, and ``version`` must match
+    them. Every worker renders from that same cube, so a data update during
+    the batch cannot end up cached under the older version. Countries already
+    in the cache are skipped unless ``force``. Writes and returns a manifest
+    with per-country render times.
+    """
+    if cube is None:
+        loaded, cube = _load_cube()
+        if version is not None and version != loaded:
+            raise ValueError(f"Dataset version {version} is no longer current ({loaded})")
+        version = loaded
+    elif version is None:
+        raise ValueError("build_reports needs the version of the cube it is given")
+    directory = report_dir(version, out_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    countries = list(cube.countries)
+    todo = [c for c in countries
+            if force or not all(os.path.exists(report_path(version, c, ext, out_dir))
+                                for ext in ("pdf", "png"))]
+    start = time.perf_counter()
+    timings = {}
+    if todo:
+        # spawn: forking a threaded server process is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(cube,)) as pool:
+            for country, seconds in pool.map(_render_in_worker, todo, [directory] * len(todo)):
+                timings[country] = round(seconds, 3)
+
+    manifest = {
+        "version": version,
+        "countries": countries,
+        "rendered": timings,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+    _write(os.path.join(directory, "manifest.json"), json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+def build_reports_detached(version, cube, out_dir=REPORT_DIR, workers=None):
+    """``build_reports(version, cube)`` run by a child ``python -m diwa.reports``.
+
+    The cube is handed over as a pickle, so the child renders exactly that
+    data. Returns the manifest; raises RuntimeError when the child fails.
+    """
+    fd, cube_path = tempfile.mkstemp(suffix=".pickle")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(cube, f, protocol=pickle.HIGHEST_PROTOCOL)
+        command = [sys.executable, "-m", "diwa.reports", "--out", out_dir,
+                   "--version", version, "--cube", cube_path]
+        if workers:
+            command += ["--workers", str(workers)]
+        result = subprocess.run(command, capture_output=True, text=True)
+    finally:
+        os.unlink(cube_path)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit status {result.returncode}")
+    with open(os.path.join(report_dir(version, out_dir), "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every country's PDF/PNG report.")
+    parser.add_argument("--out", default=REPORT_DIR, help="report cache directory")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPUs)")
+    parser.add_argument("--force", action="store_true", help="re-render cached reports")
+    # Set by build_reports_detached: render this pickled cube as this version
+    parser.add_argument("--version", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--cube", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    cube = None
+    if args.cube is not None:
+        with open(args.cube, "rb") as f:
+            cube = pickle.load(f)
+    manifest = build_reports(args.version, cube, out_dir=args.out, workers=args.workers,
+                             force=args.force)
+    directory = report_dir(manifest["version"], args.out)
+    print(f"Rendered {len(manifest['rendered'])} of {len(manifest['countries'])} countries "
+          f"into {directory} in {manifest['elapsed_s']:.1f} s")
+    for country, seconds in manifest["rendered"].items():
+        print(f"  {country:18s} {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
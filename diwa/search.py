@@ -0,0 +1,201 @@
+"""Prefix and fuzzy search over indicators, countries, sources and remarks.
+
+``SearchIndex`` is built once per dataset version from the national cube and
+knows three kinds of documents:
+
+- ``"indicator"``: an indicator name
+- ``"country"``: a country name
+- ``"series"``: one country's series of one indicator, searchable by every
+  ``Source``, ``SourceURL`` and ``Remarks`` of its rows (and the country
+  name, so "brunei unicef" narrows a source down to one country)
+
+Text is lower-cased, stripped of accents and split into alphanumeric tokens.
+Each token maps to the documents containing it (an inverted index over a
+sorted vocabulary), and each vocabulary term to its character trigrams. A
+query matches the documents that match every one of its tokens, where a
+token matches a term exactly, as a prefix (from ``MIN_PREFIX`` characters, so
+results appear while typing) or fuzzily (trigram Dice similarity of at least
+``MIN_SIMILARITY``, from ``MIN_FUZZY`` characters: "intenet" still finds
+"internet"). Scores weigh the match quality by the field: names outrank
+sources and remarks, and a series found only through its country name is
+not a match.
+
+Every lookup works on the vocabulary and posting arrays, never on the rows.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from diwa.spans import traced
+
+INDICATOR = "indicator"
+COUNTRY = "country"
+SERIES = "series"
+
+MIN_PREFIX = 2
+MIN_FUZZY = 4
+MIN_SIMILARITY = 0.6
+LIMIT = 10
+
+# Field weights; a series needs at least one hit weighing CONTENT or more
+NAME = 3.0
+CONTENT = 1.0
+CONTEXT = 0.5
+EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.6
+
+SERIES_FIELDS = ("Source", "SourceURL", "Remarks")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-case, accent-free alphanumeric tokens of ``text``."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _snippet(text, width=80):
+    text = " ".join(str(text).split())
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+class SearchIndex:
+    """Inverted token index with prefix and trigram fuzzy matching."""
+
+    @traced("data.search_index")
+    def __init__(self, frame):
+        indicators = sorted(frame["Indicator"].unique())
+        countries = sorted(frame["Country"].unique())
+        # One document per series that says where it comes from, indexed
+        # under every distinct source and remark of its rows
+        columns = [c for c in SERIES_FIELDS if c in frame]
+        texts = frame[["Country", "Indicator", *columns]].drop_duplicates()
+        texts = texts[texts[columns].notna().any(axis=1)] if columns else texts.iloc[:0]
+        series = texts.drop_duplicates(["Country", "Indicator"], keep="last")
+        series = series.reset_index(drop=True)
+
+        self.kinds = np.array(
+            [INDICATOR] * len(indicators) + [COUNTRY] * len(countries) + [SERIES] * len(series),
+            dtype=object,
+        )
+        self.countries = np.array(
+            [None] * len(indicators) + countries + series["Country"].tolist(), dtype=object
+        )
+        self.indicators = np.array(
+            indicators + [None] * len(countries) + series["Indicator"].tolist(), dtype=object
+        )
+        self.details = [None] * (len(indicators) + len(countries)) + [
+            _snippet(" · ".join(
+                f"{c}: {row[c]}" for c in columns if isinstance(row[c], str) and row[c]
+            ))
+            for row in series.to_dict("records")
+        ]
+
+        # (document ids, text) per field, tokenized once per distinct text
+        first_series = len(indicators) + len(countries)
+        series_ids = np.arange(first_series, first_series + len(series))
+        text_ids = first_series + pd.MultiIndex.from_frame(series[["Country", "Indicator"]]) \
+            .get_indexer(pd.MultiIndex.from_frame(texts[["Country", "Indicator"]]))
+        fields = [
+            (np.arange(len(indicators)), pd.Series(indicators, dtype=object), NAME),
+            (np.arange(len(indicators), first_series), pd.Series(countries, dtype=object), NAME),
+            (series_ids, series["Country"], CONTEXT),
+            *((text_ids, texts[c], CONTENT) for c in columns),
+        ]
+        postings = {}
+        for ids, values, weight in fields:
+            codes, uniques = pd.factorize(values)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for code, text in enumerate(uniques):
+                docs = ids[order[bounds[code]:bounds[code + 1]]]
+                for token in set(tokenize(text)):
+                    postings.setdefault(token, []).append((docs, weight))
+
+        self.vocabulary = sorted(postings)
+        self._docs, self._weights = [], []
+        for term in self.vocabulary:
+            docs = np.concatenate([d for d, _ in postings[term]])
+            weights = np.concatenate([np.full(len(d), w) for d, w in postings[term]])
+            # Highest weight per document
+            order = np.lexsort((-weights, docs))
+            docs, weights = docs[order], weights[order]
+            first = np.ones(len(docs), dtype=bool)
+            first[1:] = docs[1:] != docs[:-1]
+            self._docs.append(docs[first])
+            self._weights.append(weights[first])
+
+        grams = {}
+        for term_id, term in enumerate(self.vocabulary):
+            for gram in trigrams(term):
+                grams.setdefault(gram, []).append(term_id)
+        self._grams = {gram: np.array(ids) for gram, ids in grams.items()}
+        self._gram_counts = np.array([len(trigrams(t)) for t in self.vocabulary])
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def _terms(self, token):
+        """``{term id: match quality}`` of the vocabulary terms ``token`` matches."""
+        terms = {}
+        if len(token) >= MIN_FUZZY:
+            query = trigrams(token)
+            hits = [self._grams[g] for g in query if g in self._grams]
+            if hits:
+                shared = np.bincount(np.concatenate(hits), minlength=len(self.vocabulary))
+                dice = 2 * shared / (len(query) + self._gram_counts)
+                for term_id in np.flatnonzero(dice >= MIN_SIMILARITY):
+                    terms[term_id] = FUZZY * dice[term_id]
+        if len(token) >= MIN_PREFIX:
+            i = bisect_left(self.vocabulary, token)
+            while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+                terms[i] = PREFIX
+                i += 1
+        i = bisect_left(self.vocabulary, token)
+        if i < len(self.vocabulary) and self.vocabulary[i] == token:
+            terms[i] = EXACT
+        return terms
+
+    @traced("filter.search")
+    def search(self, query, limit=LIMIT):
+        """Best matches of ``query``, as dicts with ``kind``, ``country``,
+        ``indicator``, ``detail`` and ``score``."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        total = np.zeros(len(self))
+        matched = np.ones(len(self), dtype=bool)
+        best_weight = np.zeros(len(self))
+        for token in tokens:
+            score = np.zeros(len(self))
+            weight = np.zeros(len(self))
+            for term_id, quality in self._terms(token).items():
+                docs, weights = self._docs[term_id], self._weights[term_id]
+                np.maximum.at(score, docs, quality * weights)
+                np.maximum.at(weight, docs, weights)
+            matched &= score > 0
+            total += score
+            best_weight = np.maximum(best_weight, weight)
+        matched &= best_weight >= CONTENT
+
+        hits = np.flatnonzero(matched)
+        order = np.lexsort((hits, -total[hits]))[:limit]
+        return [
+            {
+                "kind": self.kinds[i],
+                "country": self.countries[i],
+                "indicator": self.indicators[i],
+                "detail": self.details[i],
+                "score": round(float(total[i]), 3),
+            }
+            for i in hits[order]
+        ]
@@ -0,0 +1,187 @@
+"""Country similarity and indicator correlation, precomputed per cube.
+
+``SimilarityTable`` pivots a ``DiwaCube`` into two matrices once and derives
+every pairwise statistic from them with a handful of matrix products, so the
+page only looks rows up.
+
+Countries are compared on their latest value of each indicator. Values are
+standardized per indicator (z-scores across countries), so units do not
+matter, and the distance between two countries is the root mean square
+difference over the indicators both report. A distance of 0 is an identical
+profile; 1 is one standard deviation apart on a typical shared indicator.
+Pairs sharing fewer than ``MIN_SHARED`` indicators have no distance.
+
+Indicators are correlated over country-years: the Pearson correlation across
+every (country, year) in which both have a value, so it pools differences
+between countries and changes over time. Pairs observed together fewer than
+``MIN_OBSERVATIONS`` times have no correlation, and pairs derived from the
+same ``_Female`` / ``_Male`` base are left out of the rankings, since they
+correlate by construction.
+
+Coverage is sparse, so every statistic is NaN-aware: missing values are
+masked out of the sums, never filled.
+"""
+
+import numpy as np
+import pandas as pd
+
+from diwa.frozen import freeze
+from diwa.gender import gender_base
+from diwa.spans import traced
+
+MIN_SHARED = 3
+MIN_OBSERVATIONS = 5
+TOP_PAIRS = 20
+
+
+def _masked(matrix):
+    """``(matrix with NaN as 0, 0/1 mask of observed cells)``."""
+    observed = ~np.isnan(matrix)
+    return np.where(observed, matrix, 0.0), observed.astype(np.float64)
+
+
+def _pivot(rows, columns, values, shape):
+    matrix = np.full(shape, np.nan)
+    matrix[rows, columns] = values
+    return matrix
+
+
+def standardize(matrix):
+    """Column z-scores ignoring NaN; columns with under two values or no
+    spread become all NaN."""
+    values, mask = _masked(matrix)
+    count = mask.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = values.sum(axis=0) / count
+        std = np.sqrt((((values - mean) * mask) ** 2).sum(axis=0) / count)
+        z = (matrix - mean) / std
+    z[:, (count < 2) | ~(std > 0)] = np.nan
+    return z
+
+
+def pairwise_distance(matrix, min_shared=MIN_SHARED):
+    """RMS difference between every pair of rows over their shared columns,
+    and the number of shared columns."""
+    values, mask = _masked(matrix)
+    squares = values * values
+    shared = mask @ mask.T
+    # sum over shared columns of (a - b)^2 = a^2 + b^2 - 2ab
+    sum_squares = squares @ mask.T + mask @ squares.T - 2 * (values @ values.T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = np.sqrt(np.maximum(sum_squares, 0) / shared)
+    distance[shared < min_shared] = np.nan
+    return distance, shared.astype(np.int64)
+
+
+def pairwise_correlation(matrix, min_observations=MIN_OBSERVATIONS):
+    """Pearson correlation between every pair of columns over the rows where
+    both are observed, and the number of those rows."""
+    # Centring first keeps the sums small, so the differences below do not
+    # cancel catastrophically for large-valued indicators
+    values, mask = _masked(matrix)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = (values - values.sum(axis=0) / mask.sum(axis=0)) * mask
+    values = np.nan_to_num(values)
+
+    n = mask.T @ mask
+    sum_x = values.T @ mask            # [i, j]: sum of column i where j is observed too
+    sum_xx = (values * values).T @ mask
+    sum_xy = values.T @ values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = n * sum_xy - sum_x * sum_x.T
+        variance = n * sum_xx - sum_x ** 2
+        r = covariance / np.sqrt(variance * variance.T)
+    r = np.clip(r, -1, 1)
+    r[n < min_observations] = np.nan
+    return r, n.astype(np.int64)
+
+
+class SimilarityTable:
+    """Pairwise country distances and indicator correlations of a cube."""
+
+    @traced("data.similarity")
+    def __init__(self, cube):
+        self.countries = list(cube.countries)
+        self.indicators = list(cube.indicators)
+        country_code = {c: i for i, c in enumerate(self.countries)}
+        indicator_code = {ind: i for i, ind in enumerate(self.indicators)}
+
+        latest = cube.latest
+        profiles = _pivot(
+            latest["Country"].map(country_code).to_numpy(),
+            latest["Indicator"].map(indicator_code).to_numpy(),
+            latest["Value"].to_numpy(dtype=np.float64),
+            (len(self.countries), len(self.indicators)),
+        )
+        distance, shared = pairwise_distance(standardize(profiles))
+        self.distance = freeze(pd.DataFrame(distance, self.countries, self.countries))
+        self.shared = freeze(pd.DataFrame(shared, self.countries, self.countries))
+
+        # One row per country-year; the cube's order makes later duplicates win
+        frame = cube.frame
+        country_year = frame.groupby(["Country", "Year"], sort=False).ngroup().to_numpy()
+        panel = _pivot(
+            country_year,
+            frame["Indicator"].map(indicator_code).to_numpy(),
+            frame["Value"].to_numpy(dtype=np.float64),
+            (country_year.max(initial=-1) + 1, len(self.indicators)),
+        )
+        correlation, observations = pairwise_correlation(panel)
+
+        # Pairs from one gender family correlate by construction
+        base = np.array([gender_base(ind) or ind for ind in self.indicators], dtype=object)
+        related = base[:, None] == base[None, :]
+        np.fill_diagonal(related, False)
+        correlation[related] = np.nan
+        self.correlation = freeze(pd.DataFrame(correlation, self.indicators, self.indicators))
+        self.observations = freeze(pd.DataFrame(observations, self.indicators, self.indicators))
+        self.top_pairs = freeze(self._top_pairs(correlation, observations))
+
+        # Indicators with at least one correlation besides their own
+        others = correlation.copy()
+        np.fill_diagonal(others, np.nan)
+        self.correlated_indicators = [
+            ind for ind, any_r in zip(self.indicators, ~np.isnan(others).all(axis=1)) if any_r
+        ]
+
+    def _top_pairs(self, correlation, observations, limit=TOP_PAIRS):
+        i, j = np.triu_indices(len(self.indicators), k=1)
+        r = correlation[i, j]
+        keep = ~np.isnan(r)
+        i, j, r = i[keep], j[keep], r[keep]
+        order = np.argsort(-np.abs(r), kind="stable")[:limit]
+        names = np.array(self.indicators, dtype=object)
+        return pd.DataFrame({
+            "Indicator": names[i[order]],
+            "Other Indicator": names[j[order]],
+            "Correlation": r[order],
+            "Observations": observations[i[order], j[order]],
+        })
+
+    @traced("filter.neighbours")
+    def neighbours(self, country, limit=None):
+        """Countries nearest to ``country``, closest first, with the number of
+        indicators each comparison rests on."""
+        if country not in self.distance.index:
+            return pd.DataFrame(columns=["Country", "Distance", "Shared Indicators"])
+        result = pd.DataFrame({
+            "Country": self.countries,
+            "Distance": self.distance.loc[country].to_numpy(),
+            "Shared Indicators": self.shared.loc[country].to_numpy(),
+        })
+        result = result[(result["Country"] != country) & result["Distance"].notna()]
+        return result.sort_values("Distance", kind="stable").head(limit).reset_index(drop=True)
+
+    @traced("filter.correlated")
+    def correlated(self, indicator, limit=None):
+        """Indicators most strongly correlated with ``indicator``, by |r|."""
+        if indicator not in self.correlation.index:
+            return pd.DataFrame(columns=["Indicator", "Correlation", "Observations"])
+        result = pd.DataFrame({
+            "Indicator": self.indicators,
+            "Correlation": self.correlation.loc[indicator].to_numpy(),
+            "Observations": self.observations.loc[indicator].to_numpy(),
+        })
+        result = result[result["Correlation"].notna() & (result["Indicator"] != indicator)]
+        order = result["Correlation"].abs().sort_values(ascending=False, kind="stable").index
+        return result.loc[order].head(limit).reset_index(drop=True)
@@ -0,0 +1,156 @@
+"""Timed spans of each page run, written as structured JSON.
+
+A run trace is started at the top of every full script run and finished at
+its end. Code anywhere below records stages with ``span("name")`` or the
+``traced("name")`` decorator; outside a run (tests, CLIs, fragment reruns)
+both do nothing beyond one context-variable lookup. Span names are
+``<stage>.<detail>``, with stages ``data``, ``filter``, ``groupby``,
+``figure`` and ``page``.
+
+Finished runs are logged as one JSON object on the ``diwa.metrics`` logger
+(silent unless logging is configured) and, when ``DIWA_METRICS_FILE`` is set,
+appended to that file as JSON lines. The last ``RECENT_RUNS`` runs stay in
+memory for the debug panel.
+
+This module uses only the standard library, so the app shell can import it.
+"""
+
+import contextvars
+import datetime
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_FILE = os.environ.get("DIWA_METRICS_FILE")
+RECENT_RUNS = 200
+
+# Runs with thousands of lookups keep their first spans only; totals per
+# stage still count every span
+MAX_SPANS = 500
+
+logger = logging.getLogger("diwa.metrics")
+
+_current = contextvars.ContextVar("diwa_run_trace", default=None)
+_file_lock = threading.Lock()
+recent = deque(maxlen=RECENT_RUNS)
+
+
+class RunTrace:
+    """Spans and message counters of one script run."""
+
+    def __init__(self, page=None, session=None):
+        self.page = page
+        self.session = session
+        self.started = time.perf_counter()
+        self.created = datetime.datetime.now(datetime.timezone.utc)
+        self.spans = []
+        self.totals = {}
+        self.messages = 0
+        self.message_bytes = 0
+        # Bytes of each chart sent in full; charts the browser already has
+        # go as small references to their hash
+        self.figure_bytes = []
+        self.references = 0
+        self.total_ms = None
+
+    def add(self, name, start, end, **attrs):
+        ms = (end - start) * 1000
+        count, total = self.totals.get(name, (0, 0.0))
+        self.totals[name] = (count + 1, total + ms)
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append({
+                "name": name,
+                "start_ms": round((start - self.started) * 1000, 3),
+                "ms": round(ms, 3),
+                **attrs,
+            })
+
+    def count_message(self, size, figure=False, reference=False):
+        self.messages += 1
+        self.message_bytes += size
+        if figure:
+            self.figure_bytes.append(size)
+        if reference:
+            self.references += 1
+
+    def record(self):
+        return {
+            "ts": self.created.isoformat(timespec="milliseconds"),
+            "event": "page_run",
+            "page": self.page,
+            "session": self.session,
+            "total_ms": self.total_ms,
+            "messages": self.messages,
+            "message_bytes": self.message_bytes,
+            "figure_bytes": list(self.figure_bytes),
+            "references": self.references,
+            "stages": {
+                name: {"calls": count, "ms": round(total, 3)}
+                for name, (count, total) in self.totals.items()
+            },
+            "spans": self.spans,
+        }
+
+
+def current():
+    """The trace of the run in progress on this thread, or None."""
+    return _current.get()
+
+
+def start_run(page=None, session=None):
+    trace = RunTrace(page, session)
+    _current.set(trace)
+    return trace
+
+
+def finish_run():
+    """End the current run; logs and returns its record (None if no run)."""
+    trace = _current.get()
+    if trace is None:
+        return None
+    _current.set(None)
+    trace.total_ms = round((time.perf_counter() - trace.started) * 1000, 3)
+    record = trace.record()
+    recent.append(record)
+    line = json.dumps(record, default=str)
+    logger.info(line)
+    if METRICS_FILE:
+        with _file_lock, open(METRICS_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    return record
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block as ``name`` in the current run, if any."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter(), **attrs)
+
+
+def traced(name):
+    """Decorator form of ``span``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                trace.add(name, start, time.perf_counter())
+        return wrapper
+    return decorate
@@ -0,0 +1,442 @@
+"""Generate the stlite ``index.html`` from the real app.
+
+Usage::
+
+    python -m diwa.stlite [--out index.html] [--measure]
+
+The files map is built by following imports from ``app.py`` and the pages it
+registers with ``st.Page``, so only local modules the app actually imports are
+shipped. Module-level imports that are never used are stripped from the
+shipped copies, and the Pyodide requirements are exactly the third-party
+packages still imported. The dataset ships as a compressed bundle (see
+``diwa.data``) embedded in the page instead of the raw CSV, plus any update
+batches in ``data/batches`` (see ``diwa.partitions``).
+
+Repeat visits skip most of the boot. ``/mnt`` is mounted on IndexedDB, where
+``diwa.persist`` keeps the dataset and its derived indexes per dataset
+version, and a service worker (``sw.js``, written next to the page) caches
+the stlite, Pyodide and package downloads, so the app also opens offline
+once it has been visited.
+
+``--measure`` serves the result locally and records the time to the first
+rendered page in headless Chromium, on a first visit and on a reload; it
+needs ``playwright`` and its browser.
+"""
+
+import argparse
+import ast
+import base64
+import functools
+import http.server
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import zipfile
+
+from diwa.data import BUNDLE_PATH, load_dataset, write_bundle
+from diwa.geo import DEFAULT_LEVEL, LEVELS_PATH
+from diwa.ingest import ALIASES_PATH
+from diwa.version import batch_files
+
+ENTRYPOINT = "app.py"
+OUT_PATH = "index.html"
+SW_NAME = "sw.js"
+STLITE_VERSION = "0.83.0"
+
+# Files read at runtime rather than imported
+ASSETS = ("assets/style.css",)
+# Licenses of third-party data the page embeds
+NOTICES = ("assets/geo/LICENSE",)
+
+# Map detail levels shipped to the browser; "high" alone is ~170 KB
+BROWSER_MAP_LEVELS = ("medium", "low")
+
+# Import name -> Pyodide package. Streamlit comes with stlite itself.
+PACKAGES = {"numpy": "numpy", "pandas": "pandas", "plotly": "plotly"}
+PROVIDED = {"streamlit"}
+# Imported only inside functions guarded by an availability check (PDF/PNG
+# reports); not shipped, so the browser build offers those features off
+OPTIONAL = {"matplotlib"}
+
+BOOT_TIMEOUT_S = 300
+
+# Hosts stlite and micropip download from: stlite and Pyodide from the CDN,
+# packages Pyodide does not bundle from PyPI
+RUNTIME_HOSTS = ("cdn.jsdelivr.net", "files.pythonhosted.org")
+INDEX_HOSTS = ("pypi.org",)
+PAGE_TIMEOUT_MS = 3000
+
+TEMPLATE = """<!doctype html>
+<!-- Generated by `python -m diwa.stlite` from app.py; do not edit by hand. -->
+<html>
+  <head>
+    <meta charset="UTF-8" />
+    <meta http-equiv="X-UA-Compatible" content="IE=edge" />
+    <meta
+      name="viewport"
+      content="width=device-width, initial-scale=1, shrink-to-fit=no"
+    />
+    <title>ASEAN-DIWA Dashboard</title>
+    <link
+      rel="stylesheet"
+      href="https://cdn.jsdelivr.net/npm/@stlite/browser@{version}/build/stlite.css"
+    />
+  </head>
+  <body>
+    <div id="root"></div>
+    <script type="module">
+      import {{ mount }} from "https://cdn.jsdelivr.net/npm/@stlite/browser@{version}/build/stlite.js";
+
+      // The first sidebar button marks the end of Pyodide boot
+      new MutationObserver((_, observer) => {{
+        if (document.querySelector('[data-testid="stSidebar"] button')) {{
+          window.diwaBootMs = Math.round(performance.now());
+          console.info(`ASEAN-DIWA booted in ${{window.diwaBootMs}} ms`);
+          observer.disconnect();
+        }}
+      }}).observe(document.getElementById("root"), {{ childList: true, subtree: true }});
+
+      const bytes = (b64) => Uint8Array.from(atob(b64), (c) => c.charCodeAt(0));
+
+      // Caches the runtime downloads; unavailable from file:// URLs
+      if ("serviceWorker" in navigator) {{
+        navigator.serviceWorker.register("./{sw}").catch(() => {{}});
+      }}
+
+      mount({{
+        requirements: {requirements},
+        entrypoint: "{entrypoint}",
+        // diwa.persist keeps derived data here across visits
+        idbfsMountpoints: ["/mnt"],
+        files: {{
+{files}
+        }},
+        streamlitConfig: {{
+          "theme.base": "light",
+          "client.toolbarMode": "viewer",
+        }},
+      }});
+    </script>
+  </body>
+</html>
+"""
+
+SW_TEMPLATE = """// Generated by `python -m diwa.stlite`; do not edit by hand.
+// Runtime downloads (stlite, Pyodide, wheels) have versioned URLs and are
+// served from the cache once fetched; the page itself comes from the network
+// when it answers within PAGE_TIMEOUT_MS, else from the cache.
+const CACHE = "diwa-stlite-{version}";
+const RUNTIME_HOSTS = {runtime_hosts};
+// Answers change without the URL changing
+const INDEX_HOSTS = {index_hosts};
+const PAGE_TIMEOUT_MS = {page_timeout_ms};
+
+self.addEventListener("install", () => self.skipWaiting());
+
+self.addEventListener("activate", (event) => {{
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(
+        keys.filter((key) => key.startsWith("diwa-") && key !== CACHE)
+          .map((key) => caches.delete(key))
+      ))
+      .then(() => self.clients.claim())
+  );
+}});
+
+const cacheable = (response) => response.ok || response.type === "opaque";
+
+async function cacheFirst(request) {{
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (cacheable(response)) cache.put(request, response.clone());
+  return response;
+}}
+
+async function staleWhileRevalidate(request) {{
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(request);
+  const network = fetch(request).then((response) => {{
+    if (cacheable(response)) cache.put(request, response.clone());
+    return response;
+  }});
+  if (!cached) return network;
+  network.catch(() => {{}});
+  return cached;
+}}
+
+async function networkFirst(request) {{
+  const cache = await caches.open(CACHE);
+  const network = fetch(request).then((response) => {{
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  }});
+  // Offline or slow: the cached copy, if any, else keep waiting
+  const slow = new Promise((resolve) => setTimeout(resolve, PAGE_TIMEOUT_MS));
+  const response = await Promise.race([network.catch(() => null), slow]);
+  return response || (await cache.match(request)) || network;
+}}
+
+self.addEventListener("fetch", (event) => {{
+  const request = event.request;
+  if (request.method !== "GET") return;
+  const url = new URL(request.url);
+  if (url.origin === self.location.origin) {{
+    event.respondWith(networkFirst(request));
+  }} else if (INDEX_HOSTS.includes(url.hostname)) {{
+    event.respondWith(staleWhileRevalidate(request));
+  }} else if (RUNTIME_HOSTS.includes(url.hostname)) {{
+    event.respondWith(cacheFirst(request));
+  }}
+}});
+"""
+
+
+def _module_path(name):
+    """Repository file for a local module name, or None."""
+    path = name.replace(".", "/")
+    for candidate in (path + ".py", path + "/__init__.py"):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def page_scripts(entrypoint=ENTRYPOINT):
+    """Scripts registered with ``st.Page("...")`` in the entrypoint."""
+    with open(entrypoint, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [
+        node.args[0].value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute) and node.func.attr == "Page"
+        and node.args and isinstance(node.args[0], ast.Constant)
+    ]
+
+
+def unused_imports(tree, source):
+    """Module-level import statements none of whose names are used."""
+    used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    lines = source.splitlines()
+    unused = []
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            continue
+        if "noqa" in lines[node.end_lineno - 1]:
+            continue  # deliberate re-export
+        bound = [(alias.asname or alias.name).split(".")[0] for alias in node.names]
+        if "*" not in bound and not any(name in used for name in bound):
+            unused.append(node)
+    return unused
+
+
+def _imported_modules(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            yield node.module
+            # ``from package import module``
+            yield from (f"{node.module}.{alias.name}" for alias in node.names)
+
+
+def collect_sources(entrypoint=ENTRYPOINT):
+    """Shipped sources, stripped imports and third-party packages of the app.
+
+    Returns ``(sources, stripped, packages)``: ``{path: source}`` for the
+    entrypoint, its pages and every local module they import; ``[(path,
+    statement)]`` for removed imports; and the set of third-party top-level
+    packages still imported.
+    """
+    queue = [entrypoint] + page_scripts(entrypoint)
+    sources, stripped, packages = {}, [], set()
+    while queue:
+        path = queue.pop(0)
+        if path in sources:
+            continue
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        tree = ast.parse(source)
+        unused = unused_imports(tree, source)
+        if unused:
+            lines = source.splitlines(keepends=True)
+            for node in reversed(unused):
+                stripped.append((path, ast.get_source_segment(source, node)))
+                del lines[node.lineno - 1:node.end_lineno]
+            source = "".join(lines)
+            tree = ast.parse(source)
+        sources[path] = source
+
+        for name in _imported_modules(tree):
+            top = name.split(".")[0]
+            if _module_path(top) is None:
+                if top not in sys.stdlib_module_names:
+                    packages.add(top)
+                continue
+            # The module and each of its parent packages
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                module = _module_path(".".join(parts[:i]))
+                if module is not None and module not in sources:
+                    queue.append(module)
+    return sources, stripped, packages
+
+
+def requirements_for(packages):
+    unknown = sorted(packages - set(PACKAGES) - PROVIDED - OPTIONAL)
+    if unknown:
+        raise SystemExit(f"No Pyodide package mapping for: {', '.join(unknown)} (see PACKAGES)")
+    return sorted({PACKAGES[p] for p in packages if p in PACKAGES})
+
+
+def compressed_bundle():
+    """The dataset as a compressed bundle, built from the current data files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "diwa.npz")
+        # No source mtime, and fixed zip timestamps below, so unchanged data
+        # embeds identically from any checkout
+        write_bundle(load_dataset(), path, compress=True, portable=True)
+        out = io.BytesIO()
+        with zipfile.ZipFile(path) as src, zipfile.ZipFile(out, "w") as dst:
+            for info in src.infolist():
+                fixed = zipfile.ZipInfo(info.filename, date_time=(1980, 1, 1, 0, 0, 0))
+                fixed.compress_type = zipfile.ZIP_DEFLATED
+                dst.writestr(fixed, src.read(info))
+        return out.getvalue()
+
+
+def browser_levels(levels=BROWSER_MAP_LEVELS, path=LEVELS_PATH):
+    """The map levels file reduced to ``levels``."""
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)["levels"]
+    kept = {level: collection[level] for level in levels}
+    assert DEFAULT_LEVEL in kept, "the map page opens at DEFAULT_LEVEL"
+    return json.dumps({"levels": kept}, separators=(",", ":"))
+
+
+def _js_string(text):
+    # JSON strings are valid JS; "</" must not close the <script> element
+    return json.dumps(text, ensure_ascii=False).replace("</", "<\\/")
+
+
+def render(entrypoint=ENTRYPOINT):
+    """Return ``(html, report)`` for the stlite page."""
+    sources, stripped, packages = collect_sources(entrypoint)
+    files = dict(sources)
+    for path in ASSETS + NOTICES:
+        with open(path, encoding="utf-8") as f:
+            files[path] = f.read()
+    files[LEVELS_PATH] = browser_levels()
+    files[BUNDLE_PATH] = compressed_bundle()
+    # Update batches ship as they are; the browser applies them like the
+    # server, canonicalizing their names through the same alias table
+    batches = [path for path, _ in batch_files()]
+    if batches and os.path.exists(ALIASES_PATH):
+        batches.insert(0, ALIASES_PATH)
+    for path in batches:
+        with open(path, encoding="utf-8") as f:
+            files[path] = f.read()
+
+    entries, sizes = [], {}
+    for path, content in files.items():
+        if isinstance(content, bytes):
+            value = f"bytes({_js_string(base64.b64encode(content).decode())})"
+        else:
+            value = _js_string(content)
+        entries.append(f"          {_js_string(path)}: {value},")
+        sizes[path] = len(content.encode("utf-8") if isinstance(content, str) else content)
+
+    requirements = requirements_for(packages)
+    html = TEMPLATE.format(
+        version=STLITE_VERSION,
+        sw=SW_NAME,
+        requirements=json.dumps(requirements),
+        entrypoint=entrypoint,
+        files="\n".join(entries),
+    )
+    report = {
+        "bytes": len(html.encode("utf-8")),
+        "files": sizes,
+        "requirements": requirements,
+        "stripped_imports": stripped,
+    }
+    return html, report
+
+
+def service_worker():
+    """Source of the service worker registered by the page."""
+    return SW_TEMPLATE.format(
+        version=STLITE_VERSION,
+        runtime_hosts=json.dumps(list(RUNTIME_HOSTS)),
+        index_hosts=json.dumps(list(INDEX_HOSTS)),
+        page_timeout_ms=PAGE_TIMEOUT_MS,
+    )
+
+
+def measure_boot(path, timeout_s=BOOT_TIMEOUT_S):
+    """Milliseconds from navigation to the first rendered page on a first
+    visit and on a reload (with the caches that visit filled), or None."""
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None
+
+    directory, name = os.path.split(os.path.abspath(path))
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page()
+            page.goto(f"http://127.0.0.1:{server.server_port}/{name}")
+            boot_ms = []
+            for visit in range(2):
+                if visit:
+                    page.reload()
+                page.wait_for_function("window.diwaBootMs !== undefined",
+                                       timeout=timeout_s * 1000)
+                boot_ms.append(page.evaluate("window.diwaBootMs"))
+            browser.close()
+    finally:
+        server.shutdown()
+    return tuple(boot_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entrypoint", default=ENTRYPOINT, help="Streamlit entrypoint")
+    parser.add_argument("--out", default=OUT_PATH, help="HTML file to write")
+    parser.add_argument("--measure", action="store_true",
+                        help="time Pyodide boot in headless Chromium (needs playwright)")
+    args = parser.parse_args(argv)
+
+    html, report = render(args.entrypoint)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(html)
+    sw_path = os.path.join(os.path.dirname(args.out), SW_NAME)
+    with open(sw_path, "w", encoding="utf-8") as f:
+        f.write(service_worker())
+
+    for path, size in report["files"].items():
+        print(f"  {path:32s} {size:9,d} bytes")
+    print(f"Wrote {args.out}: {report['bytes']:,} bytes, "
+          f"requirements {', '.join(report['requirements']) or 'none'}, and {sw_path}")
+    for path, statement in report["stripped_imports"]:
+        print(f"  stripped unused import in {path}: {statement}")
+
+    if args.measure:
+        boot_ms = measure_boot(args.out)
+        if boot_ms is None:
+            print("Pyodide boot: not measured (pip install playwright && playwright install chromium)")
+        else:
+            print(f"Pyodide boot: {boot_ms[0]:,} ms to first render, {boot_ms[1]:,} ms on reload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Gap-filled series and trend statistics, precomputed for the whole cube.
+
+Coverage is uneven: some series have a value every year, others a handful
+years apart, and the latest year differs between countries. ``TrendTable``
+runs once over every (country, indicator) series of a ``DiwaCube`` with
+vectorized NumPy and keeps two tables the pages look values up in:
+
+``filled``
+    Every series from its first observed year to its last, plus up to
+    ``carry_limit`` years beyond that (never past the dataset's last year).
+    Gaps between observations are interpolated linearly; years after the last
+    observation carry it forward. ``Method`` is ``"observed"``,
+    ``"interpolated"`` or ``"carried forward"``, ``Imputed`` flags the
+    latter two and ``ObservedYear`` is the latest observed year at or before
+    each row.
+
+``stats``
+    Per series: number of observations, first and last year and value,
+    least-squares ``Slope`` (units per year), ``CAGR`` (compound annual growth
+    between the first and last value, as a fraction; undefined unless both
+    are positive) and ``LastChange`` since the previous observation,
+    ``PreviousYear``.
+
+Statistics use observed values only, never imputed ones.
+
+``TrendTable.updated`` recomputes only the series a data batch changed (see
+``diwa.partitions``) and reuses every other row.
+"""
+
+import numpy as np
+import pandas as pd
+
+from diwa.frozen import freeze, readonly
+from diwa.partitions import splice
+from diwa.spans import traced
+
+# Years a last observation may be carried forward
+CARRY_LIMIT = 5
+
+OBSERVED = "observed"
+INTERPOLATED = "interpolated"
+CARRIED = "carried forward"
+
+
+def _same_series(country, indicator):
+    """Whether each row after the first continues the previous row's series."""
+    return (country[1:] == country[:-1]) & (indicator[1:] == indicator[:-1])
+
+
+def _sums(values, starts):
+    return np.add.reduceat(values, starts) if len(starts) else values[:0]
+
+
+def _stats(country, indicator, year, value, starts, stops, series):
+    count = stops - starts
+    first_year = year[starts]
+    # Years counted from each series' start keep the sums numerically stable
+    x = (year - first_year[series]).astype(np.float64)
+    sum_x, sum_y = _sums(x, starts), _sums(value, starts)
+    sum_xx, sum_xy = _sums(x * x, starts), _sums(x * value, starts)
+
+    last = stops - 1
+    previous = np.maximum(last - 1, starts)
+    first_value, last_value = value[starts], value[last]
+    span = (year[last] - first_year).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (count * sum_xy - sum_x * sum_y) / (count * sum_xx - sum_x ** 2)
+        cagr = (last_value / first_value) ** (1 / span) - 1
+    growing = (count > 1) & (first_value > 0) & (last_value > 0) & (span > 0)
+
+    return pd.DataFrame({
+        "Country": country[starts],
+        "Indicator": indicator[starts],
+        "Observations": count,
+        "FirstYear": first_year,
+        "LastYear": year[last],
+        "FirstValue": first_value,
+        "LastValue": last_value,
+        "Slope": np.where(count > 1, slope, np.nan),
+        "CAGR": np.where(growing, cagr, np.nan),
+        "LastChange": np.where(count > 1, last_value - value[previous], np.nan),
+        "PreviousYear": np.where(count > 1, year[previous], -1),
+    })
+
+
+def _fill(country, indicator, year, value, starts, stops, series, carry_limit, data_last_year):
+    first_year = year[starts]
+    last_year = year[stops - 1]
+    end_year = np.maximum(np.minimum(last_year + carry_limit, data_last_year), last_year)
+    lengths = end_year - first_year + 1
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    # One slot per series year; observations land at their own year
+    filled_series = np.repeat(np.arange(len(starts)), lengths)
+    filled_year = first_year[filled_series] + (
+        np.arange(offsets[-1]) - offsets[filled_series]
+    )
+    slot = offsets[series] + (year - first_year[series])
+    observed = np.zeros(offsets[-1], dtype=bool)
+    observed[slot] = True
+    observed_value = np.full(offsets[-1], np.nan)
+    observed_value[slot] = value
+
+    # Nearest observation at or before / at or after every slot. Each
+    # series starts with an observation, so "before" never leaves it;
+    # "after" is checked against the slot's series
+    positions = np.arange(offsets[-1])
+    before = np.maximum.accumulate(np.where(observed, positions, 0))
+    after = np.where(observed, positions, offsets[-1])
+    after = np.minimum.accumulate(after[::-1])[::-1]
+    has_after = after < offsets[-1]
+    has_after[has_after] = filled_series[after[has_after]] == filled_series[has_after]
+
+    interpolated = ~observed & has_after
+    carried = ~observed & ~has_after
+    filled_value = observed_value.copy()
+    filled_value[carried] = observed_value[before[carried]]
+    b, a = before[interpolated], after[interpolated]
+    weight = (filled_year[interpolated] - filled_year[b]) / (filled_year[a] - filled_year[b])
+    filled_value[interpolated] = (
+        observed_value[b] + weight * (observed_value[a] - observed_value[b])
+    )
+
+    # Categoricals over series-level codes: no per-row string objects
+    method = np.zeros(offsets[-1], dtype=np.int8)
+    method[interpolated] = 1
+    method[carried] = 2
+    filled = pd.DataFrame({
+        "Country": _repeat_categorical(country[starts], filled_series),
+        "Indicator": _repeat_categorical(indicator[starts], filled_series),
+        "Year": filled_year,
+        "Value": filled_value,
+        "Imputed": ~observed,
+        "Method": pd.Categorical.from_codes(method, [OBSERVED, INTERPOLATED, CARRIED]),
+        "ObservedYear": filled_year[before],
+    })
+    return filled, offsets, end_year
+
+
+def _repeat_categorical(values, index):
+    codes, categories = pd.factorize(values)
+    return pd.Categorical.from_codes(codes[index], categories)
+
+
+def _tables(frame, carry_limit, last_year):
+    """``(stats, filled, offsets, end_year, first_year)`` of the series in
+    ``frame``, sorted by Country, Indicator and Year."""
+    country = frame["Country"].to_numpy()
+    indicator = frame["Indicator"].to_numpy()
+    year = frame["Year"].to_numpy(dtype=np.int64)
+    value = frame["Value"].to_numpy(dtype=np.float64)
+
+    # Keep one value per year (the last, as the cube's latest snapshot does)
+    keep = np.ones(len(frame), dtype=bool)
+    keep[:-1] = ~(_same_series(country, indicator) & (year[1:] == year[:-1]))
+    country, indicator, year, value = country[keep], indicator[keep], year[keep], value[keep]
+
+    new_series = np.ones(len(year), dtype=bool)
+    new_series[1:] = ~_same_series(country, indicator)
+    starts = np.flatnonzero(new_series)
+    stops = np.append(starts[1:], len(year))
+    series = np.cumsum(new_series) - 1
+
+    stats = _stats(country, indicator, year, value, starts, stops, series)
+    filled, offsets, end_year = _fill(
+        country, indicator, year, value, starts, stops, series, carry_limit, last_year
+    )
+    return stats, filled, offsets, end_year, year[starts]
+
+
+def _last_year(cube):
+    return int(cube.frame["Year"].max()) if len(cube) else 0
+
+
+class TrendTable:
+    """Gap-filled series and per-series trend statistics of a cube."""
+
+    @traced("data.trend_table")
+    def __init__(self, cube, carry_limit=CARRY_LIMIT):
+        self.carry_limit = carry_limit
+        self.last_year = _last_year(cube)
+        self._set(*_tables(cube.frame, carry_limit, self.last_year))
+
+    def _set(self, stats, filled, offsets, end_year, first_year):
+        # Shared by every session, like the cube
+        self.stats = freeze(stats)
+        self.filled = freeze(filled)
+        self._offsets, self._end_year = readonly(offsets), readonly(end_year)
+        self._first_year = readonly(first_year)
+
+        self._stats_row = {
+            key: i for i, key in enumerate(zip(self.stats["Country"], self.stats["Indicator"]))
+        }
+        self._indicator_series = self.stats.groupby("Indicator", sort=True).indices
+
+    @traced("data.trend_update")
+    def updated(self, cube, series):
+        """The table of ``cube``, recomputing only the ``(country, indicator)``
+        keys in ``series`` and reusing this table's rows for every other one.
+
+        ``cube`` must differ from this table's cube in those series only;
+        when its last year moved, every series is recomputed.
+        """
+        last_year = _last_year(cube)
+        order = cube.series_keys()
+        stats, filled, offsets, end_year, first_year = _tables(
+            cube.select_series(series), self.carry_limit, last_year
+        )
+        fresh = {key: i for i, key in enumerate(zip(stats["Country"], stats["Indicator"]))}
+        if last_year != self.last_year or any(
+            key not in fresh and key not in self._stats_row for key in order
+        ):
+            return TrendTable(cube, self.carry_limit)
+
+        # Source of each series: index into this table's series, then the fresh ones
+        source = np.array([
+            len(self._stats_row) + fresh[key] if key in fresh else self._stats_row[key]
+            for key in order
+        ], dtype=np.int64)
+        old_offsets = self._offsets
+        table = TrendTable.__new__(TrendTable)
+        table.carry_limit, table.last_year = self.carry_limit, last_year
+        end_year = np.concatenate([self._end_year, end_year])[source]
+        first_year = np.concatenate([self._first_year, first_year])[source]
+        table._set(
+            splice(self.stats, {key: (i, i + 1) for key, i in self._stats_row.items()},
+                   stats, {key: (i, i + 1) for key, i in fresh.items()}, order),
+            splice(self.filled,
+                   {key: (old_offsets[i], old_offsets[i + 1]) for key, i in self._stats_row.items()},
+                   filled, {key: (offsets[i], offsets[i + 1]) for key, i in fresh.items()},
+                   order),
+            np.concatenate([[0], np.cumsum(end_year - first_year + 1)]),
+            end_year,
+            first_year,
+        )
+        return table
+
+    def trend(self, country, indicator):
+        """Trend statistics of one series as a dict, or None."""
+        row = self._stats_row.get((country, indicator))
+        return None if row is None else self.stats.iloc[row].to_dict()
+
+    @traced("filter.filled_series")
+    def filled_series(self, country, indicator):
+        """The gap-filled series of one indicator in one country."""
+        i = self._stats_row.get((country, indicator))
+        if i is None:
+            return self.filled.iloc[0:0]
+        return self.filled.iloc[self._offsets[i]:self._offsets[i + 1]]
+
+    def years_for(self, indicator):
+        """Years with a value, observed or filled, for ``indicator``, newest first."""
+        series = self._indicator_series.get(indicator)
+        if series is None:
+            return []
+        years = [np.arange(self._first_year[i], self._end_year[i] + 1) for i in series]
+        return np.unique(np.concatenate(years))[::-1].tolist()
+
+    @traced("filter.at_year")
+    def at_year(self, indicator, year, countries=None):
+        """Value of ``indicator`` in ``year`` per country, observed or filled."""
+        series = self._indicator_series.get(indicator)
+        if series is None:
+            return self.filled.iloc[0:0]
+        # Each series has one row per year, so the row is found by offset
+        covered = series[(self._first_year[series] <= year) & (year <= self._end_year[series])]
+        data = self.filled.iloc[self._offsets[covered] + (year - self._first_year[covered])]
+        if countries is not None:
+            data = data[data["Country"].isin(countries)]
+        return data
@@ -0,0 +1,69 @@
+"""Content fingerprints of the data files.
+
+Kept free of pandas and NumPy so the app shell can compute the dataset
+version on every rerun without importing the data stack.
+"""
+
+import hashlib
+import os
+
+# Same files as diwa.data.CSV_PATH and diwa.ingest.ALIASES_PATH; importing
+# those modules here would pull in pandas
+DATA_FILES = ("data/diwa.csv", "data/aliases.csv")
+
+# The stlite build ships the bundle (diwa.data.BUNDLE_PATH) instead of the CSV
+FALLBACKS = {"data/diwa.csv": "data/diwa.npz"}
+
+# Update batches merged on top of them, in file name order (see diwa.partitions)
+BATCH_DIR = "data/batches"
+BATCH_SUFFIX = ".csv"
+
+
+def file_fingerprint(path):
+    """Size, mtime and SHA-256 of a file, used to detect stale artifacts."""
+    st = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+# path -> (size, mtime_ns, sha256), so unchanged files are not rehashed
+_fingerprints = {}
+
+
+def _content_sha256(path):
+    st = os.stat(path)
+    cached = _fingerprints.get(path)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+    fingerprint = file_fingerprint(path)
+    _fingerprints[path] = (fingerprint["size"], fingerprint["mtime_ns"], fingerprint["sha256"])
+    return fingerprint["sha256"]
+
+
+def batch_files(directory=BATCH_DIR):
+    """``[(path, sha256)]`` of the update batches, in the order they apply."""
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.endswith(BATCH_SUFFIX))
+    except FileNotFoundError:
+        return []
+    paths = [os.path.join(directory, name) for name in names]
+    return [(path, _content_sha256(path)) for path in paths]
+
+
+def dataset_version(paths=DATA_FILES, batches=BATCH_DIR):
+    """Short content hash of the data files and update batches; changes
+    whenever any of them does. ``batches=None`` hashes ``paths`` only."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            path = FALLBACKS.get(path, path)
+        if os.path.exists(path):
+            digest.update(path.encode())
+            digest.update(_content_sha256(path).encode())
+    for path, sha256 in batch_files(batches) if batches else []:
+        digest.update(path.encode())
+        digest.update(sha256.encode())
+    return digest.hexdigest()[:12]
@@ -0,0 +1,70 @@
+// Generated by `python -m diwa.stlite`; do not edit by hand.
+// Runtime downloads (stlite, Pyodide, wheels) have versioned URLs and are
+// served from the cache once fetched; the page itself comes from the network
+// when it answers within PAGE_TIMEOUT_MS, else from the cache.
+const CACHE = "diwa-stlite-0.83.0";
+const RUNTIME_HOSTS = ["cdn.jsdelivr.net", "files.pythonhosted.org"];
+// Answers change without the URL changing
+const INDEX_HOSTS = ["pypi.org"];
+const PAGE_TIMEOUT_MS = 3000;
+
+self.addEventListener("install", () => self.skipWaiting());
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(
+        keys.filter((key) => key.startsWith("diwa-") && key !== CACHE)
+          .map((key) => caches.delete(key))
+      ))
+      .then(() => self.clients.claim())
+  );
+});
+
+const cacheable = (response) => response.ok || response.type === "opaque";
+
+async function cacheFirst(request) {
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (cacheable(response)) cache.put(request, response.clone());
+  return response;
+}
+
+async function staleWhileRevalidate(request) {
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(request);
+  const network = fetch(request).then((response) => {
+    if (cacheable(response)) cache.put(request, response.clone());
+    return response;
+  });
+  if (!cached) return network;
+  network.catch(() => {});
+  return cached;
+}
+
+async function networkFirst(request) {
+  const cache = await caches.open(CACHE);
+  const network = fetch(request).then((response) => {
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  });
+  // Offline or slow: the cached copy, if any, else keep waiting
+  const slow = new Promise((resolve) => setTimeout(resolve, PAGE_TIMEOUT_MS));
+  const response = await Promise.race([network.catch(() => null), slow]);
+  return response || (await cache.match(request)) || network;
+}
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  if (request.method !== "GET") return;
+  const url = new URL(request.url);
+  if (url.origin === self.location.origin) {
+    event.respondWith(networkFirst(request));
+  } else if (INDEX_HOSTS.includes(url.hostname)) {
+    event.respondWith(staleWhileRevalidate(request));
+  } else if (RUNTIME_HOSTS.includes(url.hostname)) {
+    event.respondWith(cacheFirst(request));
+  }
+});
@@ -0,0 +1,109 @@
+"""Which writes a shared (frozen) frame refuses, and which derived frames allow."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from diwa.frozen import FrozenFrame, freeze
+
+
+@pytest.fixture
+def frame():
+    return freeze(pd.DataFrame({
+        "Country": pd.Categorical(["Laos", "Malaysia", "Thailand"]),
+        "Indicator": ["a", "b", "c"],
+        "Value": [1.0, 2.0, 3.0],
+    }))
+
+
+def _unchanged(frame):
+    assert frame["Value"].tolist() == [1.0, 2.0, 3.0]
+    assert list(frame.columns) == ["Country", "Indicator", "Value"]
+
+
+WRITES = {
+    "setitem column": lambda f: f.__setitem__("Value", 9.0),
+    "setitem new column": lambda f: f.__setitem__("Extra", 9.0),
+    "loc whole column": lambda f: f.loc.__setitem__((slice(None), "Value"), 9.0),
+    "loc cell": lambda f: f.loc.__setitem__((0, "Value"), 9.0),
+    "loc row": lambda f: f.loc.__setitem__(0, 9.0),
+    "iloc whole column": lambda f: f.iloc.__setitem__((slice(None), 2), 9.0),
+    "iloc cell": lambda f: f.iloc.__setitem__((0, 2), 9.0),
+    "at": lambda f: f.at.__setitem__((0, "Value"), 9.0),
+    "iat": lambda f: f.iat.__setitem__((0, 2), 9.0),
+    "categorical column": lambda f: f.loc.__setitem__((0, "Country"), "Thailand"),
+    "insert": lambda f: f.insert(0, "Extra", 1),
+    "del": lambda f: f.__delitem__("Value"),
+    "pop": lambda f: f.pop("Value"),
+    "fillna inplace": lambda f: f.fillna({"Value": 0.0}, inplace=True),
+    "sort_values inplace": lambda f: f.sort_values("Value", inplace=True),
+    "to_numpy": lambda f: f["Value"].to_numpy().__setitem__(0, 9.0),
+    "column series cell": lambda f: f["Value"].__setitem__(0, 9.0),
+    "column series all": lambda f: f["Value"].__setitem__(slice(None), 9.0),
+}
+
+
+@pytest.mark.filterwarnings("ignore::pandas.errors.SettingWithCopyWarning")
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.parametrize("write", WRITES.values(), ids=WRITES.keys())
+def test_writes_raise(frame, write):
+    with pytest.raises(ValueError):
+        write(frame)
+    _unchanged(frame)
+
+
+def test_inplace_arithmetic_raises():
+    frame = freeze(pd.DataFrame({"Value": [1.0, 2.0]}))
+    with pytest.raises(ValueError):
+        frame += 1
+    assert frame["Value"].tolist() == [1.0, 2.0]
+
+
+DERIVED = {
+    "copy": lambda f: f.copy(),
+    "assign": lambda f: f.assign(Extra=1),
+    "sort": lambda f: f.sort_values("Value", ascending=False),
+    "take rows": lambda f: f.iloc[[0, 2]],
+    "mask": lambda f: f[f["Value"] > 1],
+    "columns": lambda f: f[["Indicator", "Value"]],
+}
+
+
+@pytest.mark.filterwarnings("ignore::pandas.errors.SettingWithCopyWarning")
+@pytest.mark.parametrize("derive", DERIVED.values(), ids=DERIVED.keys())
+def test_derived_frames_are_writable(frame, derive):
+    derived = derive(frame)
+    assert type(derived) is pd.DataFrame
+    derived.loc[:, "Value"] = 9.0
+    derived["New"] = 1
+    assert (derived["Value"] == 9.0).all()
+    _unchanged(frame)
+
+
+@pytest.mark.filterwarnings("ignore::pandas.errors.SettingWithCopyWarning")
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+def test_slice_stays_read_only_view(frame):
+    head = frame.iloc[:2]
+    with pytest.raises(ValueError):
+        head.iloc[0, 2] = 9.0
+    # A whole column of the slice is replaced in the slice only
+    head.loc[:, "Value"] = 9.0
+    _unchanged(frame)
+
+
+def test_reads_and_pickling(frame):
+    assert frame.loc[1, "Value"] == 2.0
+    assert frame.iloc[2, 2] == 3.0
+    assert frame.at[0, "Indicator"] == "a"
+    assert frame.groupby("Country", observed=True)["Value"].sum().tolist() == [1.0, 2.0, 3.0]
+    restored = pickle.loads(pickle.dumps(frame))
+    assert isinstance(restored, FrozenFrame)
+    pd.testing.assert_frame_equal(restored, frame)
+
+
+def test_shares_memory():
+    source = pd.DataFrame({"Value": np.arange(3.0)})
+    frozen = freeze(source)
+    assert np.shares_memory(frozen["Value"].to_numpy(), source["Value"].to_numpy())
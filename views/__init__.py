@@ -0,0 +1,5 @@
+"""Streamlit pages, loaded by ``st.navigation`` in ``app.py``.
+
+Each page imports its own heavy dependencies, so opening one page never
+imports what only another page needs.
+"""
@@ -0,0 +1,99 @@
+import streamlit as st
+
+from diwa.geo import bounds, level_for_bounds
+from views.figures import build_map_figure
+from views.loaders import (
+    LATEST, current_cube, data_stamp, get_country_coordinates, get_figure_cache, get_trends,
+    values_at,
+)
+
+data_version, cube = current_cube()
+figure_cache = get_figure_cache()
+country_coords = get_country_coordinates()
+
+ALL_COUNTRIES = "All of ASEAN"
+
+st.title("🗺️ ASEAN Interactive Map")
+st.markdown("Explore digital inclusion indicators across ASEAN countries")
+
+# Changing the indicator reruns this section; the zoom control and the
+# quick comparison below rerun on their own
+@st.fragment
+def map_section():
+    # Map controls
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        map_indicator = st.selectbox("Select Indicator for Map:", cube.indicators_by_coverage)
+    with col2:
+        map_year = st.selectbox("Year:", [LATEST, *get_trends(data_version).years_for(map_indicator)])
+
+    # Prepare map data — latest available year for each country, or every
+    # country in one year with gaps filled
+    map_data = values_at(data_version, map_indicator, map_year)
+
+    map_chart(map_indicator, map_year, map_data)
+    quick_comparison(map_data)
+
+
+@st.fragment
+def map_chart(map_indicator, map_year, map_data):
+    zoom = st.selectbox("Zoom to:", [ALL_COUNTRIES, *country_coords])
+
+    # Outline detail follows the zoom: finer borders only when a country
+    # fills the map, where coarse ones would show
+    box = bounds(country_coords if zoom == ALL_COUNTRIES else [zoom])
+    map_detail = level_for_bounds(box)
+    focus = None if zoom == ALL_COUNTRIES else box
+
+    # Create choropleth-style scatter map
+    fig = figure_cache.get_or_build(
+        ("map", data_stamp(data_version, map_indicator), map_indicator, map_year, zoom, map_detail),
+        lambda: build_map_figure(map_data, country_coords, map_detail, focus),
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+    if map_year == LATEST:
+        st.caption(
+            f"Latest available value per country "
+            f"({int(map_data['Year'].min())}–{int(map_data['Year'].max())})"
+        )
+    else:
+        st.caption(
+            f"Values for {map_year}; {int(map_data['Imputed'].sum())} of {len(map_data)} "
+            f"interpolated or carried forward from an earlier year"
+        )
+
+
+@st.fragment
+def quick_comparison(map_data):
+    # Country comparison section
+    st.subheader("🔄 Quick Country Comparison")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        country1 = st.selectbox("Select First Country:", map_data['Country'].unique())
+    with col2:
+        country2 = st.selectbox("Select Second Country:", 
+                               [c for c in map_data['Country'].unique() if c != country1])
+
+    if country1 and country2:
+        comp_data = map_data[map_data['Country'].isin([country1, country2])]
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            row1 = comp_data[comp_data['Country'] == country1].iloc[0]
+            val1 = row1['Value']
+            st.metric(country1, f"{val1:.1f}", help=f"Observed in {int(row1.get('ObservedYear', row1['Year']))}")
+
+        with col2:
+            row2 = comp_data[comp_data['Country'] == country2].iloc[0]
+            val2 = row2['Value']
+            diff = val2 - val1
+            st.metric(country2, f"{val2:.1f}", f"{diff:+.1f}", help=f"Observed in {int(row2.get('ObservedYear', row2['Year']))}")
+
+        with col3:
+            st.markdown(f"**Gap:** {abs(diff):.1f} percentage points")
+
+
+map_section()
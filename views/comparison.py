@@ -0,0 +1,214 @@
+import streamlit as st
+
+from diwa import reports
+from diwa.composite import HIGHER, LOWER, MIN_COVERAGE, MIN_MAX, NORMALIZATIONS, PARITY
+from views.comparison_modes import MODE_KEY, MODES, SINGLE
+from views.downloads import comparison_image, download_panel, export_selection
+from views.figures import build_comparison_bar, build_comparison_line
+from views.loaders import (LATEST, current_cube, data_stamp, get_composite, get_figure_cache,
+                           get_trends, values_at)
+
+data_version, cube = current_cube()
+figure_cache = get_figure_cache()
+
+COMPOSITE_DEFAULTS = 4
+WEIGHT_COLUMNS = 2
+PREVIOUS_RANKS_KEY = "_composite_previous_ranks"
+DIRECTION_HELP = {
+    HIGHER: "Higher values score better",
+    LOWER: "Lower values score better",
+    PARITY: "Values closer to gender parity score better",
+}
+
+st.title("📈 Country Comparison")
+st.markdown("Compare digital inclusion indicators across countries (all years)")
+mode = st.radio("Rank by:", MODES, horizontal=True, key=MODE_KEY)
+
+# Changing the selection reruns this section; switching the chart type only
+# reruns comparison_chart
+@st.fragment
+def comparison_section():
+    # Comparison controls
+    col1, col2 = st.columns(2)
+
+    with col1:
+        comp_indicator = st.selectbox("Select Indicator:", cube.indicators_by_coverage,
+                                      key="comparison_indicator")
+        comp_year = st.selectbox(
+            "Compare at:",
+            [LATEST, *get_trends(data_version).years_for(comp_indicator)],
+            help="A year compares every country in that year, interpolating between "
+                 "observations or carrying the last one forward where a country has none",
+        )
+
+    with col2:
+        comp_countries = st.multiselect(
+            "Select Countries to Compare:",
+            cube.countries,
+            default=cube.countries[:5]
+        )
+
+    if comp_countries:
+        # Canonical order, so any selection order shares one cached figure
+        comp_countries = sorted(comp_countries)
+        comp_key = (data_version, comp_indicator, tuple(comp_countries))
+
+        # Filter data for indicator + countries (no year filter)
+        comp_data = cube.select(indicator=comp_indicator, countries=comp_countries)
+
+        # Most recent value per country from the shared latest-value snapshot,
+        # or every country's value in one year from the precomputed trends
+        comp_latest = values_at(data_version, comp_indicator, comp_year, countries=comp_countries)
+
+        comparison_chart(comp_key, comp_indicator, comp_data, comp_latest, comp_year)
+
+        # Rankings based on the compared values
+        rankings = comp_latest.sort_values('Value', ascending=False).reset_index(drop=True)
+        rankings['Rank'] = rankings.index + 1
+        columns = ['Rank', 'Country', 'Value', 'Year']
+        if comp_year != LATEST:
+            columns = ['Rank', 'Country', 'Value', 'ObservedYear', 'Method']
+        rankings['Year'] = rankings['Year'].astype(int)
+
+        st.subheader("🏆 Rankings")
+        st.dataframe(
+            rankings[columns].rename(columns={'Value': f'{comp_indicator}',
+                                              'ObservedYear': 'Observed Year'}),
+            use_container_width=True
+        )
+
+        # Download options
+        st.subheader("📥 Download Options")
+        download_panel(
+            "Full Data",
+            f"comparison_{comp_indicator}_all_years",
+            comp_key,
+            lambda fmt: export_selection(
+                data_version, fmt, indicator=comp_indicator, countries=tuple(comp_countries)
+            ),
+            key="comparison_export",
+        )
+
+
+@st.fragment
+def comparison_chart(comp_key, comp_indicator, comp_data, comp_latest, comp_year):
+    chart_type = st.columns(3)[0].selectbox("Chart Type:", ["Bar Chart", "Line Chart"])
+    # Figures stay cached until a batch touches this indicator
+    figure_key = (data_stamp(data_version, comp_indicator),) + comp_key[1:]
+
+    # Create visualizations
+    if chart_type == "Bar Chart":
+        fig = figure_cache.get_or_build(
+            ("comparison_bar",) + figure_key + (comp_year,),
+            lambda: build_comparison_bar(
+                comp_latest, comp_indicator, None if comp_year == LATEST else comp_year
+            ),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    elif chart_type == "Line Chart":
+        # Show trends over time
+        fig = figure_cache.get_or_build(
+            ("comparison_line",) + figure_key,
+            lambda: build_comparison_line(comp_data, comp_indicator),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Static image of the chart shown above
+    if reports.available():
+        download_panel(
+            "Chart",
+            f"comparison_{comp_indicator}_{chart_type.split()[0].lower()}",
+            comp_key + (chart_type, comp_year),
+            lambda fmt: comparison_image(
+                data_version, comp_indicator, comp_key[2], chart_type, fmt, comp_year
+            ),
+            key="comparison_chart_export",
+            formats=reports.CHART_FORMATS,
+        )
+
+
+def _change(previous, rank):
+    if rank is None:
+        return ""
+    if previous is None:
+        return "new"
+    if previous == rank:
+        return "–"
+    return f"▲ {previous - rank}" if rank < previous else f"▼ {rank - previous}"
+
+
+# Every indicator is normalized once per dataset version (see diwa.composite),
+# so moving a weight reruns only this fragment and one matrix product
+@st.fragment
+def composite_section():
+    composite = get_composite(data_version)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        indicators = st.multiselect(
+            "Indicators in the index:",
+            cube.indicators_by_coverage,
+            default=cube.indicators_by_coverage[:COMPOSITE_DEFAULTS],
+            key="composite_indicators",
+        )
+    with col2:
+        normalization = st.radio(
+            "Normalize by:", NORMALIZATIONS, key="composite_normalization",
+            help="Min-max puts each indicator's worst country at 0 and best at 1; "
+                 "z-score counts standard deviations from the mean across countries",
+        )
+    if not indicators:
+        st.info("Choose at least one indicator.")
+        return
+
+    with st.expander("⚖️ Weights", expanded=True):
+        columns = st.columns(WEIGHT_COLUMNS)
+        weights = {
+            indicator: columns[i % WEIGHT_COLUMNS].slider(
+                indicator, 0.0, 5.0, 1.0, 0.5, key=f"composite_weight_{indicator}",
+                help=DIRECTION_HELP[composite.directions[indicator]],
+            )
+            for i, indicator in enumerate(indicators)
+        }
+
+    ranking = composite.score(weights, normalization)
+    if ranking.empty:
+        st.info("Give at least one indicator a weight above 0.")
+        return
+
+    # Movement against this session's previous scoring, as weights change
+    ranks = {
+        country: int(rank) if ranked else None
+        for country, rank, ranked in zip(ranking["Country"], ranking["Rank"],
+                                         ranking["Rank"].notna())
+    }
+    previous = st.session_state.get(PREVIOUS_RANKS_KEY)
+    ranking["Change"] = [
+        _change(previous.get(country), rank) if previous else ""
+        for country, rank in ranks.items()
+    ]
+    st.session_state[PREVIOUS_RANKS_KEY] = ranks
+
+    st.subheader("🏆 Composite Rankings")
+    st.dataframe(
+        ranking[["Rank", "Change", "Country", "Score", "Coverage", "Indicators"]],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Score": st.column_config.NumberColumn(
+                format="%.3f" if normalization == MIN_MAX else "%+.2f"),
+            "Coverage": st.column_config.NumberColumn(format="percent"),
+        },
+    )
+    st.caption(
+        "Score is the weighted mean of each country's normalized latest values over the "
+        "indicators it reports. Gap indicators count lower as better, and the derived "
+        "gender gap, ratio and parity index count closeness to parity as better. "
+        f"Countries reporting under {MIN_COVERAGE:.0%} of the total weight are not ranked."
+    )
+
+
+if mode == SINGLE:
+    comparison_section()
+else:
+    composite_section()
@@ -0,0 +1,10 @@
+"""Ranking modes of the Comparison page.
+
+Kept apart from ``views/comparison.py`` because that is a page script, run by
+importing it: the search panel sets the mode through these names instead.
+"""
+
+MODE_KEY = "comparison_mode"
+SINGLE = "One indicator"
+COMPOSITE = "Composite index"
+MODES = (SINGLE, COMPOSITE)
@@ -0,0 +1,215 @@
+import streamlit as st
+
+from views.downloads import download_panel, export_archive, export_selection, report_panel
+from views.figures import build_region_bar, build_region_trend, build_trend_figure
+from views.loaders import (current_cube, data_stamp, get_figure_cache, get_region_index,
+                           get_trends)
+
+data_version, cube = current_cube()
+figure_cache = get_figure_cache()
+trends = get_trends(data_version)
+
+st.title("📊 Country Profiles")
+st.markdown("Detailed analysis for each ASEAN country")
+
+# Country selection
+countries = cube.countries
+
+# Create country grid
+cols = st.columns(4)
+selected_country = None
+
+for i, country in enumerate(countries):
+    with cols[i % 4]:
+        if st.button(f"🏴 {country}", key=f"country_{i}", use_container_width=True):
+            selected_country = country
+
+# Use session state to persist selection
+if 'selected_country' not in st.session_state:
+    st.session_state.selected_country = countries[0]
+
+if selected_country:
+    st.session_state.selected_country = selected_country
+
+country = st.session_state.selected_country
+
+st.markdown(f"## 📍 {country} Profile")
+
+# Latest year data, from the shared latest-value snapshot
+country_latest = cube.latest_for_country(country)
+latest_year = country_latest['Year'].max()
+latest_data = country_latest[country_latest['Year'] == latest_year]
+
+
+def trend_summary(trend):
+    """One-line slope / CAGR description of a precomputed trend."""
+    if trend is None or trend['Observations'] < 2:
+        return "Single observation"
+    text = (f"Trend {trend['Slope']:+.2f} per year over "
+            f"{int(trend['FirstYear'])}–{int(trend['LastYear'])}")
+    if trend['CAGR'] == trend['CAGR']:  # NaN when undefined
+        text += f", CAGR {trend['CAGR']:+.1%}"
+    return text
+
+
+# Overview metrics
+st.subheader("📊 Key Indicators Overview")
+st.caption(f"Latest available year: {int(latest_year)}")
+
+cols = st.columns(3)
+for j, (_, row) in enumerate(latest_data.iterrows()):
+    # Trend badge: change since the previous observation, from the precomputed stats
+    trend = trends.trend(country, row['Indicator'])
+    change = None
+    if trend is not None and trend['Observations'] > 1:
+        change = f"{trend['LastChange']:+.1f} since {int(trend['PreviousYear'])}"
+    with cols[j % 3]:
+        st.metric(row['Indicator'], f"{row['Value']:.1f}", change,
+                  delta_color="off", help=trend_summary(trend))
+
+# Trends analysis
+st.subheader("📈 Trends Over Time")
+
+
+# Reruns on its own when the trend indicator changes
+@st.fragment
+def trend_section(country):
+    trend_indicator = st.selectbox("Select Indicator for Trends:", 
+                                  cube.indicators_for(country),
+                                  key="trend_indicator")
+
+    fill_gaps = st.toggle(
+        "Fill gaps",
+        help="Interpolate between observations and carry the last one forward "
+             "a few years; filled years are drawn hollow",
+    )
+
+    if fill_gaps:
+        trend_data = trends.filled_series(country, trend_indicator)
+    else:
+        trend_data = cube.series(country, trend_indicator)
+
+    fig = figure_cache.get_or_build(
+        ("trend", data_stamp(data_version, trend_indicator, country), country, trend_indicator,
+         fill_gaps),
+        lambda: build_trend_figure(trend_data, country, trend_indicator),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(trend_summary(trends.trend(country, trend_indicator)))
+
+
+trend_section(country)
+
+# Regional drill-down, from the subnational rows kept out of the national cube
+st.subheader("🏘️ Regional Drill-down")
+
+
+@st.fragment
+def region_section(country):
+    region_index = get_region_index(data_version)
+    regions = region_index.regions(country)
+    unnamed = region_index.unnamed_rows(country)
+    if not regions:
+        if unnamed.empty:
+            st.caption(f"No subnational data reported for {country}.")
+        else:
+            # Without region names there is nothing to compare across regions
+            st.caption(f"Subnational figures reported for {country}, without region names.")
+            st.dataframe(
+                unnamed[['Indicator', 'Value', 'Year']],
+                hide_index=True,
+                use_container_width=True,
+            )
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        region = st.selectbox("Select Region:", regions)
+    with col2:
+        region_indicator = st.selectbox("Select Regional Indicator:",
+                                        region_index.indicators_for(country, region))
+
+    region_latest = region_index.latest_for_region(country, region)
+    st.dataframe(
+        region_latest[['Indicator', 'Value', 'Year']],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = figure_cache.get_or_build(
+            ("region_trend", data_stamp(data_version, region_indicator, country), country, region,
+             region_indicator),
+            lambda: build_region_trend(
+                region_index.series(country, region, region_indicator),
+                region_index.rollup(country, region_indicator),
+                cube.series(country, region_indicator),
+                region,
+                region_indicator,
+            ),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        fig = figure_cache.get_or_build(
+            ("region_bar", data_stamp(data_version, region_indicator, country), country,
+             region_indicator),
+            lambda: build_region_bar(
+                region_index.latest_by_region(country, region_indicator),
+                country,
+                region_indicator,
+            ),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+region_section(country)
+
+# Country summary
+st.subheader("📝 Country Summary")
+
+avg_all = latest_data['Value'].mean()
+strongest_indicator = latest_data.nlargest(1, 'Value')['Indicator'].iloc[0]
+weakest_indicator = latest_data.nsmallest(1, 'Value')['Indicator'].iloc[0]
+
+summary_text = f"""
+**{country}** shows an average digital inclusion score of **{avg_all:.1f}** across all indicators in {latest_year}.
+
+**Key Insights:**
+- Strongest Indicator: {strongest_indicator}
+- Area for Improvement: {weakest_indicator}
+
+**Recommendations:**
+- Continue strengthening digital infrastructure and affordability
+- Promote inclusive digital policies and programs
+- Monitor progress across all key indicators
+"""
+
+st.markdown(summary_text)
+
+# Download section
+st.subheader("📥 Download Report")
+
+report_panel(data_version, country)
+
+# Raw data downloads, built only when prepared
+col1, col2 = st.columns(2)
+with col1:
+    download_panel(
+        "Raw Data",
+        f"{country}_digital_inclusion_data",
+        (data_version, country),
+        lambda fmt: export_selection(data_version, fmt, countries=(country,)),
+        key="country_export",
+    )
+
+with col2:
+    download_panel(
+        "All Countries",
+        f"diwa_all_countries_{data_version}",
+        data_version,
+        lambda fmt: export_archive(data_version, fmt),
+        key="archive_export",
+        zipped=True,
+        on_disk=True,
+    )
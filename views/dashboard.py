@@ -0,0 +1,98 @@
+import streamlit as st
+
+from diwa.spans import span
+from views.loaders import current_cube, indicator_averages
+
+data_version, cube = current_cube()
+
+st.markdown("""
+<div class="main-header">
+    <h1>ASEAN Digital Inclusion for Women Alliance (DIWA)</h1>
+    <p>Bridging the Digital Gender Gap in Southeast Asia</p>
+</div>
+""", unsafe_allow_html=True)
+
+# Project Brief
+with st.expander("📋 Project Brief", expanded=True):
+    st.markdown("""
+    **ASEAN-DIWA** is a comprehensive initiative aimed at promoting digital inclusion and reducing 
+    the digital gender gap across ASEAN member states and partner countries. Our mission is to:
+
+    - 📊 **Monitor** digital gender disparities through data-driven insights  
+    - 🎯 **Identify** key areas requiring targeted interventions  
+    - 🤝 **Collaborate** with stakeholders to implement inclusive digital policies  
+    - 📈 **Track** progress towards achieving digital equality
+
+    This dashboard provides interactive visualizations and country-specific analysis to support 
+    evidence-based decision making for digital inclusion initiatives.
+    """)
+
+# Key Metrics Overview
+st.subheader("📊 Key Indicators Overview")
+
+
+# Reruns on its own when the country filter changes
+@st.fragment
+def key_indicators():
+    # Filter controls
+    selected_countries = st.multiselect(
+        "Select Countries:",
+        options=cube.countries,
+        default=cube.countries[:6]
+    )
+
+    # One grouped mean over the selection instead of a filter per card
+    with span("groupby.indicator_averages"):
+        averages = indicator_averages(data_version, tuple(sorted(selected_countries)))
+
+    # Create metrics cards (limit to 8 indicators)
+    cols = st.columns(4)
+    for i, (indicator, avg_value) in enumerate(averages.items()):
+        with cols[i % 4]:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>{indicator}</h3>
+                <h2 style="color: #e91e63;">{avg_value:.1f}</h2>
+                <p>Average across selected countries (all years)</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+
+key_indicators()
+
+# Navigation Guide
+st.subheader("🧭 Explore More")
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    st.markdown("""
+    <div class="indicator-section">
+        <h4>🗺️ Interactive Map</h4>
+        <p>Explore geographical patterns of digital inclusion across ASEAN countries with our interactive choropleth maps.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if st.button("Visit ASEAN Map", key="map_btn"):
+        st.switch_page("views/asean_map.py")
+
+with col2:
+    st.markdown("""
+    <div class="indicator-section">
+        <h4>📊 Country Profiles</h4>
+        <p>Dive deep into individual country analysis with detailed breakdowns and downloadable reports.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if st.button("View Country Profiles", key="profile_btn"):
+        st.switch_page("views/country_profiles.py")
+
+with col3:
+    st.markdown("""
+    <div class="indicator-section">
+        <h4>📈 Compare Countries</h4>
+        <p>Create side-by-side comparisons between countries with customizable charts and rankings.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if st.button("Compare Countries", key="compare_btn"):
+        st.switch_page("views/comparison.py")
@@ -0,0 +1,201 @@
+"""Run tracing hooks for the app shell and the opt-in debug panel.
+
+Every full run is traced (see ``diwa.spans``), including the number and size
+of the messages it sends to the browser, the bytes of each chart among them
+and how many elements went as references to ones the browser had cached. The
+sidebar panel shows the spans of the current run and a memory report, and can
+profile the run with cProfile; it appears with ``?debug`` in the URL or
+``DIWA_DEBUG=1`` in the environment.
+"""
+
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from diwa import memory, spans
+
+ENV_DEBUG = "DIWA_DEBUG"
+PROFILE_KEY = "debug_profile"
+PROFILER_KEY = "_debug_profiler"
+PROFILE_LINES = 30
+PROFILE_BUSY_KEY = "_debug_profile_busy"
+
+# Python allows one active profiler per process, so one session profiles at a time
+_profiling = threading.Lock()
+
+
+def enabled():
+    return os.environ.get(ENV_DEBUG, "") not in ("", "0") or "debug" in st.query_params
+
+
+def _is_figure(msg):
+    return (msg.WhichOneof("type") == "delta"
+            and msg.delta.WhichOneof("type") == "new_element"
+            and msg.delta.new_element.WhichOneof("type") == "plotly_chart")
+
+
+def _count_messages(ctx):
+    # Wrap the session's outgoing queue once; the wrapper charges each
+    # message to whichever run is in progress
+    enqueue = ctx._enqueue
+    if getattr(enqueue, "counts_messages", False):
+        return
+
+    def counting(msg):
+        trace = spans.current()
+        if trace is not None:
+            trace.count_message(msg.ByteSize(), figure=_is_figure(msg),
+                                reference=msg.WhichOneof("type") == "ref_hash")
+        enqueue(msg)
+
+    counting.counts_messages = True
+    ctx._enqueue = counting
+
+
+def _active_sessions():
+    try:
+        from streamlit.runtime import Runtime
+        return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:  # Private API; there is no runtime under AppTest either
+        return None
+
+
+def memory_report():
+    """Rows of shared and per-session memory, in bytes."""
+    # Imported here: the shell itself stays free of pandas
+    from views.loaders import current_cube, get_region_index, get_trends, load_diwa_data
+
+    version, cube = current_cube()
+    shared = memory.shared_bytes({
+        "dataset": load_diwa_data(version),
+        "national cube": cube,
+        "trend table": get_trends(version),
+        "region index": get_region_index(version),
+    })
+    rows = [{"memory": f"shared: {name}", "bytes": size} for name, size in shared.items()]
+    rows.append({"memory": "this session's state",
+                 "bytes": memory.deep_bytes(st.session_state.to_dict())})
+
+    rss, sessions = memory.process_rss(), _active_sessions()
+    if rss is not None:
+        rows.append({"memory": "process RSS", "bytes": rss})
+        if sessions:
+            rows.append({"memory": f"RSS per session ({sessions} active)",
+                         "bytes": rss // sessions})
+    return rows
+
+
+def begin_run():
+    """Start tracing this run, and profiling it if the panel asks to."""
+    ctx = get_script_run_ctx()
+    spans.start_run(session=ctx.session_id[:8] if ctx else None)
+    if ctx is not None:
+        try:
+            _count_messages(ctx)
+        except AttributeError:
+            pass  # Streamlit internals changed: spans still work, counts stay 0
+    st.session_state.pop(PROFILE_BUSY_KEY, None)
+    if enabled() and st.session_state.get(PROFILE_KEY):
+        _start_profiler()
+
+
+def _start_profiler():
+    if not _profiling.acquire(blocking=False):
+        st.session_state[PROFILE_BUSY_KEY] = True
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Another profiling tool is already active
+        _profiling.release()
+        st.session_state[PROFILE_BUSY_KEY] = True
+        return
+    st.session_state[PROFILER_KEY] = profiler
+
+
+def stop_profiler():
+    """Stop this run's profiler, if any, and return it. Safe to call twice."""
+    profiler = st.session_state.pop(PROFILER_KEY, None)
+    if profiler is not None:
+        profiler.disable()
+        _profiling.release()
+    return profiler
+
+
+def set_page(name):
+    trace = spans.current()
+    if trace is not None:
+        trace.page = name
+
+
+def end_run():
+    """Show the debug panel if enabled, then log the run."""
+    profiler = stop_profiler()
+    if enabled():
+        with st.sidebar:
+            _panel(spans.current(), profiler)
+    spans.finish_run()
+
+
+def _panel(trace, profiler):
+    st.markdown("---")
+    with st.expander("🐞 Debug", expanded=True):
+        if trace is not None:
+            record = trace.record()
+            figures = record["figure_bytes"]
+            st.caption(
+                f"{record['page']}: {record['messages']} messages, "
+                f"{record['message_bytes'] / 1024:.1f} KB sent so far"
+            )
+            st.caption(
+                f"Charts: {', '.join(f'{b / 1024:.1f} KB' for b in figures) or 'none'}; "
+                f"{record['references']} unchanged elements sent by reference"
+            )
+            stages = sorted(record["stages"].items(), key=lambda item: -item[1]["ms"])
+            st.dataframe(
+                [{"span": name, "calls": s["calls"], "ms": s["ms"]} for name, s in stages],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.download_button(
+                "Download run JSON",
+                json.dumps(record, indent=2, default=str),
+                file_name="diwa_run.json",
+                mime="application/json",
+                on_click="ignore",
+            )
+
+        st.caption("Memory")
+        st.dataframe(
+            [{"memory": row["memory"], "size": memory.format_bytes(row["bytes"])}
+             for row in memory_report()],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        from views.loaders import get_figure_cache
+        st.caption("Figure cache")
+        st.json(get_figure_cache().stats(), expanded=False)
+
+        st.toggle("Profile each run (cProfile)", key=PROFILE_KEY)
+        if st.session_state.get(PROFILE_BUSY_KEY):
+            st.caption("Profiler busy: another session is profiling; this run was not profiled.")
+        if profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            st.code(out.getvalue(), language=None)
+            profiler.create_stats()
+            st.download_button(
+                "Download profile (.prof)",
+                marshal.dumps(profiler.stats),
+                file_name="diwa_run.prof",
+                mime="application/octet-stream",
+                on_click="ignore",
+            )
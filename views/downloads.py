@@ -0,0 +1,153 @@
+"""Download panels whose files are built only when asked for."""
+
+import html
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from diwa import export, reports
+from views.loaders import LATEST, get_diwa_cube, values_at
+
+
+# Bytes are immutable, so a resource cache can share them between sessions
+# without the copy st.cache_data makes on every hit
+@st.cache_resource(max_entries=64)
+def export_selection(version, fmt, indicator=None, countries=None):
+    cube = get_diwa_cube(version)
+    data = cube.select(indicator=indicator, countries=list(countries) if countries else None)
+    return export.to_bytes(data, fmt)
+
+
+def export_archive(version, fmt):
+    # Built once per dataset version and format on disk (see diwa.export);
+    # the path, not the bytes, so it can be served from there
+    return export.country_archive(get_diwa_cube(version), version, fmt)
+
+
+@st.cache_resource(max_entries=64)
+def comparison_image(version, indicator, countries, chart_type, fmt, year=LATEST):
+    if chart_type == "Bar Chart":
+        data = values_at(version, indicator, year, countries=list(countries))
+    else:
+        data = get_diwa_cube(version).select(indicator=indicator, countries=list(countries))
+    return reports.comparison_chart(data, indicator, chart_type, fmt,
+                                    year=None if year == LATEST else year)
+
+
+@st.cache_resource(max_entries=2)
+def report_batch(version):
+    # One background batch per dataset version and server process; the
+    # rendering itself runs in diwa.reports' process pool, from this version's
+    # cached cube rather than whatever is on disk by then
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diwa-reports")
+    return executor.submit(reports.build_reports_detached, version, get_diwa_cube(version))
+
+
+@st.cache_resource(max_entries=64)
+def read_report(path):
+    # Report paths include the dataset version, so their contents never change
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@st.fragment
+def download_panel(label, stem, selection, build, key, zipped=False, formats=None,
+                   on_disk=False):
+    """Format picker plus a prepare step before the download button.
+
+    ``selection`` identifies the exported content; ``build(fmt)`` returns the
+    bytes, or with ``on_disk`` the path of a file, which is streamed to the
+    browser without being read into memory when it can be (see
+    ``file_download``). Changing either the format or the selection asks for a
+    new prepare. ``formats`` maps format names to (extension, MIME type) and
+    defaults to the installed export formats.
+    """
+    if formats is None:
+        formats = {name: export.FORMATS[name] for name in export.available_formats()}
+    fmt = st.radio("Format:", list(formats), horizontal=True, key=f"{key}_format")
+    request = (selection, fmt)
+    prepared_key = f"{key}_prepared"
+
+    if st.session_state.get(prepared_key) != request:
+        if st.button(f"Prepare {label}", key=f"{key}_prepare"):
+            st.session_state[prepared_key] = request
+
+    if st.session_state.get(prepared_key) == request:
+        ext, mime = formats[fmt]
+        with st.spinner("Preparing download..."):
+            data = build(fmt)
+        button = dict(
+            label=f"📊 Download {label} ({fmt}{', zip' if zipped else ''})",
+            file_name=f"{stem}.zip" if zipped else f"{stem}.{ext}",
+            mime=export.ZIP_MIME if zipped else mime,
+            key=f"{key}_download",
+        )
+        if on_disk:
+            file_download(data, **button)
+        else:
+            st.download_button(data=data, on_click="ignore", **button)
+
+
+def file_download(path, label, file_name, mime, key):
+    """Download link for the file at ``path``.
+
+    Files under ``diwa.export.STATIC_DIR`` are linked to their static URL, so
+    the server streams them from disk. Elsewhere, or without static serving
+    (the stlite build), ``st.download_button`` has to hold the whole file.
+    """
+    url = export.static_url(path) if st.get_option("server.enableStaticServing") else None
+    if url is None:
+        with open(path, "rb") as f:
+            st.download_button(label, f, file_name=file_name, mime=mime,
+                               on_click="ignore", key=key)
+        return
+    # The static handler sends non-media files as text/plain; the download
+    # attribute saves the bytes under file_name all the same
+    st.markdown(
+        f'<a href="{html.escape(url)}" download="{html.escape(file_name)}">{html.escape(label)}</a>',
+        unsafe_allow_html=True,
+    )
+
+
+def report_panel(version, country):
+    """PDF report and PNG chart of ``country``, served from the report cache."""
+    if not reports.available():
+        st.info("PDF and PNG reports need matplotlib (`pip install matplotlib`).")
+        return
+    paths = {
+        "PDF": reports.report_path(version, country, "pdf"),
+        "PNG": reports.report_path(version, country, "png"),
+    }
+    if all(os.path.exists(p) for p in paths.values()):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "📄 Download PDF Report", read_report(paths["PDF"]),
+                file_name=f"{country}_report.pdf", mime="application/pdf", on_click="ignore",
+            )
+        with col2:
+            st.download_button(
+                "🖼️ Download PNG Chart", read_report(paths["PNG"]),
+                file_name=f"{country}_latest_values.png", mime="image/png", on_click="ignore",
+            )
+        return
+
+    batch = report_batch(version)
+    if not batch.done():
+        _report_pending(version)
+    elif batch.exception() is not None:
+        st.error(f"Report generation failed: {batch.exception()}")
+    else:
+        # The batch finished without this country's files
+        st.warning(f"No report is available for {country} in this dataset version.")
+
+
+@st.fragment(run_every="2s")
+def _report_pending(version):
+    # Polls only while the batch runs; once it is done the full rerun shows
+    # the downloads, the error or the missing report
+    if report_batch(version).done():
+        st.rerun()
+    st.info("Reports for this dataset version are being generated; "
+            "the downloads appear here when ready.")
@@ -0,0 +1,196 @@
+"""Plotly figure builders for the chart pages.
+
+Only the pages that draw charts import this module, so plotly stays out of
+the Dashboard, Data Stories and About pages.
+"""
+
+import plotly.express as px
+
+from diwa.geo import ISO3, MAP_SIZE, load_geometry
+
+
+# Figure builders. Results are cached and shared, so every layout tweak
+# belongs here rather than on the returned figure.
+def _year_hover(data, **extra):
+    # Values aligned to one year also say how each was obtained
+    if "Method" in data:
+        return {"Year": False, "ObservedYear": True, "Method": True, **extra}
+    return {"Year": True, **extra}
+
+
+def build_map_figure(map_data, country_coords, detail, focus=None):
+    # Bundled ASEAN geometry keyed by ISO code instead of Plotly's world map
+    map_data = map_data.assign(ISO3=map_data["Country"].map(ISO3))
+    fig = px.choropleth(
+        map_data,
+        geojson=load_geometry(detail, map_data["Country"]),
+        locations="ISO3",                  # Matches the feature ids
+        featureidkey="id",
+        color="Value",                     # Replace with your metric column
+        hover_name="Country",              # Show country name on hover
+        hover_data=_year_hover(map_data, ISO3=False),  # Latest year differs per country
+        color_continuous_scale="Viridis",  # Color scale
+        projection="natural earth"         # World map projection
+    )
+    
+    # Country labels at diwa.geo.COORDINATES;
+    # countries without data keep a label but send no outline
+    fig.add_scattergeo(
+        lat=[country_coords[c]["lat"] for c in country_coords],
+        lon=[country_coords[c]["lon"] for c in country_coords],
+        text=list(country_coords),
+        mode="text",
+        textfont=dict(size=10, color="#333"),
+        hoverinfo="skip",
+        showlegend=False,
+    )
+    # plotly.js downloads its world topojson when the first geo trace has a
+    # locationmode; leading with the lat/lon-only labels keeps the map offline
+    fig.data = fig.data[-1:] + fig.data[:-1]
+    
+    fig.update_layout(
+        geo=dict(
+            visible=False,                 # No world basemap to fetch or draw
+            fitbounds="locations"
+        ),
+        height=MAP_SIZE[1]
+    )
+    if focus is not None:
+        # Zoomed to (lon_min, lon_max, lat_min, lat_max), with a margin
+        lon_min, lon_max, lat_min, lat_max = focus
+        pad = 0.1 * max(lon_max - lon_min, lat_max - lat_min, 1.0)
+        fig.update_geos(
+            fitbounds=False,
+            lonaxis_range=[lon_min - pad, lon_max + pad],
+            lataxis_range=[lat_min - pad, lat_max + pad],
+        )
+    return fig
+
+
+def build_trend_figure(trend_data, country, indicator):
+    filled = "Imputed" in trend_data
+    fig = px.line(trend_data, x='Year', y='Value',
+                 title=f'{indicator} Trends in {country}',
+                 markers=not filled)
+    if filled:
+        # Gap-filled series: observed years solid, filled years hollow
+        color = fig.data[0].line.color
+        for imputed, name, symbol in ((False, "Observed", "circle"), (True, "Filled", "circle-open")):
+            points = trend_data[trend_data["Imputed"] == imputed]
+            fig.add_scatter(x=points["Year"], y=points["Value"], mode="markers", name=name,
+                            marker=dict(symbol=symbol, size=8, color=color),
+                            customdata=points["Method"],
+                            hovertemplate="%{x}: %{y:.2f} (%{customdata})<extra></extra>")
+    fig.update_layout(height=400)
+    return fig
+
+
+def build_comparison_bar(comp_latest, indicator, year=None):
+    fig = px.bar(
+        comp_latest,
+        x='Country',
+        y='Value',
+        color='Country',
+        hover_data=_year_hover(comp_latest),
+        title=f'{indicator} ({year or "Most Recent Year"})',
+    )
+    if "Imputed" in comp_latest:
+        # Interpolated or carried-forward values are hatched
+        imputed = set(comp_latest.loc[comp_latest["Imputed"], "Country"])
+        fig.for_each_trace(
+            lambda trace: trace.update(marker_pattern_shape="/") if trace.name in imputed else None
+        )
+    fig.update_layout(height=500)
+    return fig
+
+
+def build_comparison_line(comp_data, indicator):
+    fig = px.line(
+        comp_data,
+        x='Year',
+        y='Value',
+        color='Country',
+        title=f'{indicator} Trends Over Time',
+        markers=True,
+        color_discrete_sequence=px.colors.qualitative.Set1
+    )
+    fig.update_layout(height=500)
+    return fig
+
+
+def build_region_trend(region_data, rollup, national_data, region, indicator):
+    fig = px.line(region_data, x='Year', y='Value',
+                  title=f'{indicator} in {region}',
+                  markers=True)
+    fig.update_traces(name=region, showlegend=True)
+
+    # Spread and mean across all regions, from the precomputed rollup
+    if len(rollup) and rollup['Regions'].max() > 1:
+        fig.add_scatter(x=rollup['Year'], y=rollup['Max'], mode='lines', line_width=0,
+                        showlegend=False, hoverinfo='skip')
+        fig.add_scatter(x=rollup['Year'], y=rollup['Min'], mode='lines', line_width=0,
+                        fill='tonexty', fillcolor='rgba(233, 30, 99, 0.12)',
+                        name='Range across regions')
+        fig.add_scatter(x=rollup['Year'], y=rollup['Mean'], mode='lines',
+                        line_dash='dash', name='Mean across regions')
+    if len(national_data):
+        fig.add_scatter(x=national_data['Year'], y=national_data['Value'],
+                        mode='lines+markers', name='National')
+    fig.update_layout(height=400)
+    return fig
+
+
+def build_region_bar(region_latest, country, indicator):
+    fig = px.bar(
+        region_latest.sort_values('Value', ascending=False),
+        x='Region',
+        y='Value',
+        hover_data={"Year": True},
+        title=f'{indicator} by Region in {country} (Most Recent Year)',
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def _short_labels(names, width=45):
+    # Long indicator names keep their start and end, and stay distinct
+    labels = []
+    for name in names:
+        label = name if len(name) <= width else f"{name[:width // 2 - 1]}…{name[-(width // 2):]}"
+        if label in labels:
+            label = f"{label} ({len(labels) + 1})"
+        labels.append(label)
+    return labels
+
+
+def build_distance_heatmap(distance, title):
+    fig = px.imshow(
+        distance,
+        color_continuous_scale="RdPu_r",   # Darker = more alike
+        labels=dict(x="", y="", color="Distance"),
+        title=title,
+    )
+    fig.update_traces(hovertemplate="%{y} – %{x}: %{z:.2f}<extra></extra>")
+    fig.update_layout(height=550)
+    return fig
+
+
+def build_correlation_bar(correlated, indicator):
+    data = correlated.assign(
+        Label=_short_labels(correlated["Indicator"]),
+        Direction=correlated["Correlation"].gt(0).map({True: "Positive", False: "Negative"}),
+    )
+    fig = px.bar(
+        data.iloc[::-1],                   # Strongest at the top
+        x="Correlation",
+        y="Label",
+        color="Direction",
+        color_discrete_map={"Positive": "#e91e63", "Negative": "#3f51b5"},
+        orientation="h",
+        hover_name="Indicator",
+        hover_data={"Label": False, "Direction": False, "Observations": True},
+        title=f"Correlation with {indicator}",
+    )
+    fig.update_layout(height=max(300, 40 * len(data) + 120), xaxis_range=[-1, 1],
+                      yaxis_title="")
+    return fig
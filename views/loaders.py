@@ -0,0 +1,154 @@
+"""Cached data accessors shared by the data-driven pages."""
+
+import streamlit as st
+
+from diwa.composite import CompositeIndex
+from diwa.cube import DiwaCube
+from diwa.data import load_dataset
+from diwa.figcache import FigureCache
+from diwa.gender import with_gender_indicators
+from diwa.geo import COORDINATES
+from diwa.partitions import DatasetStore
+from diwa.payload import slim
+from diwa.persist import cached
+from diwa.regions import RegionIndex, national_rows, subnational_rows
+from diwa.search import SearchIndex
+from diwa.similarity import SimilarityTable
+from diwa.spans import span
+from diwa.trends import TrendTable
+from diwa.version import dataset_version
+
+
+@st.cache_resource
+def get_dataset_store():
+    # One per process. The main dataset comes from the prebuilt binary bundle
+    # when fresh (python -m diwa.build), else the CSV, plus the derived
+    # female/male gap, ratio and parity indicators
+    return DatasetStore(lambda: with_gender_indicators(load_dataset()))
+
+
+# Every data-dependent cache takes the dataset version as an argument, so
+# changing the data files invalidates exactly those entries on the next rerun.
+# A new batch in data/batches only re-parses and merges that file, and the
+# trend table only recomputes the series it touched (see diwa.partitions).
+# max_entries keeps the previous version around for sessions mid-rerun.
+# All of them are cache_resource: one read-only object per process, shared by
+# every session, where cache_data would unpickle a private copy per call.
+# The costly ones also go through diwa.persist.cached, which in the browser
+# keeps them in IndexedDB so a repeat visit loads instead of rebuilding them.
+@st.cache_resource(max_entries=2)
+def get_dataset(version):
+    store = get_dataset_store()
+    with span("data.load"):
+        return store.restore(cached("dataset", version, store.snapshot))
+
+
+def load_diwa_data(version):
+    """Every row, national and regional, sorted by Country, Indicator, Year."""
+    return get_dataset(version).frame
+
+
+@st.cache_resource(max_entries=2)
+def get_diwa_cube(version):
+    # Built once per process; pages slice it instead of masking the full frame.
+    # National rows only: regional figures live in get_region_index()
+    return cached(
+        "cube", version,
+        lambda: DiwaCube(national_rows(load_diwa_data(version)), presorted=True),
+    )
+
+
+@st.cache_resource(max_entries=2)
+def get_region_index(version):
+    # Built on the first regional drill-down, with its rollups
+    return cached(
+        "regions", version, lambda: RegionIndex(subnational_rows(load_diwa_data(version)))
+    )
+
+
+@st.cache_resource(max_entries=2)
+def get_trends(version):
+    # Gap-filled series and trend statistics, precomputed once per version and
+    # updated from the previous version's table for the series a batch changed
+    cube = get_diwa_cube(version)
+    return cached("trends", version, lambda: get_dataset_store().derive(
+        "trends",
+        get_dataset(version),
+        lambda: TrendTable(cube),
+        lambda previous, changed: previous.updated(cube, changed),
+    ))
+
+
+@st.cache_resource(max_entries=2)
+def get_similarity(version):
+    # Country distances and indicator correlations, computed once per version
+    return cached("similarity", version, lambda: SimilarityTable(get_diwa_cube(version)))
+
+
+@st.cache_resource(max_entries=64)
+def get_region_similarity(version, country):
+    # The same statistics between the regions of one country
+    return SimilarityTable(get_region_index(version).cube(country))
+
+
+@st.cache_resource(max_entries=2)
+def get_composite(version):
+    # Oriented, normalized Country x Indicator matrices; weights only re-score
+    return cached("composite", version, lambda: CompositeIndex(get_diwa_cube(version)))
+
+
+@st.cache_resource(max_entries=2)
+def get_search_index(version):
+    # Token index over names, sources and remarks, built once per version
+    return cached("search", version, lambda: SearchIndex(get_diwa_cube(version).frame))
+
+
+def data_stamp(version, indicator, country=None):
+    """Figure cache key part for data of ``indicator`` in ``country`` (every
+    country when None): it only changes when a batch touches that data, so
+    other figures stay cached across batches."""
+    data = get_dataset(version)
+    if country is None:
+        return data.indicator_stamp(indicator)
+    return data.series_stamp(country, indicator)
+
+
+# Year option for each country's own most recent value
+LATEST = "Latest available"
+
+
+def values_at(version, indicator, year, countries=None):
+    """Value of ``indicator`` per country: the latest one when ``year`` is
+    ``LATEST``, else the observed or gap-filled value in ``year``."""
+    if year == LATEST:
+        return get_diwa_cube(version).latest_for_indicator(indicator, countries=countries)
+    return get_trends(version).at_year(indicator, year, countries=countries)
+
+
+# Country coordinates for map
+@st.cache_data
+def get_country_coordinates():
+    return COORDINATES
+
+
+@st.cache_data(max_entries=256)
+def indicator_averages(version, countries, limit=8):
+    """Mean value per indicator over ``countries`` (all years), first ``limit``
+    indicators in cube order."""
+    data = get_diwa_cube(version).select(countries=list(countries))
+    return data.groupby("Indicator", sort=False)["Value"].mean().head(limit).dropna()
+
+
+@st.cache_resource
+def get_figure_cache():
+    # One cache per process, shared by all sessions; figures are slimmed for
+    # the wire once, when built
+    return FigureCache(postprocess=slim)
+
+
+def current_cube():
+    """``(dataset_version, cube)`` for this rerun."""
+    with span("data.version"):
+        version = dataset_version()
+    with span("data.cube"):
+        return version, get_diwa_cube(version)
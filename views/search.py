@@ -0,0 +1,64 @@
+"""Sidebar search over indicators, countries, sources and remarks.
+
+The panel is a fragment, so typing a query reruns only the panel; the index
+lives in ``diwa.search`` and is built once per dataset version. Picking a
+result preselects it on the page that shows it and switches to that page.
+"""
+
+import streamlit as st
+
+from views.comparison_modes import MODE_KEY, SINGLE
+
+QUERY_KEY = "search_query"
+RESULTS = 8
+
+ICONS = {"indicator": "📊", "country": "🏴", "series": "📄"}
+
+
+def _label(match):
+    if match["kind"] == "indicator":
+        return match["indicator"]
+    if match["kind"] == "country":
+        return match["country"]
+    return f"{match['country']} · {match['indicator']}"
+
+
+def _open(match, pages):
+    # Widget keys on the target pages pick these values up on their first run
+    if match["kind"] == "indicator":
+        st.session_state["comparison_indicator"] = match["indicator"]
+        st.session_state[MODE_KEY] = SINGLE
+        st.switch_page(pages["comparison"])
+    st.session_state["selected_country"] = match["country"]
+    if match["kind"] == "series":
+        st.session_state["trend_indicator"] = match["indicator"]
+    st.switch_page(pages["country_profiles"])
+
+
+@st.fragment
+def search_panel(pages):
+    """Search box and result list; ``pages`` maps ``"comparison"`` and
+    ``"country_profiles"`` to their ``st.Page``."""
+    query = st.text_input(
+        "🔍 Search",
+        placeholder="Indicator, country, source…",
+        key=QUERY_KEY,
+        help="Matches names, sources and remarks; prefixes and small typos are fine",
+    )
+    if not query.strip():
+        return
+
+    # Imported here: the shell itself stays free of pandas
+    from views.loaders import current_cube, get_search_index
+
+    data_version, _ = current_cube()
+    matches = get_search_index(data_version).search(query, limit=RESULTS)
+    if not matches:
+        st.caption("No matches.")
+        return
+    for i, match in enumerate(matches):
+        if st.button(f"{ICONS[match['kind']]} {_label(match)}", key=f"search_result_{i}",
+                     use_container_width=True):
+            _open(match, pages)
+        if match["detail"]:
+            st.caption(match["detail"])
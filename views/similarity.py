@@ -0,0 +1,91 @@
+import streamlit as st
+
+from diwa.similarity import MIN_OBSERVATIONS, MIN_SHARED
+from views.figures import build_correlation_bar, build_distance_heatmap
+from views.loaders import (current_cube, get_figure_cache, get_region_index,
+                           get_region_similarity, get_similarity)
+
+data_version, cube = current_cube()
+figure_cache = get_figure_cache()
+similarity = get_similarity(data_version)
+regions = get_region_index(data_version)
+
+NATIONAL = "Countries"
+DEFAULT_COUNTRY = "Malaysia"
+NEIGHBOURS = 5
+CORRELATED = 10
+
+st.title("🔗 Similarity & Correlation")
+st.markdown("Which countries look alike, and which indicators move together")
+
+
+# Distances and correlations are precomputed per dataset version (see
+# diwa.similarity); each widget here only looks rows up
+@st.fragment
+def similar_section():
+    st.subheader("🌏 Similar Profiles")
+    col1, col2 = st.columns(2)
+    scope = NATIONAL
+    if regions.comparable:
+        # Regions of one country compare like countries do
+        scope = col1.selectbox(
+            "Compare:",
+            [NATIONAL, *regions.comparable],
+            format_func=lambda s: s if s == NATIONAL else f"Regions of {s}",
+        )
+    table = similarity if scope == NATIONAL else get_region_similarity(data_version, scope)
+    names = table.countries
+    if not names:
+        st.info("No data to compare.")
+        return
+
+    with col2:
+        default = names.index(DEFAULT_COUNTRY) if DEFAULT_COUNTRY in names else 0
+        selected = st.selectbox("Most like:", names, index=default)
+
+    neighbours = table.neighbours(selected, limit=NEIGHBOURS)
+    if neighbours.empty:
+        st.info(f"{selected} shares fewer than {MIN_SHARED} comparable indicators "
+                "with every other profile.")
+    else:
+        if scope != NATIONAL:
+            neighbours = neighbours.rename(columns={"Country": "Region"})
+        st.dataframe(neighbours, hide_index=True, use_container_width=True,
+                     column_config={"Distance": st.column_config.NumberColumn(format="%.2f")})
+    st.caption("Distance is the root mean square difference of standardized latest values "
+               "over the indicators both report; 0 is identical, 1 is about one standard "
+               f"deviation apart. Pairs sharing fewer than {MIN_SHARED} indicators are blank.")
+
+    label = "Countries" if scope == NATIONAL else f"Regions of {scope}"
+    fig = figure_cache.get_or_build(
+        ("similarity_heatmap", data_version, scope),
+        lambda: build_distance_heatmap(table.distance, f"Distance Between {label}"),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def correlation_section():
+    st.subheader("📊 Indicators That Move Together")
+    if not similarity.correlated_indicators:
+        st.info("No pair of indicators is observed together often enough to correlate.")
+        return
+
+    indicator = st.selectbox("Correlated with:", similarity.correlated_indicators)
+    correlated = similarity.correlated(indicator, limit=CORRELATED)
+    fig = figure_cache.get_or_build(
+        ("correlation_bar", data_version, indicator),
+        lambda: build_correlation_bar(correlated, indicator),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Pearson correlation across every country and year in which both indicators "
+               f"have a value (at least {MIN_OBSERVATIONS}). Gender gap, ratio and parity "
+               "indicators are not correlated with their own female and male values.")
+
+    with st.expander("Strongest pairs overall"):
+        st.dataframe(similarity.top_pairs, hide_index=True, use_container_width=True,
+                     column_config={"Correlation": st.column_config.NumberColumn(format="%.2f")})
+
+
+similar_section()
+correlation_section()